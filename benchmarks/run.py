@@ -0,0 +1,246 @@
+"""
+Run the benchmark suite and record the results.
+
+Each measurement runs in a fresh process, so its wall time does not depend
+on what earlier measurements left cached and its peak resident memory is
+its own. Results are written as JSON, one file per package version, for
+comparison release by release:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000 10000 --compare old.json
+
+Synthetic datasets (see :mod:`policyengine_au.data.synthetic`) are written
+under ``benchmarks/.data`` on first use and reused by later runs.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from importlib.metadata import version
+from multiprocessing import get_context
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).parent
+DATA_DIR = BENCHMARKS_DIR / ".data"
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+PERIOD = "2025"
+
+# Variables timed on each population, each from a fresh simulation so its
+# time includes everything it depends on.
+VARIABLES = (
+    "taxable_income",
+    "income_tax",
+    "medicare_levy",
+    "household_payroll_tax",
+    "age_pension",
+    "ftb_part_a",
+    "ftb_part_b",
+)
+
+
+def _peak_rss_mb() -> float:
+    # Linux keeps ``ru_maxrss`` across exec, so a spawned process would
+    # report its parent's peak; the high-water mark in /proc is its own.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes and other platforms kilobytes.
+    return peak / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def measure_import() -> dict:
+    """Time importing the package and loading its shared baseline system."""
+    start = time.perf_counter()
+    from policyengine_au.system import get_system
+
+    get_system()
+
+    return {
+        "setup_s": 0.0,
+        "wall_time_s": time.perf_counter() - start,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def measure_system_load(use_snapshot: bool) -> dict:
+    """Time loading another tax-benefit system once the package is imported."""
+    start = time.perf_counter()
+    from policyengine_au import AustralianTaxBenefitSystem
+
+    imported = time.perf_counter()
+    AustralianTaxBenefitSystem(use_snapshot=use_snapshot)
+    loaded = time.perf_counter()
+    return {
+        "setup_s": imported - start,
+        "wall_time_s": loaded - imported,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def measure_variable(dataset_path: str, variable: str) -> dict:
+    """Time calculating ``variable`` over a dataset in a new simulation."""
+    from policyengine_au import Microsimulation
+    from policyengine_au.data import ColumnarDataset
+
+    start = time.perf_counter()
+    simulation = Microsimulation(dataset=ColumnarDataset(dataset_path))
+    ready = time.perf_counter()
+    simulation.calculate(variable, PERIOD, use_weights=False)
+    done = time.perf_counter()
+    return {
+        "setup_s": ready - start,
+        "wall_time_s": done - ready,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _in_fresh_process(function, *args) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(function, *args).result()
+
+
+def dataset_path(people: int, seed: int = 0) -> Path:
+    """The synthetic dataset of ``people`` people, written if missing."""
+    from policyengine_au.data.synthetic import synthetic_dataset
+
+    path = DATA_DIR / f"population_{people}_{seed}"
+    if not (path / "manifest.json").exists():
+        synthetic_dataset(path, people, seed=seed, period=PERIOD)
+    return path
+
+
+def run(sizes=DEFAULT_SIZES, variables=VARIABLES, repeat: int = 1) -> list:
+    """
+    Run every benchmark, keeping the fastest of ``repeat`` runs of each.
+
+    Returns:
+        One record per benchmark and population size.
+    """
+    measurements = [
+        ("import", None, measure_import, ()),
+        ("system_load_from_source", None, measure_system_load, (False,)),
+        ("system_load_from_snapshot", None, measure_system_load, (True,)),
+    ]
+    for people in sizes:
+        path = str(dataset_path(people))
+        for variable in variables:
+            measurements.append((variable, people, measure_variable, (path, variable)))
+
+    records = []
+    for name, people, function, args in measurements:
+        runs = [_in_fresh_process(function, *args) for _ in range(repeat)]
+        best = min(runs, key=lambda result: result["wall_time_s"])
+        record = {"benchmark": name, "people": people, **best}
+        records.append(record)
+        size = "" if people is None else f" ({people:,} people)"
+        print(
+            f"{name}{size}: {best['wall_time_s']:.3f}s, "
+            f"peak RSS {best['peak_rss_mb']:.0f} MB",
+            flush=True,
+        )
+    return records
+
+
+def environment() -> dict:
+    """The versions and machine the results were measured on."""
+    import policyengine_au
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "policyengine_au": policyengine_au.__version__,
+        "policyengine_core": version("policyengine-core"),
+        "numpy": version("numpy"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "git_commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: list, baseline_path) -> None:
+    """Print each benchmark's time relative to an earlier results file."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {
+        (record["benchmark"], record["people"]): record
+        for record in baseline["results"]
+    }
+    print(f"\nCompared with {baseline['environment']['policyengine_au']}:")
+    for record in results:
+        before = previous.get((record["benchmark"], record["people"]))
+        if before is None or before["wall_time_s"] == 0:
+            continue
+        ratio = record["wall_time_s"] / before["wall_time_s"]
+        size = "" if record["people"] is None else f" ({record['people']:,})"
+        print(f"  {record['benchmark']}{size}: {ratio:.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Population sizes to benchmark.",
+    )
+    parser.add_argument(
+        "--variables",
+        nargs="+",
+        default=list(VARIABLES),
+        help="Variables to time on each population.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs of each benchmark; the fastest is kept.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Results file. Defaults to benchmarks/results/<version>.json.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="An earlier results file to compare against.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.variables, args.repeat)
+    env = environment()
+    output = args.output or RESULTS_DIR / f"{env['policyengine_au']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps({"environment": env, "results": results}, indent=2) + "\n"
+    )
+    print(f"\nResults written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
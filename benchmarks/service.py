@@ -0,0 +1,111 @@
+"""
+Load-test the household-calculator service.
+
+Starts ``python -m policyengine_au.service`` on a free port, sends
+single-household requests from concurrent keep-alive clients and reports the
+latency percentiles and throughput:
+
+    python -m benchmarks.service --clients 16 --requests 200
+"""
+
+import argparse
+import http.client
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def household(i: int) -> dict:
+    """A one- or two-adult household, varying with ``i``."""
+    people = {"you": {"age": 25 + i % 50, "employment_income": 1_000 * (i % 150)}}
+    if i % 3 == 0:
+        people["partner"] = {"age": 30 + i % 45, "employment_income": 500 * (i % 90)}
+    members = list(people)
+    return {
+        "people": people,
+        "tax_units": {
+            "tax_unit": {"primaries": ["you"], "spouses": members[1:]},
+        },
+        "benefit_units": {"benefit_unit": {"adults": members}},
+        "families": {"family": {"parents": members}},
+        "households": {"household": {"members": members}},
+    }
+
+
+def start_server(window_ms: float):
+    """Start the service in a subprocess, returning it and its port."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "policyengine_au.service",
+            "--port",
+            "0",
+            "--window",
+            str(window_ms),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    return process, int(line.rsplit(":", 1)[1])
+
+
+def client(port: int, start: int, requests: int) -> list:
+    """Send requests over one connection, returning their latencies."""
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    latencies = []
+    for i in range(start, start + requests):
+        body = json.dumps({"situation": household(i), "period": "2025"}).encode()
+        sent = time.perf_counter()
+        connection.request(
+            "POST", "/calculate", body, {"Content-Type": "application/json"}
+        )
+        response = connection.getresponse()
+        payload = response.read()
+        latencies.append(time.perf_counter() - sent)
+        if response.status != 200:
+            raise RuntimeError(payload.decode())
+    connection.close()
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Per client.")
+    parser.add_argument("--window", type=float, default=1.0, help="Milliseconds.")
+    args = parser.parse_args(argv)
+
+    process, port = start_server(args.window)
+    try:
+        # Warm up the formulas' first-use caches.
+        client(port, 0, 5)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as pool:
+            runs = pool.map(
+                client,
+                [port] * args.clients,
+                [i * args.requests for i in range(args.clients)],
+                [args.requests] * args.clients,
+            )
+            latencies = np.concatenate(list(runs))
+        elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1_000
+    print(
+        f"{latencies.size} requests from {args.clients} clients: "
+        f"{latencies.size / elapsed:.0f} requests/s, "
+        f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
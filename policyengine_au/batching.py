@@ -0,0 +1,418 @@
+"""
+Many household situations in one simulation.
+
+Building and running a simulation has a fixed cost of a few milliseconds,
+whether it holds one household or a thousand, so calculating situations one
+at a time is dominated by that cost. Core's situation builder, in turn,
+looks up every person and group by scanning lists of ids, so building one
+simulation from thousands of situations grows quadratically.
+
+:class:`MergedSituations` reads each situation's people, groups and inputs
+in a single pass, numbers their rows in one simulation, fills each input
+array with one NumPy assignment and builds the populations directly. The
+results of every situation are then slices of the same arrays.
+:func:`calculate_many` groups situations that can share a simulation and
+returns each one's results.
+
+An input array is filled with default values for the entities that did
+not set it, so two situations can only share a simulation if that default
+means the same as no input at all. They must set the same variables with
+formulas as inputs, for the same periods, or the formula would not run for
+the others; and any variable one sets for a period other than the one
+calculated they must set for the same periods, or a default would hide the
+input another carries over or uprates from. :func:`calculated_inputs` gives
+the key to group situations by.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from policyengine_core import periods
+from policyengine_core.enums import Enum
+from policyengine_core.errors import SituationParsingError, VariableNotFoundError
+
+from policyengine_au.entities import Employer, Person
+
+
+def with_own_employers(situation: dict) -> dict:
+    """
+    A situation in which, if it declares no employers, each person has an
+    employer of their own.
+
+    Core puts everyone in one group of an entity a situation leaves out.
+    Unrelated people do not share an employer, though, and pooling their
+    wages would apply one payroll tax threshold to all of them.
+
+    Args:
+        situation: A situation dict.
+
+    Returns:
+        The situation, or a copy of it with an employer per person.
+    """
+    people = situation.get(Person.plural)
+    if not isinstance(people, dict) or Employer.plural in situation:
+        return situation
+    employee = Employer.roles[0].plural
+    return {
+        **situation,
+        Employer.plural: {
+            str(person_id): {employee: [person_id]} for person_id in people
+        },
+    }
+
+
+def calculated_inputs(situation: dict, system, period) -> frozenset:
+    """
+    The ``(variable, periods)`` pairs of a situation's inputs that would
+    change the results of other situations merged with it.
+
+    These are the inputs to variables that otherwise have a formula, and
+    the inputs to any variable given for periods other than ``period``.
+
+    Args:
+        situation: A situation dict.
+        system: The tax-benefit system it is for.
+        period: The period of values given without one.
+
+    Returns:
+        A hashable key: only situations with equal keys can be merged.
+    """
+    default_period = str(period)
+    given = defaultdict(set)
+    for instances in situation.values():
+        if not isinstance(instances, dict):
+            continue
+        for instance in instances.values():
+            for name, value in (instance or {}).items():
+                if system.variables.get(name) is None:
+                    continue
+                if isinstance(value, dict):
+                    given[name].update(str(key) for key in value)
+                else:
+                    given[name].add(default_period)
+    inputs = set()
+    for name, input_periods in given.items():
+        variable = system.variables.get(name)
+        if (
+            variable.formulas
+            or variable.adds
+            or variable.subtracts
+            or input_periods != {default_period}
+        ):
+            inputs.add((name, frozenset(input_periods)))
+    return frozenset(inputs)
+
+
+class _Inputs:
+    """The rows and values given for each variable and period of an entity."""
+
+    def __init__(self, entity, default_period: str):
+        self.entity = entity
+        self.default_period = default_period
+        self.columns = defaultdict(lambda: ([], []))
+        self._checked = set()
+        self._periods = {}
+
+    def add(self, row: int, values: dict, path: list) -> None:
+        for name, value in values.items():
+            if name not in self._checked:
+                try:
+                    self.entity.check_variable_defined_for_entity(name)
+                except ValueError as error:
+                    raise SituationParsingError([*path, name], error.args[0])
+                except VariableNotFoundError as error:
+                    raise SituationParsingError([*path, name], str(error), code=404)
+                self._checked.add(name)
+            if not isinstance(value, dict):
+                value = {self.default_period: value}
+            for period_str, period_value in value.items():
+                if period_value is None:
+                    continue
+                period = self._periods.get(period_str)
+                if period is None:
+                    try:
+                        period = periods.period(period_str)
+                    except ValueError as error:
+                        raise SituationParsingError([*path, name], error.args[0])
+                    self._periods[period_str] = period
+                rows, column = self.columns[name, period]
+                rows.append(row)
+                column.append(period_value)
+
+    def set_into(self, population) -> None:
+        """Set every input on the population, shortest periods first."""
+        by_variable = defaultdict(list)
+        for (name, period), (rows, values) in self.columns.items():
+            by_variable[name].append((period, rows, values))
+        for name, columns in by_variable.items():
+            holder = population.get_holder(name)
+            variable = holder.variable
+            columns.sort(key=lambda column: periods.key_period_size(column[0]))
+            for period, rows, values in columns:
+                if variable.end is not None and period.start.date > variable.end:
+                    continue
+                array = variable.default_array(population.count)
+                array[np.asarray(rows)] = _column(variable, values)
+                holder.set_input(period, array)
+
+
+def _column(variable, values):
+    """Values given for a variable, converted to its array type."""
+    if variable.value_type in (float, int, bool) and not any(
+        isinstance(value, str) for value in values
+    ):
+        try:
+            return np.asarray(values, dtype=variable.dtype)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    # Enum names and numeric expressions, converted once per distinct value.
+    converted = {}
+    column = []
+    for value in values:
+        key = (type(value), value)
+        if key not in converted:
+            converted[key] = variable.check_set_value(value)
+        column.append(converted[key])
+    dtype = int if variable.value_type == Enum else variable.dtype
+    return np.asarray(column, dtype=dtype)
+
+
+class MergedSituations:
+    """
+    Situations concatenated into one simulation.
+
+    People and groups keep their situation's structure, including core's
+    defaults: people missing from every group of an entity get a group of
+    their own, and a missing entity puts everyone in one group under its
+    first role. A situation without employers gets one per person, as
+    :func:`with_own_employers` gives. Ids become ``<index>/<id>``.
+
+    Args:
+        situations: Situation dicts, all with the same
+            :func:`calculated_inputs`.
+        system: The tax-benefit system to simulate.
+        period: The default period of the inputs and of the results.
+
+    Raises:
+        SituationParsingError: If a situation is invalid.
+    """
+
+    def __init__(self, situations, system, period):
+        from policyengine_au.system import Simulation
+
+        self.system = system
+        self.period = str(period)
+        person_entity = system.person_entity
+        person_plural = person_entity.plural
+        known = {entity.plural for entity in system.entities}
+        inputs = {
+            entity.key: _Inputs(entity, self.period) for entity in system.entities
+        }
+        ids = {entity.key: [] for entity in system.entities}
+        members_entity_id = {entity.key: [] for entity in system.group_entities}
+        members_role = {entity.key: [] for entity in system.group_entities}
+        roles_by_key = {
+            entity.key: {role.plural or role.key: role for role in entity.roles}
+            for entity in system.group_entities
+        }
+        # For each situation and entity, its ids in row order.
+        self.ids = []
+
+        for index, situation in enumerate(situations):
+            prefix = f"{index}/"
+            situation = with_own_employers(situation)
+            unknown = set(situation) - known
+            if unknown:
+                raise SituationParsingError(
+                    [str(index), sorted(unknown)[0]],
+                    f"Situation {index} has entities this system does not "
+                    f"define: {', '.join(sorted(unknown))}.",
+                )
+            people = situation.get(person_plural)
+            if not people:
+                raise SituationParsingError(
+                    [str(index), person_plural], f"Situation {index} has no people."
+                )
+            situation_ids = {}
+            first_person = len(ids[person_entity.key])
+            rows = {}
+            for person_id, values in people.items():
+                row = len(ids[person_entity.key])
+                rows[str(person_id)] = row - first_person
+                ids[person_entity.key].append(prefix + str(person_id))
+                inputs[person_entity.key].add(
+                    row, values or {}, [str(index), person_plural, str(person_id)]
+                )
+            situation_ids[person_entity.key] = list(map(str, people))
+
+            for entity in system.group_entities:
+                entity_ids = ids[entity.key]
+                first_group = len(entity_ids)
+                first_role = entity.flattened_roles[0]
+                instances = situation.get(entity.plural)
+                if instances is None:
+                    entity_ids.append(prefix + entity.key)
+                    membership = [first_group] * len(people)
+                    roles = [first_role] * len(people)
+                else:
+                    membership, roles = _add_groups(
+                        entity,
+                        roles_by_key[entity.key],
+                        instances,
+                        rows,
+                        inputs[entity.key],
+                        entity_ids,
+                        index,
+                    )
+                    # People in no group of the entity get one of their own.
+                    for position, person_id in enumerate(rows):
+                        if membership[position] is None:
+                            membership[position] = len(entity_ids)
+                            roles[position] = first_role
+                            entity_ids.append(prefix + person_id)
+                members_entity_id[entity.key].extend(membership)
+                members_role[entity.key].extend(roles)
+                situation_ids[entity.key] = [
+                    id[len(prefix) :] for id in entity_ids[first_group:]
+                ]
+            self.ids.append(situation_ids)
+
+        self.offsets = {
+            entity.key: np.cumsum(
+                [0] + [len(situation_ids[entity.key]) for situation_ids in self.ids]
+            ).tolist()
+            for entity in system.entities
+        }
+        populations = system.instantiate_entities()
+        for entity in system.entities:
+            population = populations[entity.key]
+            population.count = len(ids[entity.key])
+            population.ids = ids[entity.key]
+            if not entity.is_person:
+                population.members_entity_id = np.asarray(
+                    members_entity_id[entity.key], dtype=np.int32
+                )
+                population.members_role = np.asarray(
+                    members_role[entity.key], dtype=object
+                )
+        self.simulation = Simulation(tax_benefit_system=system, populations=populations)
+        self.simulation.default_calculation_period = self.period
+        for entity in system.entities:
+            inputs[entity.key].set_into(self.simulation.populations[entity.key])
+
+    def calculate(self, variables) -> list:
+        """
+        Calculate variables for every situation.
+
+        Args:
+            variables: Variable names.
+
+        Returns:
+            For each situation, a ``{variable: {entity_id: value}}`` dict of
+            Python values.
+        """
+        results = [{} for _ in self.ids]
+        for name in variables:
+            entity_key = self.system.get_variable(name, check_existence=True).entity.key
+            values = self.simulation.calculate(name, self.period)
+            if hasattr(values, "decode_to_str"):
+                values = values.decode_to_str()
+            values = np.asarray(values).tolist()
+            offsets = self.offsets[entity_key]
+            for index, situation_ids in enumerate(self.ids):
+                start, end = offsets[index], offsets[index + 1]
+                results[index][name] = dict(
+                    zip(situation_ids[entity_key], values[start:end])
+                )
+        return results
+
+
+def _add_groups(entity, roles_by_key, instances, people, inputs, entity_ids, index):
+    """
+    Number the groups of one situation's entity.
+
+    Returns:
+        The row of each person's group, or ``None`` for people in none, and
+        each person's role.
+    """
+    prefix = f"{index}/"
+    membership = [None] * len(people)
+    roles = [None] * len(people)
+    for group_id, group in instances.items():
+        row = len(entity_ids)
+        entity_ids.append(prefix + str(group_id))
+        path = [str(index), entity.plural, str(group_id)]
+        variables = {}
+        for key, value in (group or {}).items():
+            role = roles_by_key.get(key)
+            if role is None:
+                variables[key] = value
+                continue
+            members = [value] if isinstance(value, str) else value
+            if role.max is not None and len(members) > role.max:
+                raise SituationParsingError(
+                    [*path, key],
+                    f"There can be at most {role.max} {key} in a {entity.key}. "
+                    f"{len(members)} were declared in '{group_id}'.",
+                )
+            for position, person_id in enumerate(members):
+                person = people.get(str(person_id))
+                if person is None:
+                    raise SituationParsingError(
+                        [*path, key],
+                        f"{person_id} has been declared in {group_id} {key}, "
+                        "but has not been declared in people.",
+                    )
+                if membership[person] is not None:
+                    raise SituationParsingError(
+                        [*path, key],
+                        f"{person_id} has been declared more than once in "
+                        f"{entity.plural}.",
+                    )
+                membership[person] = row
+                roles[person] = role.subroles[position] if role.subroles else role
+        inputs.add(row, variables, path)
+    return membership, roles
+
+
+def calculate_many(system, situations, variables, period, cache=None) -> list:
+    """
+    Calculate variables for many situations in as few simulations as
+    possible.
+
+    Situations are grouped by :func:`calculated_inputs`, and each group is
+    calculated as one :class:`MergedSituations`. With a ``cache``, only the
+    situations it has no results for are calculated.
+
+    Args:
+        system: The tax-benefit system to simulate.
+        situations: Situation dicts.
+        variables: Variable names.
+        period: The period to calculate, also used for inputs given without
+            one.
+        cache: A :class:`~policyengine_au.result_cache.ResultCache` to look
+            results up in and store them to.
+
+    Returns:
+        For each situation, in order, a ``{variable: {entity_id: value}}``
+        dict.
+    """
+    results = [None] * len(situations)
+    keys = [None] * len(situations)
+    if cache is not None:
+        for index, situation in enumerate(situations):
+            keys[index] = cache.key(system, situation, period, variables)
+            results[index] = cache.get(keys[index])
+    groups = defaultdict(list)
+    for index, situation in enumerate(situations):
+        if results[index] is None:
+            groups[calculated_inputs(situation, system, period)].append(index)
+    for indices in groups.values():
+        merged = MergedSituations(
+            [situations[index] for index in indices], system, period
+        )
+        for index, result in zip(indices, merged.calculate(variables)):
+            results[index] = result
+            if cache is not None:
+                cache.put(keys[index], result)
+    return results
@@ -0,0 +1,384 @@
+"""
+Calibrating household weights to published totals.
+
+A survey's weights rarely reproduce the totals the ATO and ABS publish:
+income tax collected, payroll tax by state, DSS outlays, the population by
+state and age. :func:`calibrate` adjusts them, starting from the survey's
+own weights, until they do as nearly as the targets allow.
+
+Each target is a column of a household-by-target matrix: a household's
+entry is what it adds to the target per unit of weight, so the weighted
+total of every target is one matrix-vector product. :class:`TargetMatrix`
+builds the columns from a simulation: a variable's values (a group's value
+counts towards the household whose weight it carries, as in
+``Microsimulation.calculate``), indicators of a household category such as
+its state, and people in age bands. Most households are absent from most
+targets, so the matrix is stored sparsely, as row, column and value
+arrays, and both products are ``numpy.bincount`` calls over its nonzero
+entries: each step of the optimiser costs time proportional to them, and
+millions of households against thousands of targets fit in memory.
+
+The optimiser is gradient descent, with Adam step sizes, on the logarithm
+of each weight's ratio to its starting value, so weights stay positive. It
+minimises the mean squared relative error of the targets:
+
+    matrix = TargetMatrix(simulation, 2025)
+    matrix.add_variable("income_tax", 2.84e11)
+    matrix.add_indicators("households", "household_state", {"NSW": 3.1e6, ...})
+    matrix.add_age_bands({(0, 15): 4.8e6, (15, 65): 17.5e6, (65, 120): 4.5e6})
+    result = calibrate(matrix)
+    print(result.table())
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+
+class TargetMatrix:
+    """
+    A sparse household-by-target matrix and the targets' totals.
+
+    Args:
+        simulation: A simulation of the households to weight, usually a
+            :class:`~policyengine_au.system.Microsimulation`.
+        period: The period to calculate variables for.
+    """
+
+    def __init__(self, simulation, period):
+        self.simulation = simulation
+        self.period = period
+        households = simulation.populations["household"]
+        self.households = households.count
+        # The household row of each person.
+        self.household_of_person = np.asarray(households.members_entity_id)
+        self.names = []
+        self.totals = []
+        # Rows, columns and values of each batch of targets added.
+        self._entries = [
+            (np.zeros(0, dtype=int), np.zeros(0, dtype=np.int32), np.zeros(0))
+        ]
+        self._sorted = None
+
+    @property
+    def shape(self) -> tuple:
+        return self.households, len(self.names)
+
+    def add(self, name: str, contributions, total: float) -> None:
+        """
+        Add a target.
+
+        Args:
+            name: The target's name.
+            contributions: Each household's contribution to the target per
+                unit of weight.
+            total: The target's value.
+        """
+        contributions = np.asarray(contributions, dtype=float)
+        rows = np.flatnonzero(contributions)
+        self._add_entries(
+            [name],
+            [total],
+            rows,
+            np.zeros(rows.size, dtype=np.int32),
+            contributions[rows],
+        )
+
+    def add_variable(
+        self,
+        variable: str,
+        total: float,
+        state: str | None = None,
+        name: str | None = None,
+    ) -> None:
+        """
+        Add the weighted total of a variable as a target.
+
+        Args:
+            variable: The variable's name, for any entity.
+            total: Its published total.
+            state: Count only households in this state.
+            name: The target's name. Defaults to the variable's name,
+                followed by the state.
+        """
+        values = np.asarray(
+            self.simulation.calculate(variable, self.period, use_weights=False),
+            dtype=float,
+        )
+        entity = self.simulation.tax_benefit_system.get_variable(variable).entity
+        contributions = np.bincount(
+            self._household_of(entity.key), values, minlength=self.households
+        )
+        if state is not None:
+            contributions[self._states() != state] = 0
+        self.add(
+            name or "_".join(filter(None, [variable, state])), contributions, total
+        )
+
+    def add_indicators(self, name: str, categories, totals: dict) -> None:
+        """
+        Add the number of households in each of several categories as
+        targets.
+
+        Args:
+            name: A prefix for the targets' names, which end in their
+                category.
+            categories: Each household's category, such as its state, or
+                the name of a household variable giving it.
+            totals: The number of households in each category, by
+                category.
+        """
+        if not totals:
+            return
+        if isinstance(categories, str):
+            categories = self.simulation.calculate(
+                categories, self.period, use_weights=False
+            )
+        labels = list(totals)
+        column, known = _lookup(np.asarray(categories), labels)
+        rows = np.flatnonzero(known)
+        self._add_entries(
+            [f"{name}_{label}" for label in labels],
+            list(totals.values()),
+            rows,
+            column[rows],
+            np.ones(rows.size),
+        )
+
+    def add_age_bands(self, totals: dict, state: str | None = None) -> None:
+        """
+        Add the number of people in age bands as targets.
+
+        Args:
+            totals: The number of people in each band, by ``(lowest,
+                highest)`` age, where the highest is excluded.
+            state: Count only people in households in this state.
+        """
+        ages = np.asarray(
+            self.simulation.calculate("age", self.period, use_weights=False)
+        )
+        counted = np.ones(ages.size, dtype=bool)
+        if state is not None:
+            counted = self._states()[self.household_of_person] == state
+        column = np.full(ages.size, -1)
+        for index, (lowest, highest) in enumerate(totals):
+            column[(ages >= lowest) & (ages < highest) & counted] = index
+        people = np.flatnonzero(column >= 0)
+        suffix = "" if state is None else f"_{state}"
+        self._add_entries(
+            [f"people_aged_{lowest}_{highest}{suffix}" for lowest, highest in totals],
+            list(totals.values()),
+            self.household_of_person[people],
+            column[people],
+            np.ones(people.size),
+        )
+
+    def estimates(self, weights) -> np.ndarray:
+        """The total of every target under ``weights``."""
+        rows, columns, values = self.entries()
+        return np.bincount(
+            columns, values * np.asarray(weights)[rows], minlength=len(self.names)
+        )
+
+    def entries(self) -> tuple:
+        """
+        The nonzero entries, ordered by household and target.
+
+        Returns:
+            The ``rows``, ``columns`` and ``values`` arrays.
+        """
+        if self._sorted is None:
+            rows, columns, values = map(np.concatenate, zip(*self._entries))
+            # Households in order make the weight lookups sequential, and
+            # entries for the same household and target (people in one age
+            # band, say) are summed into one.
+            keys = rows * len(self.names) + columns
+            order = np.argsort(keys)
+            keys = keys[order]
+            starts = np.flatnonzero(np.diff(keys, prepend=-1))
+            self._sorted = (
+                rows[order][starts],
+                columns[order][starts],
+                np.add.reduceat(values[order], starts) if starts.size else values,
+            )
+        return self._sorted
+
+    def _add_entries(self, names, totals, rows, columns, values) -> None:
+        first = len(self.names)
+        self.names.extend(names)
+        self.totals.extend(float(total) for total in totals)
+        self._entries.append(
+            (rows, np.asarray(columns, dtype=np.int32) + first, values)
+        )
+        self._sorted = None
+
+    def _household_of(self, entity_key: str) -> np.ndarray:
+        """The household row whose weight each entity's values carry."""
+        if entity_key == "household":
+            return np.arange(self.households)
+        if entity_key == self.simulation.tax_benefit_system.person_entity.key:
+            return self.household_of_person
+        population = self.simulation.populations[entity_key]
+        return population.value_from_first_person(self.household_of_person)
+
+    def _states(self) -> np.ndarray:
+        return np.asarray(
+            self.simulation.calculate("household_state", self.period, use_weights=False)
+        )
+
+
+def _lookup(values, labels):
+    """The index of each value in ``labels``, and whether it is there."""
+    labels = np.asarray(labels)
+    order = np.argsort(labels)
+    positions = np.clip(np.searchsorted(labels[order], values), 0, labels.size - 1)
+    index = order[positions]
+    return index, labels[index] == values
+
+
+@dataclass
+class TargetFit:
+    """
+    How closely the weights meet one target.
+
+    Attributes:
+        name: The target's name.
+        target: Its value.
+        initial: Its total under the starting weights.
+        estimate: Its total under the calibrated weights.
+    """
+
+    name: str
+    target: float
+    initial: float
+    estimate: float
+
+    @property
+    def relative_error(self) -> float:
+        return (self.estimate - self.target) / _scale(self.target)
+
+
+@dataclass
+class CalibrationResult:
+    """
+    Calibrated weights and how well they fit.
+
+    Attributes:
+        weights: The calibrated household weights.
+        fits: A :class:`TargetFit` for each target, in matrix order.
+        iterations: The number of optimiser steps taken.
+        runtime_s: Seconds spent optimising.
+        losses: The mean squared relative error of the targets at each
+            step, starting from the initial weights.
+    """
+
+    weights: np.ndarray
+    fits: list
+    iterations: int
+    runtime_s: float
+    losses: list
+
+    def table(self, limit: int | None = None) -> str:
+        """
+        The fit of each target as a fixed-width text table, worst first.
+
+        Args:
+            limit: Show only this many of the worst-fitting targets.
+        """
+        rows = sorted(self.fits, key=lambda fit: abs(fit.relative_error), reverse=True)[
+            :limit
+        ]
+        width = max([len("target"), *(len(row.name) for row in rows)])
+        lines = [
+            f"{'target':<{width}}  {'value':>18}  {'initial':>18}  "
+            f"{'calibrated':>18}  {'error':>8}"
+        ]
+        for row in rows:
+            lines.append(
+                f"{row.name:<{width}}  {row.target:>18,.0f}  {row.initial:>18,.0f}  "
+                f"{row.estimate:>18,.0f}  {row.relative_error:>8.2%}"
+            )
+        lines.append(
+            f"{len(self.fits)} targets, {self.iterations} iterations, "
+            f"{self.runtime_s:.2f} s"
+        )
+        return "\n".join(lines)
+
+
+def _scale(total):
+    """The denominator of a target's relative error."""
+    return np.maximum(np.abs(total), 1.0)
+
+
+def calibrate(
+    matrix: TargetMatrix,
+    weights=None,
+    iterations: int = 500,
+    learning_rate: float = 0.1,
+    tolerance: float = 1e-3,
+) -> CalibrationResult:
+    """
+    Reweight households to meet the targets of a matrix.
+
+    Args:
+        matrix: The :class:`TargetMatrix`.
+        weights: Starting household weights. Defaults to the simulation's
+            ``household_weight``.
+        iterations: Most optimiser steps to take.
+        learning_rate: The largest change to a log weight in one step.
+        tolerance: Stop once every target is within this relative error.
+
+    Returns:
+        The :class:`CalibrationResult`.
+    """
+    if weights is None:
+        weights = matrix.simulation.calculate(
+            "household_weight", matrix.period, use_weights=False
+        )
+    initial_weights = np.array(weights, dtype=float)
+    started = time.perf_counter()
+    rows, columns, values = matrix.entries()
+    targets = np.asarray(matrix.totals)
+    scale = _scale(targets)
+    count = targets.size
+
+    log_ratio = np.zeros(matrix.households)
+    moment = np.zeros(matrix.households)
+    second_moment = np.zeros(matrix.households)
+    beta_1, beta_2, epsilon = 0.9, 0.999, 1e-8
+    weights = initial_weights
+    losses = []
+    for step in range(iterations + 1):
+        estimates = np.bincount(columns, values * weights[rows], minlength=count)
+        if step == 0:
+            initial = estimates
+        errors = (estimates - targets) / scale
+        losses.append(float(np.mean(errors**2)))
+        if step == iterations or np.abs(errors).max(initial=0) < tolerance:
+            break
+        # The gradient of the loss with respect to each log weight.
+        gradient = (
+            np.bincount(
+                rows,
+                values * (2 * errors / scale / count)[columns],
+                minlength=weights.size,
+            )
+            * weights
+        )
+        moment = beta_1 * moment + (1 - beta_1) * gradient
+        second_moment = beta_2 * second_moment + (1 - beta_2) * gradient**2
+        log_ratio -= (
+            learning_rate
+            * (moment / (1 - beta_1 ** (step + 1)))
+            / (np.sqrt(second_moment / (1 - beta_2 ** (step + 1))) + epsilon)
+        )
+        weights = initial_weights * np.exp(log_ratio)
+    runtime_s = time.perf_counter() - started
+    fits = [
+        TargetFit(name, float(target), float(start), float(estimate))
+        for name, target, start, estimate in zip(
+            matrix.names, targets, initial, estimates
+        )
+    ]
+    return CalibrationResult(weights, fits, step, runtime_s, losses)
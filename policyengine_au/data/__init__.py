@@ -0,0 +1,3 @@
+"""Microdata formats for population-scale simulations."""
+
+from policyengine_au.data.columnar_dataset import ColumnarDataset
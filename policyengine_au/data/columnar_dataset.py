@@ -0,0 +1,420 @@
+"""
+Columnar, memory-mapped microdata.
+
+A columnar dataset is a directory holding one ``.npy`` file per variable
+per period, plus the entity id, membership and role arrays:
+
+    au_survey_2024/
+        manifest.json
+        structure/person_id.npy
+        structure/person_household_id.npy
+        ...
+        2024/age.npy
+        2024/employment_income.npy
+        ...
+
+Columns are written in the dtype the tax-benefit system stores the variable
+in and opened with ``numpy.load(mmap_mode="r")``, so a simulation holds the
+mapped file itself rather than a copy. Opening a dataset reads only the
+manifest and the ``.npy`` headers; the operating system pages a column in
+when a formula first reads it, so resident memory follows the variables a
+run touches rather than the size of the file.
+"""
+
+import json
+import logging
+import warnings
+from pathlib import Path
+
+import numpy as np
+from policyengine_core import periods
+from policyengine_core.enums import Enum
+
+logger = logging.getLogger(__name__)
+
+# How many times the chunk size one set of linked households can reach
+# before household_chunks warns that chunking no longer bounds memory.
+LINKED_SET_WARNING_FACTOR = 10
+
+
+class ColumnarDataset:
+    """
+    A directory of memory-mapped ``.npy`` columns.
+
+    Args:
+        path: Directory written by :meth:`ColumnarDataset.save`.
+    """
+
+    FORMAT_VERSION = 1
+    MANIFEST = "manifest.json"
+    STRUCTURE = "structure"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        manifest_path = self.path / self.MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(
+                f"{self.path} is not a columnar dataset: {self.MANIFEST} is missing."
+            )
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("format_version") != self.FORMAT_VERSION:
+            raise ValueError(
+                f"{self.path} uses columnar format version "
+                f"{manifest.get('format_version')}, but this version of "
+                f"policyengine-au reads version {self.FORMAT_VERSION}."
+            )
+        self.name = manifest.get("name", self.path.name)
+        self.time_period = manifest.get("time_period")
+        self.structure_arrays = list(manifest["structure"])
+        self.variables = {
+            variable: list(periods)
+            for variable, periods in manifest["variables"].items()
+        }
+
+    @classmethod
+    def save(
+        cls,
+        path,
+        structure,
+        variables,
+        time_period=None,
+        tax_benefit_system=None,
+        name=None,
+    ):
+        """
+        Write a columnar dataset.
+
+        Args:
+            path: Directory to write to. Existing columns are overwritten.
+            structure: Entity arrays, defined for all periods: ``<entity>_id``
+                for every entity and ``person_<group>_id`` and
+                ``person_<group>_role`` for every group entity. Roles may be
+                role keys or integer indices into the entity's roles.
+            variables: ``{variable: {period: values}}``. A bare array is
+                taken to be for ``time_period``.
+            time_period: Default period of the dataset.
+            tax_benefit_system: System whose variable dtypes the columns are
+                stored in. Defaults to the baseline Australian system.
+            name: Dataset name. Defaults to the directory name.
+
+        Returns:
+            ColumnarDataset: The written dataset.
+        """
+        if tax_benefit_system is None:
+            from policyengine_au.system import system as tax_benefit_system
+
+        path = Path(path)
+        (path / cls.STRUCTURE).mkdir(parents=True, exist_ok=True)
+        for array_name, values in structure.items():
+            np.save(path / cls.STRUCTURE / f"{array_name}.npy", np.asarray(values))
+
+        manifest_variables = {}
+        for variable_name, values_by_period in variables.items():
+            if not isinstance(values_by_period, dict):
+                if time_period is None:
+                    raise ValueError(
+                        f"{variable_name} has no period: give values as "
+                        "{period: values} or set time_period."
+                    )
+                values_by_period = {time_period: values_by_period}
+            variable = tax_benefit_system.get_variable(
+                variable_name, check_existence=True
+            )
+            for period, values in values_by_period.items():
+                period = str(period)
+                (path / period).mkdir(exist_ok=True)
+                np.save(
+                    path / period / f"{variable_name}.npy",
+                    _to_storage_dtype(variable, values),
+                )
+                manifest_variables.setdefault(variable_name, []).append(period)
+
+        manifest = {
+            "format_version": cls.FORMAT_VERSION,
+            "name": name or path.name,
+            "time_period": None if time_period is None else str(time_period),
+            "structure": list(structure),
+            "variables": manifest_variables,
+        }
+        (path / cls.MANIFEST).write_text(json.dumps(manifest, indent=2))
+        return cls(path)
+
+    def structure_array(self, name):
+        """Memory-mapped entity id, membership or role array."""
+        return np.load(self.path / self.STRUCTURE / f"{name}.npy", mmap_mode="r")
+
+    def column(self, variable, period=None):
+        """Memory-mapped values of ``variable`` for ``period``."""
+        period = str(period or self.time_period)
+        if period not in self.variables.get(variable, []):
+            raise KeyError(f"{self.name} has no values of {variable} for {period}.")
+        return np.load(self.path / period / f"{variable}.npy", mmap_mode="r")
+
+    def _read_column(self, variable, period):
+        return self.column(variable.name, period)
+
+    def load_into(self, simulation):
+        """
+        Build ``simulation``'s entities and inputs from this dataset.
+
+        Entity structure is read eagerly, since every calculation needs it.
+        Each variable column is stored in the simulation as the mapped file
+        itself, so nothing is read from disk until a formula uses it.
+
+        Columns go in through core's ``Holder._set``, the call ``set_input``
+        ends in, to skip only the NaN scan ``set_input`` makes first: it
+        would read every column in full when the simulation is built.
+        :meth:`save` refuses NaN instead. A column for periods of another
+        length than its variable's still goes through ``set_input``, so the
+        variable's own handler divides or spreads it.
+        """
+        from policyengine_core.simulations.simulation_builder import (
+            SimulationBuilder,
+        )
+
+        system = simulation.tax_benefit_system
+        simulation.build_from_populations(system.instantiate_entities())
+        builder = SimulationBuilder()
+        builder.populations = simulation.populations
+
+        person_entity = system.person_entity
+        builder.declare_person_entity(
+            person_entity.key, self.structure_array(f"{person_entity.key}_id")
+        )
+        for group_entity in system.group_entities:
+            builder.declare_entity(
+                group_entity.key, self.structure_array(f"{group_entity.key}_id")
+            )
+            builder.join_with_persons(
+                simulation.populations[group_entity.key],
+                self.structure_array(f"{person_entity.key}_{group_entity.key}_id"),
+                self.structure_array(f"{person_entity.key}_{group_entity.key}_role"),
+            )
+        simulation.build_from_populations(builder.populations)
+
+        unknown_variables = []
+        for variable_name, variable_periods in self.variables.items():
+            if variable_name not in system.variables:
+                unknown_variables.append(variable_name)
+                continue
+            holder = simulation.get_holder(variable_name)
+            for period in variable_periods:
+                values = self._read_column(holder.variable, period)
+                period = periods.period(period)
+                if period.unit != holder.variable.definition_period:
+                    holder.set_input(period, values)
+                else:
+                    holder._set(period, values, is_input=True)
+        if unknown_variables:
+            logger.warning(
+                "%s contains %d column(s) that do not match any variable in "
+                "the tax-benefit system and were ignored: %s",
+                self.name,
+                len(unknown_variables),
+                ", ".join(sorted(unknown_variables)),
+            )
+
+        simulation.default_calculation_period = (
+            self.time_period or simulation.default_calculation_period
+        )
+
+    def household_chunks(self, chunk_size):
+        """
+        Split the dataset into slices of about ``chunk_size`` households.
+
+        Every person, and every group entity, goes in the slice of the
+        households it belongs to, so each slice can be simulated on its own.
+        Households linked through a group that spans them, such as an
+        employer whose staff live in different households or a payroll tax
+        group of employers, always share a slice: a slice is extended past
+        ``chunk_size`` to finish the last set of linked households it
+        starts, and a warning is given if one set holds more than
+        ``LINKED_SET_WARNING_FACTOR`` times ``chunk_size`` households, as
+        when everyone without a job shares one employer. Households keep
+        their dataset order; where a slice's rows are contiguous in the file
+        it is a view of the mapped columns, not a copy.
+
+        Args:
+            chunk_size: Number of households per slice.
+
+        Yields:
+            ColumnarDatasetSlice: One slice per chunk of households.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        household_ids = self.structure_array("household_id")
+        household_of_person = _rows_of(
+            household_ids, self.structure_array("person_household_id")
+        )
+        group_of_person = {
+            name[len("person_") : -len("_id")]: _rows_of(
+                self.structure_array(name[len("person_") :]),
+                self.structure_array(name),
+            )
+            for name in self.structure_arrays
+            if name.startswith("person_")
+            and name.endswith("_id")
+            and name not in ("person_id", "person_household_id")
+        }
+        groupings = list(group_of_person.values())
+        if "employer" in group_of_person and "employer_group_id" in self.variables:
+            groupings.append(
+                _payroll_tax_group_of_employer(self._employer_group_ids())[
+                    group_of_person["employer"]
+                ]
+            )
+        linked = _linked_households(household_of_person, groupings)
+
+        # Households in order of their linked set, then of the dataset.
+        household_order = np.argsort(linked, kind="stable")
+        set_starts = np.flatnonzero(np.diff(linked[household_order], prepend=-1))
+        largest_set = np.diff(np.append(set_starts, len(household_ids))).max(initial=0)
+        if largest_set > LINKED_SET_WARNING_FACTOR * chunk_size:
+            warnings.warn(
+                f"{largest_set} households are linked through shared groups, "
+                "such as one employer for everyone without a job, so they "
+                f"form a single chunk of more than {LINKED_SET_WARNING_FACTOR} "
+                f"times the chunk size of {chunk_size}. Give unrelated people "
+                "groups of their own to split them.",
+                stacklevel=2,
+            )
+        # Each set goes in the chunk its first household falls in.
+        chunk_of_set = set_starts // chunk_size
+        chunk_starts = set_starts[np.flatnonzero(np.diff(chunk_of_set, prepend=-1))]
+        chunk_of_household = np.empty(len(household_ids), dtype=np.int64)
+        chunk_of_household[household_order] = (
+            np.searchsorted(chunk_starts, np.arange(len(household_ids)), side="right")
+            - 1
+        )
+        # Persons grouped by chunk, keeping dataset order within each.
+        chunk_of_person = chunk_of_household[household_of_person]
+        person_order = np.argsort(chunk_of_person, kind="stable")
+        person_starts = np.concatenate(
+            ([0], np.cumsum(np.bincount(chunk_of_person, minlength=chunk_starts.size)))
+        )
+        chunk_ends = np.append(chunk_starts[1:], len(household_ids))
+        for chunk, (start, stop) in enumerate(zip(chunk_starts, chunk_ends)):
+            persons = person_order[person_starts[chunk] : person_starts[chunk + 1]]
+            households = np.sort(household_order[start:stop])
+            rows = {"person": _as_slice(persons), "household": _as_slice(households)}
+            for entity, group_rows in group_of_person.items():
+                rows[entity] = _as_slice(np.unique(group_rows[persons]))
+            yield ColumnarDatasetSlice(self, rows)
+
+    def _employer_group_ids(self):
+        periods = self.variables["employer_group_id"]
+        period = self.time_period if self.time_period in periods else periods[0]
+        return np.asarray(self.column("employer_group_id", period))
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} {self.name}: "
+            f"{len(self.variables)} variables at {self.path}>"
+        )
+
+
+class ColumnarDatasetSlice(ColumnarDataset):
+    """
+    Whole households selected from a :class:`ColumnarDataset`.
+
+    Args:
+        parent: The dataset sliced.
+        rows: Rows of each entity in the slice, as a ``slice`` or an array
+            of row indices, keyed by entity key.
+    """
+
+    def __init__(self, parent, rows):
+        self.parent = parent
+        self.path = parent.path
+        self.name = parent.name
+        self.time_period = parent.time_period
+        self.structure_arrays = parent.structure_arrays
+        self.variables = parent.variables
+        self.rows = rows
+
+    def structure_array(self, name):
+        if name.startswith("person_"):
+            entity = "person"
+        else:
+            entity = name[: -len("_id")]
+        return self.parent.structure_array(name)[self.rows[entity]]
+
+    def _read_column(self, variable, period):
+        rows = self.rows[variable.entity.key]
+        return self.parent.column(variable.name, period)[rows]
+
+    def count(self, entity="household"):
+        """Number of rows of ``entity`` in the slice."""
+        rows = self.rows[entity]
+        if isinstance(rows, slice):
+            return rows.stop - rows.start
+        return len(rows)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} of {self.name}: {self.count()} households>"
+
+
+def _rows_of(ids, values):
+    """Row of each of ``values`` in the id array ``ids``."""
+    order = np.argsort(ids, kind="stable")
+    positions = np.searchsorted(ids, values, sorter=order)
+    rows = order[np.minimum(positions, len(ids) - 1)]
+    if len(values) and not np.array_equal(ids[rows], values):
+        raise ValueError("Some memberships refer to ids that do not exist.")
+    return rows
+
+
+def _payroll_tax_group_of_employer(group_ids):
+    """
+    A row for each employer's payroll tax group, with each ungrouped
+    employer in a group of its own.
+    """
+    grouped = group_ids != -1
+    group_rows = np.arange(group_ids.size)
+    group_rows[grouped] = (
+        group_ids.size + np.unique(group_ids[grouped], return_inverse=True)[1]
+    )
+    return group_rows
+
+
+def _linked_households(household_of_person, groupings):
+    """
+    Label each household with the first household of the set it is linked
+    to, through people sharing a row of any of ``groupings``.
+
+    Labels are spread from household to group and back, taking the
+    smallest each time, and shortcut through the labels' own labels, until
+    none changes.
+    """
+    households = household_of_person.max(initial=-1) + 1
+    labels = np.arange(households)
+    while True:
+        previous = labels.copy()
+        for group_of_person in groupings:
+            group_labels = np.full(group_of_person.max(initial=-1) + 1, households)
+            np.minimum.at(group_labels, group_of_person, labels[household_of_person])
+            np.minimum.at(labels, household_of_person, group_labels[group_of_person])
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def _as_slice(rows):
+    """``rows`` as a slice if they are one contiguous ascending run."""
+    if len(rows) == 0:
+        return slice(0, 0)
+    if rows[-1] - rows[0] + 1 == len(rows) and np.all(np.diff(rows) == 1):
+        return slice(int(rows[0]), int(rows[-1]) + 1)
+    return rows
+
+
+def _to_storage_dtype(variable, values):
+    """Cast ``values`` to the dtype a simulation stores ``variable`` in."""
+    values = np.asarray(values)
+    if variable.value_type in (float, int) and np.isnan(values.astype(float)).any():
+        raise ValueError(f"Values of {variable.name} contain NaN.")
+    if variable.value_type is str:
+        return values.astype(str)
+    if variable.value_type == Enum:
+        return np.asarray(variable.possible_values.encode(values))
+    return values.astype(variable.dtype)
@@ -0,0 +1,436 @@
+"""
+Synthetic Australian populations.
+
+Scaling work needs populations far larger than any survey: ten million
+people for a load test, a few hundred thousand for a soak test of the
+parallel runner. :func:`synthetic_population` draws one from simple
+distributions with NumPy, a handful of vectorised draws per column, so ten
+million people take a few seconds; :func:`synthetic_dataset` writes it as a
+:class:`~policyengine_au.data.ColumnarDataset`:
+
+    python -m policyengine_au.data.synthetic synthetic_10m --people 10_000_000
+
+The populations are random but shaped like the Australian one where it
+matters for the rules: households of one to six people with couples,
+children, pensioners and adults outside the family (grown-up children and
+housemates), so every means test and family payment has work to do; the
+four income sources; renters and homeowners; disability, carer and student
+flags; and employers of very different sizes, so some pay state payroll
+tax. Every distribution is a field of :class:`PopulationDistributions`, and
+the same seed always gives the same population.
+
+Groups nest: each person is in one tax unit, which is the same people as
+their benefit unit, inside one family, inside one household. A household's
+first one or two members are the family's adults and the next are its
+children. Any adults after them are tax and benefit units of their own:
+grown-up children stay in the family, housemates form families of their
+own.
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from policyengine_core.enums import EnumArray
+
+from policyengine_au.data.columnar_dataset import ColumnarDataset
+
+# The most workers a synthetic firm employs.
+MAX_FIRM_SIZE = 10_000
+
+# Each state's share of households.
+STATE_SHARES = {
+    "NSW": 0.31,
+    "VIC": 0.26,
+    "QLD": 0.2,
+    "WA": 0.11,
+    "SA": 0.07,
+    "TAS": 0.02,
+    "ACT": 0.02,
+    "NT": 0.01,
+}
+
+# The main range of each state's postcodes, which postcodes are drawn from
+# uniformly.
+POSTCODE_RANGES = {
+    "NSW": (2000, 2599),
+    "VIC": (3000, 3999),
+    "QLD": (4000, 4999),
+    "WA": (6000, 6797),
+    "SA": (5000, 5799),
+    "TAS": (7000, 7799),
+    "ACT": (2600, 2618),
+    "NT": (800, 899),
+}
+
+
+@dataclass
+class Amount:
+    """
+    A lognormal amount held by a share of the people eligible for it.
+
+    Attributes:
+        rate: The share of eligible people with a nonzero amount.
+        median: The median of the nonzero amounts.
+        sigma: The standard deviation of their logarithm.
+    """
+
+    rate: float
+    median: float
+    sigma: float
+
+    def sample(self, rng, eligible, round_to: int = 0, rate=None):
+        """
+        Draw amounts for the people or households in ``eligible``.
+
+        Args:
+            rng: The random generator.
+            eligible: A boolean array.
+            round_to: Round amounts to the nearest ``10 ** round_to``.
+            rate: The share to use instead of :attr:`rate`, for example
+                one per row.
+
+        Returns:
+            A float array the size of ``eligible``, zero where it is
+            ``False`` and for the people without the amount.
+        """
+        values = np.zeros(eligible.size)
+        rate = self.rate if rate is None else rate
+        rows = np.flatnonzero(
+            eligible & (rng.random(eligible.size, dtype=np.float32) < rate)
+        )
+        normal = rng.standard_normal(rows.size, dtype=np.float32)
+        values[rows] = np.round(self.median * np.exp(self.sigma * normal), -round_to)
+        return values
+
+
+@dataclass
+class PopulationDistributions:
+    """
+    The distributions a synthetic population is drawn from.
+
+    Amounts are annual, in dollars.
+
+    Attributes:
+        household_sizes: The share of households with one to six people.
+        couple_rate: The share of households of two or more headed by a
+            couple.
+        older_rate: The share of households headed by someone 65 or over.
+        other_adult_rate: The share of a household's members, after its
+            head and partner, who are adults outside the family's tax unit.
+        housemate_rate: The share of those adults who are housemates
+            rather than grown-up children.
+        state_shares: Each state's share of households.
+        employment_income: Wages of people aged 16 to 66.
+        child_employment_rate: The share of children aged 16 or over who
+            earn wages.
+        self_employment_income: Business income of people aged 18 to 74.
+        investment_income: Interest and dividends of adults.
+        rental_income: Net rental income of adults.
+        financial_assets: Financial assets of adults under 65.
+        pensioner_financial_assets: Financial assets of adults 65 or over.
+        non_financial_assets: Assessable non-financial assets of adults 65
+            or over.
+        help_debt: Student loan debt of adults under 40.
+        homeowner_rate: The share of households headed by someone under 65
+            who own their home.
+        older_homeowner_rate: The same share for heads 65 or over.
+        rent: The rent of households that do not own their home.
+        disability_rate: The share of people under 65 with a disability.
+        older_disability_rate: The share of people 65 or over with one.
+        carer_rate: The share of adults in a household with a disabled
+            member who care for them.
+        other_carer_rate: The share of other adults who are carers.
+        student_rate: The share of children aged 16 to 19 who study.
+        adult_student_rate: The share of adults aged 18 to 24 who study.
+    """
+
+    household_sizes: tuple = (0.25, 0.33, 0.16, 0.16, 0.07, 0.03)
+    couple_rate: float = 2 / 3
+    older_rate: float = 0.2
+    other_adult_rate: float = 0.1
+    housemate_rate: float = 0.5
+    state_shares: dict = field(default_factory=lambda: dict(STATE_SHARES))
+    employment_income: Amount = field(default_factory=lambda: Amount(0.75, 60_000, 0.7))
+    child_employment_rate: float = 0.3
+    self_employment_income: Amount = field(
+        default_factory=lambda: Amount(0.1, 30_000, 1.0)
+    )
+    investment_income: Amount = field(default_factory=lambda: Amount(0.4, 2_000, 1.2))
+    rental_income: Amount = field(default_factory=lambda: Amount(0.12, 12_000, 0.8))
+    financial_assets: Amount = field(default_factory=lambda: Amount(1.0, 30_000, 1.0))
+    pensioner_financial_assets: Amount = field(
+        default_factory=lambda: Amount(1.0, 150_000, 1.0)
+    )
+    non_financial_assets: Amount = field(
+        default_factory=lambda: Amount(1.0, 60_000, 1.0)
+    )
+    help_debt: Amount = field(default_factory=lambda: Amount(0.35, 20_000, 0.6))
+    homeowner_rate: float = 0.6
+    older_homeowner_rate: float = 0.8
+    rent: Amount = field(default_factory=lambda: Amount(1.0, 24_000, 0.35))
+    disability_rate: float = 0.08
+    older_disability_rate: float = 0.3
+    carer_rate: float = 0.4
+    other_carer_rate: float = 0.02
+    student_rate: float = 0.7
+    adult_student_rate: float = 0.3
+
+
+def synthetic_population(
+    people: int, seed: int = 0, distributions=None, tax_benefit_system=None
+):
+    """
+    Draw a synthetic population of about ``people`` people.
+
+    Every person belongs to one employer: workers to one of a long-tailed
+    range of firms, and everyone else to a single employer with no wages.
+
+    Args:
+        people: Approximate number of people.
+        seed: Random seed.
+        distributions: The :class:`PopulationDistributions` to draw from.
+            Defaults to the Australian-shaped ones.
+        tax_benefit_system: The system whose ``state`` enum is used.
+            Defaults to the baseline Australian system.
+
+    Returns:
+        The ``structure`` and ``variables`` arrays, as taken by
+        :meth:`ColumnarDataset.save`. Roles are integer indices into each
+        entity's roles.
+    """
+    if tax_benefit_system is None:
+        from policyengine_au.system import system as tax_benefit_system
+    dist = distributions or PopulationDistributions()
+    rng = np.random.default_rng(seed)
+
+    shares = np.asarray(dist.household_sizes) / np.sum(dist.household_sizes)
+    mean_size = np.dot(np.arange(1, shares.size + 1), shares)
+    households = max(round(people / mean_size), 1)
+    sizes = rng.choice(np.arange(1, shares.size + 1), households, p=shares)
+    household = np.repeat(np.arange(households), sizes)
+    count = household.size
+    starts = np.cumsum(sizes) - sizes
+    # Household values are copied to their members with ``np.repeat``, which
+    # is faster than indexing them by ``household``.
+    position = np.arange(count) - np.repeat(starts, sizes)
+
+    # Each household is its family's one or two adults, then children, then
+    # adults outside the family's tax unit.
+    couple = (sizes > 1) & (rng.random(households, dtype=np.float32) < dist.couple_rate)
+    family_adults = 1 + couple
+    others = rng.binomial(sizes - family_adults, dist.other_adult_rate)
+    head = position == 0
+    partner = (position == 1) & np.repeat(couple, sizes)
+    other = position >= np.repeat(sizes - others, sizes)
+    child = ~head & ~partner & ~other
+    housemate = other & (rng.random(count, dtype=np.float32) < dist.housemate_rate)
+
+    older = rng.random(households, dtype=np.float32) < dist.older_rate
+    head_age = np.where(
+        older, rng.integers(65, 95, households), rng.integers(20, 65, households)
+    )
+    age = np.repeat(head_age, sizes).astype(np.int32)
+    age[partner] = np.clip(
+        age[partner] + np.round(rng.normal(0, 4, partner.sum())), 18, 100
+    )
+    # Children are born after their head of household turned 17.
+    oldest_child = np.clip(head_age[household[child]] - 17, 1, 20)
+    age[child] = np.floor(rng.random(child.sum(), dtype=np.float32) * oldest_child)
+    age[other] = np.where(
+        housemate[other],
+        rng.integers(18, 65, other.sum()),
+        rng.integers(18, 35, other.sum()),
+    )
+    adult = ~child
+
+    employment_income = dist.employment_income.sample(
+        rng,
+        (age >= 16) & (age <= 66),
+        round_to=2,
+        rate=np.where(child, dist.child_employment_rate, dist.employment_income.rate),
+    )
+    self_employment_income = dist.self_employment_income.sample(
+        rng, adult & (age >= 18) & (age < 75), round_to=2
+    )
+    investment_income = dist.investment_income.sample(rng, adult)
+    rental_income = dist.rental_income.sample(rng, adult & (age >= 25), round_to=2)
+    financial_assets = np.where(
+        age >= 65,
+        dist.pensioner_financial_assets.sample(rng, adult & (age >= 65)),
+        dist.financial_assets.sample(rng, adult & (age < 65)),
+    )
+    non_financial_assets = dist.non_financial_assets.sample(rng, adult & (age >= 65))
+    help_debt = dist.help_debt.sample(rng, adult & (age >= 18) & (age < 40), round_to=2)
+
+    is_disabled = rng.random(count, dtype=np.float32) < np.where(
+        age >= 65, dist.older_disability_rate, dist.disability_rate
+    )
+    disabled_member = np.bincount(household, is_disabled, households) > 0
+    is_carer = (
+        adult
+        & ~is_disabled
+        & (
+            rng.random(count, dtype=np.float32)
+            < np.where(
+                np.repeat(disabled_member, sizes),
+                dist.carer_rate,
+                dist.other_carer_rate,
+            )
+        )
+    )
+    is_student = rng.random(count, dtype=np.float32) < np.where(
+        child & (age >= 16),
+        dist.student_rate,
+        np.where(other & (age <= 24), dist.adult_student_rate, 0),
+    )
+
+    is_homeowner = rng.random(households, dtype=np.float32) < np.where(
+        older, dist.older_homeowner_rate, dist.homeowner_rate
+    )
+    rent = dist.rent.sample(rng, ~is_homeowner)
+
+    names = np.array(list(dist.state_shares))
+    state_shares = np.array(list(dist.state_shares.values()))
+    state_index = rng.choice(
+        names.size, households, p=state_shares / state_shares.sum()
+    )
+    possible_values = tax_benefit_system.get_variable("state").possible_values
+    state_codes = np.asarray(possible_values.encode(names))
+    low, high = np.array([POSTCODE_RANGES[name] for name in names]).T
+    postcode = low[state_index] + np.floor(
+        rng.random(households, dtype=np.float32) * (high - low + 1)[state_index]
+    ).astype(int)
+
+    # New tax units start at each head and each adult outside the family;
+    # new families at each head and each housemate. Numbering them in person
+    # order keeps every group inside its household.
+    tax_unit = np.cumsum(head | other) - 1
+    family = np.cumsum(head | housemate) - 1
+    tax_unit_role = np.where(child, 2, np.where(partner, 1, 0))
+    family_role = np.where(child | (other & ~housemate), 1, 0)
+    structure = {
+        "person_id": np.arange(count),
+        "household_id": np.arange(households),
+        "person_household_id": household,
+        "person_household_role": np.zeros(count, dtype=np.int8),
+        "tax_unit_id": np.arange(tax_unit[-1] + 1),
+        "person_tax_unit_id": tax_unit,
+        "person_tax_unit_role": tax_unit_role.astype(np.int8),
+        "benefit_unit_id": np.arange(tax_unit[-1] + 1),
+        "person_benefit_unit_id": tax_unit,
+        "person_benefit_unit_role": child.astype(np.int8),
+        "family_id": np.arange(family[-1] + 1),
+        "person_family_id": family,
+        "person_family_role": family_role.astype(np.int8),
+    }
+    structure.update(_employers(rng, employment_income > 0, household))
+
+    variables = {
+        "age": age,
+        "employment_income": employment_income,
+        "self_employment_income": self_employment_income,
+        "investment_income": investment_income,
+        "rental_income": rental_income,
+        "financial_assets": financial_assets,
+        "non_financial_assets": non_financial_assets,
+        "help_debt": help_debt,
+        "is_disabled": is_disabled,
+        "is_carer": is_carer,
+        "is_student": is_student,
+        "state": EnumArray(np.repeat(state_codes[state_index], sizes), possible_values),
+        "postcode": np.repeat(_postcodes(postcode), sizes),
+        "is_homeowner": is_homeowner,
+        "rent": rent,
+        "household_weight": rng.uniform(500, 1_500, households),
+    }
+    return structure, variables
+
+
+def _employers(rng, works, household) -> dict:
+    """
+    Employer structure arrays, with firm sizes following a Pareto tail.
+
+    Each firm employs the workers of a run of neighbouring households, so
+    an employer never links households far apart in the dataset and chunks
+    of households stay close to their requested size. The people without
+    wages in each household share an employer of their own, with no wages.
+    """
+    count = works.size
+    workers = np.flatnonzero(works)
+    # A few employers have wage bills far above the payroll tax thresholds.
+    firm_sizes = np.ceil(rng.pareto(1.1, max(workers.size // 8, 1)) + 1).astype(int)
+    firm_sizes = np.minimum(firm_sizes, MAX_FIRM_SIZE)
+    # Fill the firms in turn, with firms of eight for any workers left over.
+    ends = np.cumsum(firm_sizes)
+    position = np.arange(workers.size)
+    firm_of_worker = np.where(
+        position < ends[-1],
+        np.searchsorted(ends, position, side="right"),
+        firm_sizes.size + (position - ends[-1]) // 8,
+    )
+    # A household's workers all join the firm its first worker falls in.
+    worker_household = household[workers]
+    first = np.diff(worker_household, prepend=-1) != 0
+    firm_of_worker = firm_of_worker[first][np.cumsum(first) - 1]
+    firm_of_worker = np.cumsum(np.diff(firm_of_worker, prepend=-1) != 0) - 1
+    firms = firm_of_worker.max(initial=-1) + 1
+
+    idle_household = household[~works]
+    idle_employer = firms + np.cumsum(np.diff(idle_household, prepend=-1) != 0) - 1
+    employer = np.empty(count, dtype=np.int64)
+    employer[workers] = firm_of_worker
+    employer[~works] = idle_employer
+    return {
+        "employer_id": np.arange(idle_employer.max(initial=firms - 1) + 1),
+        "person_employer_id": employer,
+        "person_employer_role": np.zeros(count, dtype=np.int8),
+    }
+
+
+def _postcodes(numbers):
+    """Four-digit postcode strings, built without formatting each number."""
+    digits = numbers[:, None] // np.array([1_000, 100, 10, 1]) % 10
+    return (digits + ord("0")).astype(np.uint32).view("<U4")[:, 0]
+
+
+def synthetic_dataset(
+    path, people: int, seed: int = 0, period: str = "2025", distributions=None
+) -> ColumnarDataset:
+    """
+    Write a synthetic population of about ``people`` people.
+
+    Args:
+        path: Directory to write the :class:`ColumnarDataset` to.
+        people: Approximate number of people.
+        seed: Random seed.
+        period: Period of the input variables.
+        distributions: The :class:`PopulationDistributions` to draw from.
+
+    Returns:
+        The written dataset.
+    """
+    structure, variables = synthetic_population(people, seed, distributions)
+    return ColumnarDataset.save(
+        Path(path),
+        structure=structure,
+        variables=variables,
+        time_period=period,
+        name=f"synthetic_{people}",
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic population.")
+    parser.add_argument("path", help="Directory to write the dataset to.")
+    parser.add_argument("--people", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--period", default="2025")
+    args = parser.parse_args(argv)
+    dataset = synthetic_dataset(args.path, args.people, args.seed, args.period)
+    print(dataset)
+
+
+if __name__ == "__main__":
+    main()
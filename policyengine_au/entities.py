@@ -149,4 +149,33 @@ Household = build_entity(
 )
 
 
-entities = [Person, TaxUnit, BenefitUnit, Family, Household]
+Employer = build_entity(
+    key="employer",
+    plural="employers",
+    label="Employer",
+    doc="""
+    A business that pays wages in Australia.
+
+    This is the liable entity for state and territory payroll taxes, which
+    are levied on an employer's total taxable wages. Employers related under
+    the payroll tax grouping provisions share a group identifier, and their
+    wages are combined when the group's threshold is applied.
+
+    Firm-level datasets should store employee records grouped by employer:
+    aggregating wages is one linear pass over the records, and it runs
+    several times faster when each employer's records are contiguous.
+
+    Reference: https://business.gov.au/finance/taxation/payroll-tax
+    """,
+    roles=[
+        {
+            "key": "employee",
+            "plural": "employees",
+            "label": "Employee",
+            "doc": "A person paid wages by the employer",
+        },
+    ],
+)
+
+
+entities = [Person, TaxUnit, BenefitUnit, Family, Household, Employer]
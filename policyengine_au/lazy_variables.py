@@ -0,0 +1,213 @@
+"""
+Lazily imported variables.
+
+A system knows which module under ``variables/`` defines each variable
+without importing any of them: a snapshot (see :mod:`policyengine_au.snapshot`)
+records the index, and otherwise :func:`variable_modules` reads it from the
+sources. :class:`LazyVariables` stands in for the system's ``variables``
+dict and imports a variable's module the first time the variable is looked
+up.
+
+Walking every variable would import them all, so a simulation is built
+inside :func:`loaded_variables_only`: only imported variables can hold
+inputs, so core's scan for input variables need not see the others.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+import ast
+
+_loaded_only = ContextVar("loaded_variables_only", default=False)
+
+
+@contextmanager
+def loaded_variables_only():
+    """
+    Walk only the variables imported so far, within the block.
+
+    Iterating a :class:`LazyVariables` (or its ``keys``, ``values`` and
+    ``items``) in the block skips the variables not yet imported, instead of
+    importing them. Lookups still import as usual.
+    """
+    token = _loaded_only.set(True)
+    try:
+        yield
+    finally:
+        _loaded_only.reset(token)
+
+
+def variable_modules(variables_dir) -> dict:
+    """
+    Index the variables defined under a directory, without importing them.
+
+    Core registers the ``Variable`` subclasses each module defines, so each
+    module is parsed and its top-level classes deriving from ``Variable``,
+    or from another such class in the module, are taken as its variables.
+
+    Args:
+        variables_dir: The system's ``variables_dir``.
+
+    Returns:
+        The module defining each variable, as :class:`LazyVariables` takes.
+    """
+    variables_dir = Path(variables_dir)
+    modules = {}
+    for file_path in sorted(variables_dir.rglob("*.py")):
+        if file_path.name == "__init__.py":
+            continue
+        module = ".".join(file_path.relative_to(variables_dir).with_suffix("").parts)
+        variables = {"Variable"}
+        for node in ast.parse(file_path.read_bytes()).body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = {
+                base.attr if isinstance(base, ast.Attribute) else base.id
+                for base in node.bases
+                if isinstance(base, (ast.Name, ast.Attribute))
+            }
+            if bases & variables:
+                variables.add(node.name)
+                modules[node.name] = module
+    return modules
+
+
+class LazyVariables(dict):
+    """
+    A system's variables dict that imports each module on first lookup.
+
+    Looking a variable up (``variables[name]``, ``variables.get(name)``)
+    imports just the module that defines it, and membership tests use the
+    index without importing anything. Anything that walks every variable
+    (iteration, ``keys``, ``values``, ``items``) imports the rest first, so
+    it sees the same variables an eager load would, unless inside
+    :func:`loaded_variables_only`. A ``copy`` shares the module index and
+    each module's definitions, so a module is imported once for a system
+    and every copy of its variables.
+
+    Args:
+        system: The system the variables belong to.
+        modules: The module defining each variable, as a
+            ``{variable_name: "gov.ato.income_tax.income_tax"}`` dict
+            relative to the system's ``variables_dir``.
+        checked: Whether every ``defined_for`` link between the variables
+            has already been checked, or must be as each one is imported.
+    """
+
+    def __init__(self, system, modules: dict, checked: bool = False):
+        super().__init__()
+        self._system = system
+        self._checked = checked
+        self._pending = dict(modules)
+        names_in_module = defaultdict(list)
+        for name, module in modules.items():
+            names_in_module[module].append(name)
+        self._names_in_module = dict(names_in_module)
+        # The variables each module defined when imported, for every copy.
+        self._imported = {}
+        self._root = self
+
+    def _load(self, name: str) -> None:
+        module = self._pending.get(name)
+        if module is None:
+            return
+        # Forget the module's variables before importing it, so core's
+        # conflict check for each one finds nothing registered.
+        names = self._names_in_module[module]
+        for other in names:
+            self._pending.pop(other, None)
+        if self._root is not self:
+            # A copy takes the definitions its original imported.
+            self._root._load(name)
+            for other, variable in self._imported[module].items():
+                super().__setitem__(other, variable)
+            return
+        system = self._system
+        file_path = system.variables_dir.joinpath(*module.split(".")).with_suffix(".py")
+        # Checking a variable's ``defined_for`` links looks up the variable
+        # it is defined for, and walks those defined for it, of which only
+        # the ones already imported need checking.
+        system._defined_for_checks_deferred = self._checked
+        try:
+            with loaded_variables_only():
+                system.add_variables_from_file(str(file_path))
+        finally:
+            system._defined_for_checks_deferred = False
+        self._imported[module] = {
+            other: dict.__getitem__(self, other)
+            for other in names
+            if dict.__contains__(self, other)
+        }
+
+    def load_all(self) -> None:
+        """Import every variable not yet imported."""
+        while self._pending:
+            self._load(next(iter(self._pending)))
+
+    @property
+    def loaded(self) -> list:
+        """The names of the variables imported so far."""
+        return list(super().keys())
+
+    def __getitem__(self, name):
+        if name in self._pending:
+            self._load(name)
+        return super().__getitem__(name)
+
+    def get(self, name, default=None):
+        if name in self._pending:
+            self._load(name)
+        return super().get(name, default)
+
+    def __contains__(self, name):
+        return name in self._pending or super().__contains__(name)
+
+    def __setitem__(self, name, variable):
+        if name in self._pending:
+            self._load(name)
+        super().__setitem__(name, variable)
+
+    def __delitem__(self, name):
+        if name in self._pending:
+            self._load(name)
+        super().__delitem__(name)
+
+    def pop(self, name, *default):
+        if name in self._pending:
+            self._load(name)
+        return super().pop(name, *default)
+
+    def __len__(self):
+        return super().__len__() + len(self._pending)
+
+    def __iter__(self):
+        if not _loaded_only.get():
+            self.load_all()
+        return super().__iter__()
+
+    def keys(self):
+        if not _loaded_only.get():
+            self.load_all()
+        return super().keys()
+
+    def values(self):
+        if not _loaded_only.get():
+            self.load_all()
+        return super().values()
+
+    def items(self):
+        if not _loaded_only.get():
+            self.load_all()
+        return super().items()
+
+    def copy(self) -> "LazyVariables":
+        copied = LazyVariables.__new__(LazyVariables)
+        dict.__init__(copied, super().items())
+        copied._system = self._system
+        copied._checked = self._checked
+        copied._pending = dict(self._pending)
+        copied._names_in_module = self._names_in_module
+        copied._imported = self._imported
+        copied._root = self._root
+        return copied
@@ -0,0 +1,284 @@
+"""
+Batched marginal and effective marginal tax rates.
+
+A marginal tax rate is the share of an extra dollar of income that a
+household loses to taxes and withdrawn benefits. Measuring it by running a
+second simulation with everyone's income raised recomputes every variable,
+and conflates the responses of people who share a household.
+
+:func:`marginal_tax_rates` instead builds one stacked simulation holding a
+copy of the population for each income delta and each position within the
+target entity. Copy ``j`` raises the income of the ``j``-th member of every
+household only, so each person's rate reflects their own extra dollar. The
+stacked simulation starts with every value the original has already
+calculated, except those downstream of the perturbed income (found by
+:func:`downstream_variables`), so only the chain from income to the target
+is recomputed, once, for all copies together.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from types import CodeType, FunctionType
+
+import numpy as np
+from policyengine_core.periods import period as as_period
+
+# Income increase used when no delta is given, in dollars a year.
+DEFAULT_DELTA = 1_000
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+def variable_dependencies(system) -> dict:
+    """
+    The variables each variable's formulas read.
+
+    Dependencies are found from the variable names a formula's code
+    mentions as string constants (``person("age", period)``, ``add(...,
+    ["employment_income", ...])``) or imports, in the formula itself and in
+    the functions of this package it calls, directly or through other such
+    functions (``group_payroll_tax``), and from ``adds``/``subtracts``
+    lists. A formula that builds variable names at run time is not
+    followed.
+
+    Args:
+        system: A tax-benefit system.
+
+    Returns:
+        A ``{variable_name: set of variable names}`` dict.
+    """
+    names = set(system.variables)
+    # The names found in each function's code, shared between formulas.
+    found_in = {}
+    dependencies = {}
+    for name, variable in system.variables.items():
+        found = set()
+        for formula in variable.formulas.values():
+            found |= _names_in_function(formula, names, found_in)
+        for listed in (variable.adds, variable.subtracts):
+            if isinstance(listed, (list, tuple)):
+                found |= names.intersection(listed)
+        found.discard(name)
+        dependencies[name] = found
+    return dependencies
+
+
+def _names_in_function(function: FunctionType, names: set, found_in: dict) -> set:
+    code = function.__code__
+    if code not in found_in:
+        # A function calling itself, directly or not, adds nothing more.
+        found_in[code] = found = set()
+        for helper in _helpers(code, function.__globals__):
+            found |= _names_in_function(helper, names, found_in)
+        found |= _names_in_code(code, names)
+    return found_in[code]
+
+
+def _helpers(code: CodeType, namespace: dict) -> list:
+    """The functions of this package that ``code`` calls by global name."""
+    helpers = []
+    for name in code.co_names:
+        helper = namespace.get(name)
+        if isinstance(helper, FunctionType) and Path(
+            helper.__code__.co_filename
+        ).is_relative_to(PACKAGE_DIR):
+            helpers.append(helper)
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType):
+            helpers += _helpers(constant, namespace)
+    return helpers
+
+
+def _names_in_code(code: CodeType, names: set) -> set:
+    found = set()
+    for constant in code.co_consts:
+        if isinstance(constant, str):
+            if constant in names:
+                found.add(constant)
+        elif isinstance(constant, CodeType):
+            found |= _names_in_code(constant, names)
+        elif isinstance(constant, (tuple, frozenset)):
+            found |= names.intersection(
+                item for item in constant if isinstance(item, str)
+            )
+    return found
+
+
+def downstream_variables(system, variable: str) -> set:
+    """
+    The variables whose values can change when ``variable`` changes.
+
+    Args:
+        system: A tax-benefit system.
+        variable: The name of the variable that changes.
+
+    Returns:
+        The names of the variables that read ``variable``, directly or
+        through other variables, not including ``variable`` itself.
+    """
+    dependents = defaultdict(set)
+    for name, dependencies in variable_dependencies(system).items():
+        for dependency in dependencies:
+            dependents[dependency].add(name)
+    downstream = set()
+    pending = [variable]
+    while pending:
+        for dependent in dependents[pending.pop()]:
+            if dependent not in downstream:
+                downstream.add(dependent)
+                pending.append(dependent)
+    downstream.discard(variable)
+    return downstream
+
+
+def marginal_tax_rates(
+    simulation,
+    period,
+    deltas=DEFAULT_DELTA,
+    variable: str = "employment_income",
+    target: str = "household_net_income",
+):
+    """
+    Each person's marginal tax rate on ``variable``.
+
+    The rate is ``1 - change in target / delta`` when only that person's
+    ``variable`` rises by ``delta``. With the default target, household net
+    income, this is the effective marginal tax rate, including benefits
+    withdrawn by the means tests.
+
+    Args:
+        simulation: The simulation to measure, which is left unchanged.
+        period: The period to measure.
+        deltas: An income increase, or a sequence of increases to measure
+            in the same batch.
+        variable: The person-level income variable to increase.
+        target: The income measure whose change is compared.
+
+    Returns:
+        An array with one rate per person, or, if ``deltas`` is a sequence,
+        one row of rates per delta.
+    """
+    period = as_period(period)
+    system = simulation.tax_benefit_system
+    if not system.get_variable(variable).entity.is_person:
+        raise ValueError(
+            f"Marginal tax rates need a person-level variable, but {variable} "
+            f"is defined for {system.get_variable(variable).entity.plural}."
+        )
+    delta_values = np.atleast_1d(np.asarray(deltas, dtype=float))
+
+    # Calculating the target first leaves everything it depends on in the
+    # original simulation's cache, for the stacked copies to start from.
+    baseline_target = np.asarray(simulation.calculate(target, period))
+    baseline_income = np.asarray(simulation.calculate(variable, period), dtype=float)
+
+    target_entity = system.get_variable(target).entity
+    persons = simulation.persons
+    if target_entity.is_person:
+        group = np.arange(persons.count)
+        position = np.zeros(persons.count, dtype=int)
+    else:
+        target_population = simulation.populations[target_entity.key]
+        group = np.asarray(target_population.members_entity_id)
+        position = np.asarray(target_population.members_position)
+
+    # Copy (delta, j) holds the target groups with a j-th member, and
+    # raises that member's income.
+    group_sizes = np.bincount(group)
+    source, copy, raised, delta_index = [], [], [], []
+    for i in range(delta_values.size):
+        for j in range(group_sizes.max(initial=0)):
+            members = np.flatnonzero(group_sizes[group] > j)
+            source.append(members)
+            copy.append(np.full(members.size, len(copy)))
+            raised.append(position[members] == j)
+            delta_index.append(np.full(members.size, i))
+    source = np.concatenate(source)
+    copy = np.concatenate(copy)
+    raised = np.concatenate(raised)
+    delta_index = np.concatenate(delta_index)
+    increase = np.where(raised, delta_values[delta_index], 0)
+
+    stacked, sources = _stack(simulation, source, copy)
+    _copy_values(
+        simulation,
+        stacked,
+        sources,
+        skip={(name, period) for name in downstream_variables(system, variable)}
+        | {(variable, period)},
+    )
+    stacked.set_input(variable, period, baseline_income[source] + increase)
+
+    stacked_target = np.asarray(stacked.calculate(target, period), dtype=float)
+    raised_people = np.flatnonzero(raised)
+    if target_entity.is_person:
+        raised_groups = raised_people
+    else:
+        raised_groups = np.asarray(
+            stacked.populations[target_entity.key].members_entity_id
+        )[raised_people]
+    change = stacked_target[raised_groups] - baseline_target[
+        sources[target_entity.key][raised_groups]
+    ].astype(float)
+    rates = np.empty((delta_values.size, persons.count))
+    rates[delta_index[raised_people], source[raised_people]] = (
+        1 - change / increase[raised_people]
+    )
+    return rates if np.ndim(deltas) else rates[0]
+
+
+def _stack(simulation, source, copy):
+    """
+    A simulation holding copies of the people in ``source``.
+
+    Each person keeps their roles, and the people of each copy keep their
+    group entities, numbered afresh.
+
+    Returns:
+        The stacked simulation, and for each entity the index in
+        ``simulation`` of each of its stacked members.
+    """
+    from policyengine_au.system import Simulation
+
+    system = simulation.tax_benefit_system
+    populations = system.instantiate_entities()
+    people = populations[system.person_entity.key]
+    people.count = source.size
+    people.ids = np.arange(source.size)
+    sources = {system.person_entity.key: source}
+    for entity in system.group_entities:
+        original = simulation.populations[entity.key]
+        keys = copy * original.count + np.asarray(original.members_entity_id)[source]
+        unique_keys, members_entity_id = np.unique(keys, return_inverse=True)
+        population = populations[entity.key]
+        population.count = unique_keys.size
+        population.ids = np.arange(unique_keys.size)
+        population.members_entity_id = members_entity_id
+        population.members_role = np.asarray(original.members_role)[source]
+        sources[entity.key] = unique_keys % original.count
+    return Simulation(tax_benefit_system=system, populations=populations), sources
+
+
+def _copy_values(simulation, stacked, sources, skip):
+    """Copy the values ``simulation`` holds into ``stacked``, bar ``skip``."""
+    inputs, derived = [], []
+    holders = [
+        (name, holder)
+        for population in simulation.populations.values()
+        for name, holder in population._holders.items()
+    ]
+    for name, holder in holders:
+        entity_source = sources[holder.variable.entity.key]
+        for branch_name, known_period in holder.get_known_branch_periods():
+            if branch_name != "default" or (name, known_period) in skip:
+                continue
+            value = holder.get_array(known_period)[entity_source]
+            if holder.is_derived(known_period):
+                derived.append((name, known_period, value))
+            else:
+                inputs.append((name, known_period, value))
+    # Inputs go in first, so the values calculated from them are newer.
+    for name, known_period, value in inputs:
+        stacked.set_input(name, known_period, value)
+    for name, known_period, value in derived:
+        stacked.get_holder(name).put_in_cache(value, known_period, derived=True)
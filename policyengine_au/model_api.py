@@ -15,14 +15,37 @@ from policyengine_au.entities import (
     BenefitUnit,
     Family,
     Household,
+    Employer,
 )
 
 # Import Australian state codes
 from policyengine_au.variables.input.demographics.state import StateCode
 
+# Vectorised rate schedules
+from policyengine_au.utils.schedules import (
+    MarginalRateSchedule,
+    RateSchedule,
+    StepRateSchedule,
+)
+
+# Period-indexed parameter views for hot formulas
+from policyengine_au.utils.compiled_parameters import (
+    CompiledParameters,
+    compiled_parameters,
+)
+
+# Per-category dispatch for state-split variables
+from policyengine_au.utils.dispatch import dispatch
+
+# Totals over non-entity groupings
+from policyengine_au.utils.segments import group_sum
+
 # Currency unit
 AUD = "currency-AUD"
 
+# Services Australia annualises fortnightly rates over 26 fortnights
+FORTNIGHTS_IN_YEAR = 26
+
 # Import commonly used functions from core
 from policyengine_core.model_api import *
 
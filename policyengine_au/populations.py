@@ -0,0 +1,281 @@
+"""
+Populations with a cached membership index.
+
+Core's group populations recompute membership facts on every projection:
+``value_from_first_person`` counts members and reorders the whole person
+array, ``has_role`` compares every person's role object, and
+``members_position`` is filled by a Python loop over persons. The
+populations here build one immutable :class:`MembershipIndex` per group
+entity the first time it is needed and answer every projection and
+aggregation from it, so cross-entity operations become gathers and
+contiguous reductions over precomputed offsets.
+"""
+
+import numpy as np
+from policyengine_core import projectors
+from policyengine_core.enums import EnumArray
+from policyengine_core.populations import GroupPopulation, Population
+
+from policyengine_au.utils.segments import SegmentIndex
+
+
+class MembershipIndex:
+    """
+    Immutable index of the members of each entity in a group population.
+
+    Args:
+        members_entity_id: The entity index of each person.
+        members_role: The role of each person in their entity.
+        count: The number of entities.
+        position: The position of each person within their entity,
+            numbering each entity's members from 0. Defaults to the order
+            of the persons.
+
+    Raises:
+        ValueError: If ``position`` does not number each entity's members
+            from 0.
+
+    Attributes:
+        counts: Number of members of each entity.
+        offsets: Start of each entity's members in ``order``, plus the total.
+        order: Persons sorted by entity, and by position within each
+            entity.
+        position: Position of each person within their entity.
+        first_person: For each entity with members, its first member.
+    """
+
+    def __init__(self, members_entity_id, members_role, count: int, position=None):
+        ids = np.asarray(members_entity_id)
+        self.count = count
+        self.members_entity_id = ids
+        self.members_role = members_role
+        self.counts = np.bincount(ids, minlength=count)
+        self.offsets = np.concatenate([[0], np.cumsum(self.counts)])
+        sorted_position = np.arange(ids.size) - np.repeat(
+            self.offsets[:-1], self.counts
+        )
+        if position is not None:
+            position = np.array(position, dtype=ids.dtype)
+            self.order = np.lexsort((position, ids))
+            if not np.array_equal(position[self.order], sorted_position):
+                raise ValueError(
+                    "Member positions must number each entity's members from 0."
+                )
+            self.is_sorted = bool(np.all(self.order == np.arange(ids.size)))
+            self.position = position
+        else:
+            self.is_sorted = bool(np.all(ids[1:] >= ids[:-1]))
+            if self.is_sorted:
+                self.order = np.arange(ids.size)
+            else:
+                self.order = np.argsort(ids, kind="stable")
+            self.position = np.empty_like(ids)
+            self.position[self.order] = sorted_position
+        self.non_empty = self.counts > 0
+        self.first_person = self.order[self.offsets[:-1][self.non_empty]]
+        for array in (
+            self.counts,
+            self.offsets,
+            self.order,
+            self.position,
+            self.non_empty,
+            self.first_person,
+        ):
+            array.setflags(write=False)
+        self._role_masks = {}
+        self._nth_members = {0: (self.non_empty, self.first_person)}
+
+    def role_mask(self, role):
+        """Whether each person has ``role`` (or one of its subroles)."""
+        mask = self._role_masks.get(role.key)
+        if mask is None:
+            roles = role.subroles or [role]
+            mask = np.logical_or.reduce([self.members_role == item for item in roles])
+            mask.setflags(write=False)
+            self._role_masks[role.key] = mask
+        return mask
+
+    def nth_members(self, n: int):
+        """
+        The entities with at least ``n + 1`` members, and each one's member
+        at position ``n``.
+        """
+        nth = self._nth_members.get(n)
+        if nth is None:
+            has_nth = self.counts > n
+            nth = (has_nth, self.order[self.offsets[:-1][has_nth] + n])
+            self._nth_members[n] = nth
+        return nth
+
+
+class IndexedPopulation(Population):
+    """The person population, reading roles from the group indices."""
+
+    def clone(self, simulation, share_arrays: bool = False):
+        result = super().clone(simulation, share_arrays=share_arrays)
+        # Core's clone always builds a plain Population.
+        result.__class__ = type(self)
+        return result
+
+    def has_role(self, role):
+        self.entity.check_role_validity(role)
+        group_population = self.simulation.get_population(role.entity.plural)
+        if isinstance(group_population, IndexedGroupPopulation):
+            return group_population.membership.role_mask(role)
+        return super().has_role(role)
+
+
+class IndexedGroupPopulation(GroupPopulation):
+    """A group population answering membership queries from its index."""
+
+    def __init__(self, entity, members):
+        super().__init__(entity, members)
+        self._membership = None
+        self._positions = None
+        self._segment_indices = {}
+
+    def clone(self, simulation, members, share_arrays: bool = False):
+        result = super().clone(simulation, members, share_arrays=share_arrays)
+        # Core's clone always builds a plain GroupPopulation; the indices
+        # are immutable, so the clone can share them.
+        result.__class__ = type(self)
+        result._membership = self._membership
+        result._positions = self._positions
+        result._segment_indices = dict(self._segment_indices)
+        return result
+
+    def segment_index(self, variable: str, period, ungrouped=-1) -> SegmentIndex:
+        """
+        The index of the groups a variable's identifiers form, built once.
+
+        Args:
+            variable: A variable of this entity holding group identifiers.
+            period: The period to read it for.
+            ungrouped: Identifier marking entities in no group.
+
+        Returns:
+            A :class:`~policyengine_au.utils.segments.SegmentIndex`, reused
+            for as long as the identifiers are unchanged.
+        """
+        group_ids = np.asarray(self(variable, period))
+        key = (variable, ungrouped)
+        index = self._segment_indices.get(key)
+        if index is None or not np.array_equal(index.group_ids, group_ids):
+            index = self._segment_indices[key] = SegmentIndex(group_ids, ungrouped)
+        return index
+
+    @property
+    def membership(self) -> MembershipIndex:
+        """The membership index, built on first use."""
+        if self._membership is None:
+            self._membership = MembershipIndex(
+                self.members_entity_id,
+                self.members_role,
+                self.count,
+                self._positions,
+            )
+        return self._membership
+
+    @GroupPopulation.members_entity_id.setter
+    def members_entity_id(self, members_entity_id):
+        self._members_entity_id = members_entity_id
+        # Positions given for other members no longer apply.
+        self._positions = None
+        self._membership = None
+
+    @GroupPopulation.members_role.setter
+    def members_role(self, members_role):
+        if members_role is not None:
+            self._members_role = np.array(members_role)
+            self._membership = None
+
+    @property
+    def members_position(self):
+        return self.membership.position
+
+    @members_position.setter
+    def members_position(self, members_position):
+        # The index is rebuilt to order each entity's members by position.
+        self._positions = members_position
+        self._membership = None
+
+    @property
+    def ordered_members_map(self):
+        return self.membership.order
+
+    @projectors.projectable
+    def sum(self, array, role=None):
+        self.entity.check_role_validity(role)
+        self.members.check_array_compatible_with_entity(array)
+        if role is None:
+            return np.bincount(
+                self.members_entity_id, weights=array, minlength=self.count
+            )
+        role_filter = self.membership.role_mask(role)
+        return np.bincount(
+            self.members_entity_id[role_filter],
+            weights=array[role_filter],
+            minlength=self.count,
+        )
+
+    @projectors.projectable
+    def reduce(self, array, reducer, neutral_element, role=None):
+        if not hasattr(reducer, "reduceat"):
+            return super().reduce(array, reducer, neutral_element, role=role)
+        self.members.check_array_compatible_with_entity(array)
+        self.entity.check_role_validity(role)
+        membership = self.membership
+        if role is not None:
+            array = np.where(membership.role_mask(role), array, neutral_element)
+        result = self.filled_array(neutral_element)
+        if not membership.non_empty.any():
+            return result
+        sorted_array = array if membership.is_sorted else array[membership.order]
+        starts = membership.offsets[:-1][membership.non_empty]
+        result[membership.non_empty] = reducer.reduceat(sorted_array, starts)
+        return result
+
+    @projectors.projectable
+    def nb_persons(self, role=None):
+        if role is None:
+            return self.membership.counts.copy()
+        return self.sum(self.membership.role_mask(role))
+
+    @projectors.projectable
+    def value_from_person(self, array, role, default=0):
+        self.entity.check_role_validity(role)
+        if role.max != 1:
+            raise Exception(
+                "You can only use value_from_person with a role that is unique in {}. Role {} is not unique.".format(
+                    self.entity.key, role.key
+                )
+            )
+        self.members.check_array_compatible_with_entity(array)
+        role_filter = self.membership.role_mask(role)
+        result = self.filled_array(default, dtype=array.dtype)
+        result[self.members_entity_id[role_filter]] = array[role_filter]
+        if isinstance(array, EnumArray):
+            result = EnumArray(result, array.possible_values)
+        return result
+
+    @projectors.projectable
+    def value_nth_person(self, n, array, default=0):
+        self.members.check_array_compatible_with_entity(array)
+        has_nth, nth_members = self.membership.nth_members(n)
+        result = self.filled_array(default, dtype=array.dtype)
+        result[has_nth] = array[nth_members]
+        if isinstance(array, EnumArray):
+            result = EnumArray(result, array.possible_values)
+        return result
+
+    @projectors.projectable
+    def value_from_first_person(self, array):
+        return self.value_nth_person(0, array)
+
+    def project(self, array, role=None):
+        self.check_array_compatible_with_entity(array)
+        self.entity.check_role_validity(role)
+        if role is None:
+            return array[self.members_entity_id]
+        role_condition = self.membership.role_mask(role)
+        return np.where(role_condition, array[self.members_entity_id], 0)
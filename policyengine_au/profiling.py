@@ -0,0 +1,215 @@
+"""
+Per-variable profiling of simulations.
+
+A slow calculation is hard to attribute: a single ``calculate`` call runs
+every formula its variable depends on. :meth:`Simulation.profile
+<policyengine_au.system.Simulation.profile>` opts a simulation into a
+:class:`ProfilingTracer` that records, for each variable and period, how
+often it was calculated, its cumulative time and its self time (excluding
+the variables it triggered), the bytes of the arrays it returned, and which
+variables it triggered:
+
+    with simulation.profile() as profile:
+        simulation.calculate("income_tax", 2025)
+    print(profile.table())
+    profile.write_collapsed_stacks("income_tax.folded")
+    profile.write_chrome_trace("income_tax.json")
+
+Collapsed stacks (one ``caller;callee self_microseconds`` line per call
+path) are read by ``flamegraph.pl``, speedscope and inferno; Chrome trace
+files by ``chrome://tracing`` and Perfetto.
+
+Values already calculated are returned by core without reaching the tracer,
+so only calculations that ran a formula, or looked up a stored value, are
+counted.
+"""
+
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+
+@dataclass
+class VariableProfile:
+    """
+    What one variable cost in one period.
+
+    Attributes:
+        variable: The variable's name.
+        period: The period it was calculated for.
+        calls: The number of times it was calculated.
+        cumulative_s: Time spent calculating it, including the variables it
+            triggered.
+        self_s: Time spent in its own formula, excluding those variables.
+        bytes: Bytes of the arrays it returned.
+        triggered: How many times it triggered each ``(variable, period)``.
+    """
+
+    variable: str
+    period: str
+    calls: int = 0
+    cumulative_s: float = 0.0
+    self_s: float = 0.0
+    bytes: int = 0
+    triggered: dict = field(default_factory=lambda: defaultdict(int))
+
+
+class _Frame:
+    __slots__ = ("key", "start", "child_s", "bytes")
+
+    def __init__(self, key, start):
+        self.key = key
+        self.start = start
+        self.child_s = 0.0
+        self.bytes = 0
+
+
+class ProfilingTracer:
+    """
+    A tracer recording the cost of each calculation.
+
+    Wraps the simulation's own tracer, which still keeps the calculation
+    stack (used to detect cycles) and, for a traced simulation, the full
+    computation log.
+
+    Args:
+        tracer: The tracer to wrap.
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.profiles = {}
+        self.stacks = defaultdict(float)
+        self.events = []
+        self._frames = []
+        self._origin = time.perf_counter()
+
+    @property
+    def stack(self):
+        return self.tracer.stack
+
+    def __getattr__(self, name):
+        # Anything else (computation logs, trees) comes from the wrapped tracer.
+        if name == "tracer":
+            raise AttributeError(name)
+        return getattr(self.tracer, name)
+
+    def record_calculation_start(self, variable, period, branch_name="default"):
+        self.tracer.record_calculation_start(variable, period, branch_name)
+        key = (variable, str(period), branch_name)
+        if self._frames:
+            parent = self._profile(self._frames[-1].key)
+            parent.triggered[key[:2]] += 1
+        self._frames.append(_Frame(key, time.perf_counter()))
+
+    def record_parameter_access(self, parameter, period, branch_name, value):
+        self.tracer.record_parameter_access(parameter, period, branch_name, value)
+
+    def record_calculation_result(self, value):
+        self.tracer.record_calculation_result(value)
+        if self._frames:
+            self._frames[-1].bytes = getattr(value, "nbytes", 0)
+
+    def record_calculation_end(self):
+        self.tracer.record_calculation_end()
+        end = time.perf_counter()
+        frame = self._frames.pop()
+        elapsed = end - frame.start
+        self_s = elapsed - frame.child_s
+        profile = self._profile(frame.key)
+        profile.calls += 1
+        profile.self_s += self_s
+        profile.bytes += frame.bytes
+        # A variable calculated inside itself (for another period, say) is
+        # only timed cumulatively at its outermost calculation.
+        if not any(outer.key[:2] == frame.key[:2] for outer in self._frames):
+            profile.cumulative_s += elapsed
+        if self._frames:
+            self._frames[-1].child_s += elapsed
+        path = ";".join(_label(item.key) for item in (*self._frames, frame))
+        self.stacks[path] += self_s
+        self.events.append(
+            {
+                "name": frame.key[0],
+                "cat": "variable",
+                "ph": "X",
+                "ts": (frame.start - self._origin) * 1e6,
+                "dur": elapsed * 1e6,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {"period": frame.key[1], "branch": frame.key[2]},
+            }
+        )
+
+    def _profile(self, key) -> VariableProfile:
+        profile = self.profiles.get(key[:2])
+        if profile is None:
+            profile = self.profiles[key[:2]] = VariableProfile(*key[:2])
+        return profile
+
+    def summary(self) -> list:
+        """
+        The profile of every variable calculated, by self time.
+
+        Returns:
+            A list of :class:`VariableProfile`, slowest first.
+        """
+        return sorted(
+            self.profiles.values(), key=lambda profile: profile.self_s, reverse=True
+        )
+
+    def edges(self) -> dict:
+        """
+        The dependency edges calculations triggered.
+
+        Returns:
+            A ``{(caller, callee): count}`` dict of variable names.
+        """
+        edges = defaultdict(int)
+        for profile in self.profiles.values():
+            for (callee, _), count in profile.triggered.items():
+                edges[(profile.variable, callee)] += count
+        return dict(edges)
+
+    def table(self, limit: int | None = None) -> str:
+        """
+        The summary as a fixed-width text table.
+
+        Args:
+            limit: Show only this many of the slowest variables.
+        """
+        rows = self.summary()[:limit]
+        width = max([len("variable"), *(len(row.variable) for row in rows)])
+        lines = [
+            f"{'variable':<{width}}  {'period':<10}  {'calls':>6}  "
+            f"{'cumulative s':>12}  {'self s':>9}  {'MB':>9}"
+        ]
+        for row in rows:
+            lines.append(
+                f"{row.variable:<{width}}  {row.period:<10}  {row.calls:>6}  "
+                f"{row.cumulative_s:>12.4f}  {row.self_s:>9.4f}  "
+                f"{row.bytes / 1e6:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def write_collapsed_stacks(self, path) -> None:
+        """
+        Write self times, in microseconds, as collapsed stacks for
+        flamegraph tools.
+        """
+        with open(path, "w") as f:
+            for stack, seconds in self.stacks.items():
+                f.write(f"{stack} {max(round(seconds * 1e6), 0)}\n")
+
+    def write_chrome_trace(self, path) -> None:
+        """Write every calculation as a Chrome trace event."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+
+def _label(key) -> str:
+    variable, period, branch_name = key
+    label = f"{variable}@{period}"
+    return label if branch_name == "default" else f"{label}[{branch_name}]"
@@ -0,0 +1,275 @@
+"""
+A content-addressed cache of household calculation results.
+
+Many queries repeat: the same points on an income grid, the same default
+household in NSW. A :class:`ResultCache` keys each situation's results by a
+hash of the situation itself (as canonical JSON), the period, the variables
+asked for and a fingerprint of the tax-benefit system, so a repeated query
+is answered without building a simulation:
+
+    cache = ResultCache(max_bytes=64 * 2**20, directory="~/.cache/pe-au")
+    system.calculate_many(situations, ["income_tax"], 2025, cache=cache)
+
+Results are held in memory up to ``max_bytes``, evicting the least recently
+used first, and, with a ``directory``, written through to disk, where they
+outlive the process. Both tiers store results as JSON, so reading a
+directory shared with others cannot run code the way unpickling could.
+
+:func:`system_fingerprint` hashes the parameter and variable sources (see
+:func:`policyengine_au.snapshot.source_hash`), every value of the system's
+parameter tree and its reform classes. Editing a parameter YAML changes the
+fingerprint, so earlier results are simply never looked up again, and so
+does updating a parameter at runtime or deriving a reform.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from policyengine_core import periods
+
+from policyengine_au.snapshot import source_hash
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+# Key of a parameter tree's fingerprint in its root's at-instant cache,
+# which core clears whenever a parameter in the tree is updated.
+_FINGERPRINT = ("fingerprint",)
+
+
+@lru_cache
+def _source_hash(directories) -> str:
+    return source_hash(directories)
+
+
+def system_fingerprint(system) -> str:
+    """
+    A hash identifying everything a system's results depend on.
+
+    Args:
+        system: A tax-benefit system, reformed or not.
+
+    Returns:
+        A hex digest, cached on the system's parameter tree until one of its
+        parameters is updated.
+    """
+    cache = system.parameters._at_instant_cache
+    fingerprint = cache.get(_FINGERPRINT)
+    if fingerprint is None:
+        digest = hashlib.sha256(
+            _source_hash(
+                (str(system.parameters_dir), str(system.variables_dir))
+            ).encode()
+        )
+        for parameter in system.parameters.get_descendants():
+            values = getattr(parameter, "values_list", None)
+            if values is None:
+                continue
+            digest.update(parameter.name.encode())
+            for value in values:
+                digest.update(f"{value.instant_str}={value.value!r};".encode())
+        reformed = system
+        while reformed is not None:
+            digest.update(type(reformed).__qualname__.encode())
+            reformed = getattr(reformed, "baseline", None)
+        fingerprint = cache[_FINGERPRINT] = digest.hexdigest()
+    return fingerprint
+
+
+class ResultCache:
+    """
+    Calculation results by the hash of their situation and system.
+
+    Thread-safe; the memory tier is an LRU of JSON-encoded results, so
+    cached results are copies, never shared with the caller. Results must be
+    JSON-serialisable, as those of ``calculate_many`` are.
+
+    Args:
+        max_bytes: Most bytes of encoded results to hold in memory.
+        directory: A directory to also store results in, or ``None`` to keep
+            them in memory only.
+        max_disk_bytes: Most bytes to store in ``directory``; the results
+            used least recently are deleted first. ``None`` for no limit.
+
+    Example:
+        >>> cache = ResultCache(directory="results-cache")
+        >>> key = cache.key(system, situation, 2025, ["income_tax"])
+        >>> cache.get(key) or cache.put(key, calculate(situation))
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory=None,
+        max_disk_bytes: int | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else Path(directory).expanduser()
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(
+                path.stat().st_size for path in self.directory.glob("*/*.json")
+            )
+
+    @staticmethod
+    def key(system, situation: dict, period, variables) -> str:
+        """
+        The cache key of a situation's results.
+
+        Situations that differ only in whether keys, such as periods, are
+        given as numbers or strings share a key.
+
+        Args:
+            system: The tax-benefit system calculating them.
+            situation: The situation dict.
+            period: The period calculated.
+            variables: The variable names calculated; order and repeats do
+                not matter.
+
+        Returns:
+            A hex digest.
+        """
+        content = json.dumps(
+            [
+                _with_str_keys(situation),
+                str(periods.period(str(period))),
+                sorted(set(variables)),
+                system_fingerprint(system),
+            ],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str):
+        """
+        The results stored under a key, or ``None``.
+
+        A result found on disk is brought back into memory.
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(data)
+        data = self._read(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, data)
+        return json.loads(data)
+
+    def put(self, key: str, results):
+        """
+        Store results under a key.
+
+        Returns:
+            The results, unchanged.
+        """
+        data = json.dumps(results, separators=(",", ":")).encode()
+        with self._lock:
+            self._remember(key, data)
+        self._write(key, data)
+        return results
+
+    def clear(self) -> None:
+        """Forget every result in memory; results on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key, data) -> None:
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _path(self, key) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # The modification time orders results for eviction.
+        path.touch()
+        return data
+
+    def _write(self, key, data) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        if path.exists():
+            path.touch()
+            return
+        path.parent.mkdir(exist_ok=True)
+        temporary_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temporary_path.write_bytes(data)
+        temporary_path.replace(path)
+        with self._lock:
+            self._disk_bytes += len(data)
+            over = (
+                self.max_disk_bytes is not None
+                and self._disk_bytes > self.max_disk_bytes
+            )
+        if over:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete the results on disk used least recently, down to the cap."""
+        files = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+
+def _with_str_keys(value):
+    """``value`` with every dict key a string, as JSON writes them."""
+    if isinstance(value, dict):
+        return {str(key): _with_str_keys(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_with_str_keys(item) for item in value]
+    return value
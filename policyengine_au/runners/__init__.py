@@ -0,0 +1,8 @@
+"""Runners for population-scale simulations."""
+
+from policyengine_au.runners.chunked import (
+    ArrayCollector,
+    ChunkedMicrosimulation,
+    WeightedTotals,
+)
+from policyengine_au.runners.parallel import ParallelMicrosimulation
@@ -0,0 +1,181 @@
+"""
+Chunked microsimulation with bounded memory.
+
+A full-population run holds every intermediate array for every person at
+once. :class:`ChunkedMicrosimulation` instead simulates a dataset a chunk of
+whole households at a time, passes each chunk's results to a sink and drops
+the chunk before starting the next, so peak memory is set by the chunk size.
+Because every household is simulated with all its members, and with every
+other household sharing an employer with it, household- and employer-level
+variables such as ``household_payroll_tax`` and ``state_payroll_tax`` are
+the same as in a single run.
+"""
+
+import itertools
+import math
+
+import numpy as np
+from microdf import MicroSeries
+
+from policyengine_au.system import Microsimulation, get_system
+
+
+def simulate_chunk(tax_benefit_system, chunk, variables, period):
+    """
+    Simulate one slice of a dataset.
+
+    Returns:
+        dict: ``(values, weights)`` per variable.
+    """
+    simulation = Microsimulation(tax_benefit_system=tax_benefit_system, dataset=chunk)
+    results = {}
+    for variable in variables:
+        values = simulation.calculate(variable, period, use_weights=False)
+        weights = simulation.get_weights(variable, period)
+        results[variable] = np.asarray(values), np.asarray(weights)
+    # Drop the chunk's arrays before simulating the next one.
+    tax_benefit_system.simulation = None
+    return results
+
+
+class WeightedTotals:
+    """
+    Sink accumulating the weighted total of each variable.
+
+    Each total is the correctly rounded sum of every weighted value, however
+    the dataset is chunked, and equal to the in-memory
+    :meth:`~policyengine_au.system.Microsimulation.totals`. A chunk adds the
+    parts of its exact sum (:func:`exact_sum`), and the parts are summed
+    exactly again. ``MicroSeries.sum()`` adds in floating-point order
+    instead, so it can differ in the last few bits.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self._parts = {}
+
+    def __call__(self, variable, values, weights, rows):
+        products = np.multiply(values, weights, dtype=np.float64)
+        parts = self._parts.setdefault(variable, [])
+        parts += exact_sum(products)
+        self.totals[variable] = math.fsum(parts)
+
+
+def exact_sum(values) -> list:
+    """
+    The exact sum of an array, as its correctly rounded value and the
+    rounding error of that value.
+
+    ``math.fsum`` reads the array's elements in place, so a chunk is not
+    copied into a list of Python floats.
+    """
+    total = math.fsum(values)
+    return [total, math.fsum(itertools.chain(values, (-total,)))]
+
+
+class ArrayCollector:
+    """
+    Sink placing each chunk's values at their rows in full-size arrays.
+
+    The collected values are in dataset order, identical to those of a
+    single in-memory run, so distributional statistics match exactly.
+
+    Args:
+        counts: Number of rows of each entity in the dataset.
+    """
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.values = {}
+        self.weights = {}
+
+    def __call__(self, variable, values, weights, rows):
+        if variable not in self.values:
+            self.values[variable] = np.empty(
+                self.counts[variable], dtype=np.asarray(values).dtype
+            )
+            self.weights[variable] = np.empty(self.counts[variable])
+        self.values[variable][rows] = values
+        self.weights[variable][rows] = weights
+
+    def results(self):
+        """Collected values as weighted ``MicroSeries``, by variable."""
+        return {
+            variable: MicroSeries(values, weights=self.weights[variable])
+            for variable, values in self.values.items()
+        }
+
+
+class ChunkedMicrosimulation:
+    """
+    Run a microsimulation over a dataset in chunks of whole households.
+
+    Args:
+        dataset: A :class:`~policyengine_au.data.ColumnarDataset`.
+        chunk_size: Number of households simulated at a time.
+        reform: Optional reform, applied once and shared by every chunk.
+
+    Example:
+        >>> sim = ChunkedMicrosimulation(dataset, chunk_size=100_000)
+        >>> sim.totals(["income_tax", "household_payroll_tax"], 2024)
+    """
+
+    def __init__(self, dataset, chunk_size=100_000, reform=None):
+        self.dataset = dataset
+        self.chunk_size = chunk_size
+        self.reform = reform
+        if reform is None:
+            self.tax_benefit_system = get_system()
+        else:
+            self.tax_benefit_system = get_system().derive(reform)
+
+    def run(self, variables, period=None, sink=None):
+        """
+        Calculate ``variables`` chunk by chunk, streaming results to ``sink``.
+
+        Args:
+            variables: Names of the variables to calculate.
+            period: Period to calculate for. Defaults to the dataset's.
+            sink: Callable taking ``(variable, values, weights, rows)`` for
+                every chunk, where ``rows`` locates the values among the
+                dataset's rows of the variable's entity.
+        """
+        period = period or self.dataset.time_period
+        for chunk in self.dataset.household_chunks(self.chunk_size):
+            results = simulate_chunk(self.tax_benefit_system, chunk, variables, period)
+            self._send_to_sink(sink, results, chunk)
+
+    def _send_to_sink(self, sink, results, chunk):
+        for variable, (values, weights) in results.items():
+            entity = self.tax_benefit_system.get_variable(variable).entity.key
+            sink(variable, values, weights, chunk.rows[entity])
+
+    def calculate(self, variables, period=None):
+        """
+        Calculate ``variables`` for the whole dataset.
+
+        Returns:
+            dict: A weighted ``MicroSeries`` per variable, in dataset order.
+        """
+        counts = {
+            variable: len(
+                self.dataset.structure_array(
+                    f"{self.tax_benefit_system.get_variable(variable).entity.key}_id"
+                )
+            )
+            for variable in variables
+        }
+        collector = ArrayCollector(counts)
+        self.run(variables, period, collector)
+        return collector.results()
+
+    def totals(self, variables, period=None):
+        """
+        Weighted totals of ``variables``, holding only one chunk at a time.
+
+        Returns:
+            dict: Weighted total per variable.
+        """
+        totals = WeightedTotals()
+        self.run(variables, period, totals)
+        return totals.totals
@@ -0,0 +1,407 @@
+"""
+Local household-calculator HTTP service.
+
+Answering a single-household query costs a few milliseconds of simulation
+set-up, much the same as a query for a hundred households. The service keeps
+the baseline system, and any reforms, loaded, and a :class:`HouseholdCalculator`
+gathers the requests that arrive within a short window into one simulation
+(see :mod:`policyengine_au.batching`), then splits the results back out.
+
+Run it with::
+
+    python -m policyengine_au.service --port 8080 --reform cut=cut.json
+
+and ``POST /calculate`` a JSON body::
+
+    {"situation": {...}, "variables": ["income_tax"], "period": "2025",
+     "reform": "cut"}
+
+The response is ``{"results": {variable: {entity_id: value}}}``, or
+``{"error": message}`` with status 400 for an invalid request, or 504 if
+the results take longer than ``--timeout`` seconds. ``GET /health`` lists
+the reforms.
+
+With ``--cache-mb`` (and optionally ``--cache-dir``), repeated queries are
+answered from a :class:`~policyengine_au.result_cache.ResultCache` without
+being queued at all.
+"""
+
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from policyengine_core.errors import SituationParsingError
+
+from policyengine_au.batching import MergedSituations, calculated_inputs
+from policyengine_au.result_cache import ResultCache
+
+# Variables returned when a request names none.
+DEFAULT_VARIABLES = ("household_net_income", "household_tax", "household_benefits")
+
+# How long to wait for more requests after the first of a batch, in seconds.
+DEFAULT_WINDOW = 0.001
+
+DEFAULT_MAX_BATCH = 256
+
+# How long to wait for a request's results, in seconds.
+DEFAULT_TIMEOUT = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class CalculatorClosedError(RuntimeError):
+    """Raised when a request is made of a closed calculator."""
+
+
+class CalculationRequest:
+    """One situation to calculate, and the future of its results."""
+
+    def __init__(self, situation, variables, period, reform, key=None):
+        self.situation = situation
+        self.variables = variables
+        self.period = period
+        self.reform = reform
+        self.key = key
+        self.future = Future()
+
+
+class HouseholdCalculator:
+    """
+    Calculates situations in micro-batches on warm tax-benefit systems.
+
+    A single worker thread takes requests from a queue. After the first
+    request of a batch it waits up to ``window`` seconds for more (or until
+    ``max_batch`` have arrived), then runs the requests that can share a
+    simulation (same reform, period and calculated inputs) together. If a
+    merged run fails, its requests are run one by one, so each error goes to
+    the request that caused it. Once :meth:`close` is called, new requests
+    are refused.
+
+    Args:
+        system: The baseline system. Defaults to the package's shared one.
+        reforms: A ``{name: reform}`` dict of reforms to keep loaded; each
+            reform is anything
+            :meth:`~policyengine_au.system.AustralianTaxBenefitSystem.derive`
+            accepts.
+        window: Seconds to wait for more requests after the first.
+        max_batch: Most requests in one batch.
+        cache: A :class:`~policyengine_au.result_cache.ResultCache` to answer
+            repeated requests from.
+        timeout: Seconds :meth:`calculate` waits for a request's results.
+
+    Example:
+        >>> calculator = HouseholdCalculator(reforms={"cut": cut})
+        >>> calculator.calculate(situation, ["income_tax"], "2025", "cut")
+    """
+
+    def __init__(
+        self,
+        system=None,
+        reforms=None,
+        window: float = DEFAULT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        cache: ResultCache | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        if system is None:
+            from policyengine_au.system import get_system
+
+            system = get_system()
+        self.systems = {None: system}
+        for name, reform in (reforms or {}).items():
+            self.systems[name] = system.derive(reform)
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = cache
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        # Held while queueing, so no request follows the worker's stop.
+        self._lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(
+        self, situation: dict, variables=None, period="2025", reform=None
+    ) -> Future:
+        """
+        Queue a situation for calculation.
+
+        Args:
+            situation: A situation dict.
+            variables: Variable names. Defaults to household net income,
+                taxes and benefits.
+            period: The period to calculate, also used for inputs given
+                without one.
+            reform: The name of a loaded reform, or ``None`` for the
+                baseline.
+
+        Returns:
+            A future of the ``{variable: {entity_id: value}}`` results.
+
+        Raises:
+            ValueError: If the reform or a variable is unknown.
+            CalculatorClosedError: If the calculator is closed.
+        """
+        if self._closed:
+            raise CalculatorClosedError("The calculator is closed.")
+        if reform not in self.systems:
+            raise ValueError(f"Unknown reform {reform!r}.")
+        variables = list(variables or DEFAULT_VARIABLES)
+        unknown = [
+            name for name in variables if name not in self.systems[reform].variables
+        ]
+        if unknown:
+            raise ValueError(f"Unknown variables: {', '.join(unknown)}.")
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(self.systems[reform], situation, period, variables)
+            results = self.cache.get(key)
+            if results is not None:
+                future = Future()
+                future.set_result({name: results[name] for name in variables})
+                return future
+        request = CalculationRequest(situation, variables, str(period), reform, key)
+        with self._lock:
+            if self._closed:
+                raise CalculatorClosedError("The calculator is closed.")
+            self._queue.put(request)
+        return request.future
+
+    def calculate(self, situation: dict, variables=None, period="2025", reform=None):
+        """
+        Calculate a situation, waiting for the results (see :meth:`submit`).
+
+        Raises:
+            concurrent.futures.TimeoutError: If the results take longer than
+                the calculator's ``timeout``.
+        """
+        future = self.submit(situation, variables, period, reform)
+        return future.result(timeout=self.timeout)
+
+    def close(self) -> None:
+        """Refuse new requests, finish the queued ones and stop the worker."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            stop = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    request = self._queue.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch) -> None:
+        groups = {}
+        for request in batch:
+            try:
+                key = (
+                    request.reform,
+                    request.period,
+                    calculated_inputs(
+                        request.situation, self.systems[request.reform], request.period
+                    ),
+                )
+            except Exception as error:
+                request.future.set_exception(error)
+                continue
+            groups.setdefault(key, []).append(request)
+        for (reform, period, _), requests in groups.items():
+            if len(requests) > 1:
+                try:
+                    self._calculate(requests, reform, period)
+                    continue
+                except Exception:
+                    # Run them one by one below, to find the failing request.
+                    logger.info(
+                        "A merged run of %d requests failed; running them one by one.",
+                        len(requests),
+                        exc_info=True,
+                    )
+            for request in requests:
+                if request.future.done():
+                    continue
+                try:
+                    self._calculate([request], reform, period)
+                except Exception as error:
+                    request.future.set_exception(error)
+
+    def _calculate(self, requests, reform, period) -> None:
+        merged = MergedSituations(
+            [request.situation for request in requests], self.systems[reform], period
+        )
+        variables = list(
+            dict.fromkeys(name for request in requests for name in request.variables)
+        )
+        results = merged.calculate(variables)
+        for request, result in zip(requests, results):
+            if request.future.done():
+                continue
+            result = {name: result[name] for name in request.variables}
+            request.future.set_result(result)
+            if self.cache is not None:
+                try:
+                    self.cache.put(request.key, result)
+                except Exception:
+                    logger.warning("Could not cache a result.", exc_info=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # The headers and body are written separately; without this, Nagle's
+    # algorithm holds the body back until the client acknowledges them.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._respond(404, {"error": f"No such path: {self.path}"})
+            return
+        reforms = [name for name in self.server.calculator.systems if name is not None]
+        self._respond(200, {"status": "ok", "reforms": reforms})
+
+    def do_POST(self):
+        if self.path != "/calculate":
+            self._respond(404, {"error": f"No such path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+            future = self.server.calculator.submit(
+                body["situation"],
+                body.get("variables"),
+                body.get("period", "2025"),
+                body.get("reform"),
+            )
+            results = future.result(timeout=self.server.calculator.timeout)
+        except KeyError as error:
+            self._respond(400, {"error": f"Missing field: {error}"})
+        except (ValueError, SituationParsingError) as error:
+            self._respond(400, {"error": str(error)})
+        except FutureTimeoutError:
+            self._respond(504, {"error": "The calculation timed out."})
+        except CalculatorClosedError as error:
+            self._respond(503, {"error": str(error)})
+        except Exception as error:
+            self._respond(500, {"error": f"{type(error).__name__}: {error}"})
+        else:
+            self._respond(200, {"results": results})
+
+    def _respond(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # One line per request would dominate the service's own time.
+        pass
+
+
+class CalculatorServer(ThreadingHTTPServer):
+    """
+    An HTTP server answering household queries from a calculator.
+
+    Args:
+        address: The ``(host, port)`` to listen on; port 0 picks a free one.
+        calculator: The :class:`HouseholdCalculator` to answer from.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1_024
+
+    def __init__(self, address, calculator: HouseholdCalculator):
+        super().__init__(address, _Handler)
+        self.calculator = calculator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve household calculations.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--reform",
+        action="append",
+        default=[],
+        metavar="NAME=FILE",
+        help="A JSON parametric reform ({path: {period: value}}) to load.",
+    )
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=DEFAULT_WINDOW * 1_000,
+        help="Milliseconds to wait for more requests to batch.",
+    )
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Seconds to wait for a request's results.",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=0,
+        help="Megabytes of results to cache in memory; 0 disables the cache.",
+    )
+    parser.add_argument(
+        "--cache-dir", help="A directory to also cache results in, across runs."
+    )
+    args = parser.parse_args(argv)
+
+    reforms = {}
+    for item in args.reform:
+        name, path = item.split("=", 1)
+        with open(path) as f:
+            reforms[name] = json.load(f)
+    cache = None
+    if args.cache_mb or args.cache_dir:
+        cache = ResultCache(int(args.cache_mb * 2**20), args.cache_dir)
+    calculator = HouseholdCalculator(
+        reforms=reforms,
+        window=args.window / 1_000,
+        max_batch=args.max_batch,
+        cache=cache,
+        timeout=args.timeout,
+    )
+    server = CalculatorServer((args.host, args.port), calculator)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        calculator.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Serialized snapshots of the loaded tax-benefit system.
+
+Loading :class:`~policyengine_au.system.AustralianTaxBenefitSystem` parses
+every YAML file under ``parameters/`` and then homogenises, interpolates and
+uprates the tree. A snapshot stores the finished parameter tree, together
+with an index of the module under ``variables/`` that defines each
+variable, so later startups can unpickle it instead. Each snapshot records
+a hash of the parameter and variable sources and of the installed
+policyengine-core version, and is ignored as soon as either changes. It
+also records each source file's modification time and size: while none of
+them changes, a startup only lists the files, and hashes their contents
+only once one does.
+
+Variables themselves are not stored: core imports each variable file under
+a name unique to the system that loaded it, so their classes cannot be
+unpickled. A system loaded from a snapshot instead imports each variable's
+module from source the first time it is needed (see
+:mod:`policyengine_au.lazy_variables`).
+
+Build the snapshot after installing or editing the package with
+``make snapshot``, which calls :func:`build_snapshot`.
+"""
+
+from importlib.metadata import version
+from pathlib import Path
+import hashlib
+import os
+import pickle
+
+SNAPSHOT_FORMAT_VERSION = 3
+
+
+def source_hash(directories) -> str:
+    """
+    Hash the parameter and variable sources a system is loaded from.
+
+    Args:
+        directories: Directories whose ``.yaml`` and ``.py`` files are hashed,
+            by relative path and content.
+
+    Returns:
+        A hex digest, which also covers the policyengine-core version.
+    """
+    digest = hashlib.sha256(version("policyengine-core").encode())
+    for directory in directories:
+        directory = Path(directory)
+        for file_path in sorted(directory.rglob("*")):
+            if file_path.suffix not in (".yaml", ".py"):
+                continue
+            digest.update(str(file_path.relative_to(directory)).encode())
+            digest.update(file_path.read_bytes())
+    return digest.hexdigest()
+
+
+def source_stamps(directories) -> dict:
+    """
+    The modification time and size of each parameter and variable source.
+
+    Args:
+        directories: Directories whose ``.yaml`` and ``.py`` files are
+            stamped.
+
+    Returns:
+        A ``{path: (mtime_ns, size)}`` dict.
+    """
+    stamps = {}
+    for directory in directories:
+        for file_path in sorted(Path(directory).rglob("*")):
+            if file_path.suffix not in (".yaml", ".py"):
+                continue
+            stat = file_path.stat()
+            stamps[str(file_path)] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def save_snapshot(system, path=None) -> Path:
+    """
+    Save the parameter tree and variable index of a loaded system.
+
+    Args:
+        system: An unreformed system, freshly loaded from source.
+        path: Where to write the snapshot. Defaults to the system's
+            ``snapshot_path``.
+
+    Returns:
+        The path written.
+    """
+    path = Path(path or system.snapshot_path)
+    directories = [system.parameters_dir, system.variables_dir]
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "core_version": version("policyengine-core"),
+        "source_stamps": source_stamps(directories),
+        "source_hash": source_hash(directories),
+        "parameters": system.parameters,
+        "variables": {
+            name: variable.module_name for name, variable in system.variables.items()
+        },
+        "variable_module_metadata": system.variable_module_metadata,
+    }
+    _write(snapshot, path)
+    return path
+
+
+def _write(snapshot, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Processes refreshing the same snapshot each write their own file.
+    temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporary_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    temporary_path.replace(path)
+
+
+def load_snapshot(system_class, path=None):
+    """
+    Load a snapshot if it exists and matches the current sources.
+
+    Args:
+        system_class: The system class the snapshot was built for.
+        path: The snapshot file. Defaults to ``system_class.snapshot_path``.
+
+    Returns:
+        The snapshot dict, or None if there is no usable snapshot.
+    """
+    path = path or system_class.snapshot_path
+    if path is None or not Path(path).exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        return None
+    if snapshot.get("core_version") != version("policyengine-core"):
+        return None
+    directories = [system_class.parameters_dir, system_class.variables_dir]
+    stamps = source_stamps(directories)
+    if snapshot.get("source_stamps") == stamps:
+        return snapshot
+    # A file was touched, added or removed: compare the contents.
+    if snapshot.get("source_hash") != source_hash(directories):
+        return None
+    # The contents are unchanged, so later startups can trust the new stamps.
+    snapshot["source_stamps"] = stamps
+    try:
+        _write(snapshot, Path(path))
+    except OSError:
+        pass
+    return snapshot
+
+
+def build_snapshot(path=None) -> Path:
+    """
+    Load the system from source and save its snapshot.
+
+    Args:
+        path: Where to write the snapshot. Defaults to the system's
+            ``snapshot_path``.
+
+    Returns:
+        The path written.
+    """
+    from policyengine_au.system import AustralianTaxBenefitSystem
+
+    return save_snapshot(AustralianTaxBenefitSystem(use_snapshot=False), path)
@@ -5,9 +5,31 @@ This module defines the main tax-benefit system class that loads all
 parameters and variables for Australia's social and fiscal policies.
 """
 
+from policyengine_core.parameters import ParameterNode
+from policyengine_core.reforms import Reform
 from policyengine_core.taxbenefitsystems import TaxBenefitSystem
+from policyengine_core.simulations import Simulation as CoreSimulation
+from policyengine_core.simulations import (
+    Microsimulation as CoreMicrosimulation,
+)
+from policyengine_au.batching import calculate_many, with_own_employers
 from policyengine_au.entities import entities
+from policyengine_au.data import ColumnarDataset
+from policyengine_au.lazy_variables import (
+    LazyVariables,
+    loaded_variables_only,
+    variable_modules,
+)
+from policyengine_au.marginal_rates import DEFAULT_DELTA, marginal_tax_rates
+from policyengine_au.populations import IndexedGroupPopulation, IndexedPopulation
+from policyengine_au.profiling import ProfilingTracer
+from policyengine_au.snapshot import load_snapshot
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+import copy
+import inspect
+import itertools
 import os
 
 
@@ -26,6 +48,7 @@ class AustralianTaxBenefitSystem(TaxBenefitSystem):
     entities = entities
     parameters_dir = COUNTRY_DIR / "parameters"
     variables_dir = COUNTRY_DIR / "variables"
+    snapshot_path = COUNTRY_DIR / "system_snapshot.pkl"
     auto_carry_over_input_variables = True
     basic_inputs = [
         "age",
@@ -42,17 +65,360 @@ class AustralianTaxBenefitSystem(TaxBenefitSystem):
         "postcode",
     ]
 
-    def __init__(self, reform=None):
+    def __init__(self, reform=None, use_snapshot=True):
         """
         Initialize the Australian tax-benefit system.
 
+        Variables are imported the first time they are looked up (see
+        :mod:`policyengine_au.lazy_variables`), unless a reform is given.
+
         Args:
-            reform: Optional reform to apply to the baseline system
+            reform: Optional reform to apply to the baseline system. To
+                apply a reform to a system that is already loaded, use
+                :meth:`derive` instead.
+            use_snapshot: Whether to take the parameter tree and variable
+                index from an up-to-date snapshot (see
+                :mod:`policyengine_au.snapshot`) instead of parsing the YAML
+                files and scanning the variable sources, if one has been
+                built.
         """
-        super().__init__(entities)
-
-        # Apply reform if provided
         if reform is not None:
-            self.apply_reform(reform)
+            super().__init__(entities, reform=reform)
+            return
+        snapshot = load_snapshot(type(self)) if use_snapshot else None
+        if snapshot is None:
+            # Core parses the parameters, looking up only the variables they
+            # break down by, and indexes the variables (see
+            # ``add_variables_from_directory``).
+            self._index_variables = True
+            with loaded_variables_only():
+                super().__init__(entities)
+            return
+
+        # Skip core's parameter loading and processing, since the snapshot
+        # holds the finished tree, and import variables as they are used.
+        self.parameters_dir = None
+        self.variables_dir = None
+        try:
+            super().__init__(entities)
+        finally:
+            del self.parameters_dir
+            del self.variables_dir
+        self.parameters = snapshot["parameters"]
+        # An eager load of these same sources built the snapshot, and
+        # already checked every ``defined_for`` link.
+        self.variables = LazyVariables(self, snapshot["variables"], checked=True)
+        self.variable_module_metadata = dict(snapshot["variable_module_metadata"])
+
+    def add_variables_from_directory(self, directory: str) -> None:
+        """
+        Add the variables defined under ``directory``.
+
+        When core loads ``variables_dir`` for a system built without a
+        reform or snapshot, the variables are indexed by
+        :func:`~policyengine_au.lazy_variables.variable_modules` instead of
+        imported, and each module's metadata is recorded when it is.
+        """
+        if not getattr(self, "_index_variables", False):
+            super().add_variables_from_directory(directory)
+            return
+        self._index_variables = False
+        self.variables = LazyVariables(self, variable_modules(directory))
+
+    def instantiate_entities(self):
+        """
+        Create the populations of a new simulation.
+
+        Group populations cache an index of their members, which every
+        projection and aggregation reuses (see
+        :mod:`policyengine_au.populations`).
+        """
+        members = IndexedPopulation(self.person_entity)
+        populations = {self.person_entity.key: members}
+        for entity in self.group_entities:
+            populations[entity.key] = IndexedGroupPopulation(entity, members)
+        return populations
+
+    def calculate_many(self, situations, variables, period, cache=None) -> list:
+        """
+        Calculate variables for many situations in one vectorised run.
+
+        The people and groups of every situation are concatenated into one
+        simulation, with ids renumbered, and each situation's results are
+        sliced back out (see :mod:`policyengine_au.batching`). Situations
+        that set different formula variables as inputs are run in separate
+        simulations. With a ``cache``, situations already calculated are
+        not simulated again.
+
+        Args:
+            situations: Situation dicts, as for ``Simulation(situation=...)``.
+            variables: Variable names.
+            period: The period to calculate, also used for inputs given
+                without one.
+            cache: A :class:`~policyengine_au.result_cache.ResultCache`.
+
+        Returns:
+            For each situation, in order, a ``{variable: {entity_id: value}}``
+            dict.
+
+        Example:
+            >>> results = system.calculate_many(situations, ["income_tax"], 2025)
+            >>> results[0]["income_tax"]["you"]
+        """
+        return calculate_many(self, situations, variables, period, cache)
+
+    def derive(self, reform) -> "AustralianTaxBenefitSystem":
+        """
+        Build a reformed system from this already-loaded one.
+
+        Nothing is reloaded from disk. The derived system shares every
+        variable with this one, and a parametric reform (a dict or a
+        ``Reform.from_dict`` class) copies only the parameter nodes on the
+        paths it modifies. Other reform classes are applied as core
+        ``Reform`` instances over this system, which copies the parameter
+        tree but still shares the variables.
+
+        Args:
+            reform: A reform class, a ``{path: {period: value}}`` dict, or a
+                tuple of either, applied in order.
+
+        Returns:
+            The reformed system. This system is left unchanged.
+        """
+        if isinstance(reform, tuple):
+            derived = self
+            for subreform in reform:
+                derived = derived.derive(subreform)
+            return derived
+        if isinstance(reform, dict):
+            reform = Reform.from_dict(reform)
+        if reform.parameter_values is None:
+            return reform(self)
+
+        derived = copy.copy(self)
+        derived.variables = self.variables.copy()
+        derived._parameters_at_instant_cache = {}
+        derived.simulation = None
+        derived.entities = [copy.copy(entity) for entity in self.entities]
+        derived.person_entity = next(
+            entity for entity in derived.entities if entity.is_person
+        )
+        derived.group_entities = [
+            entity for entity in derived.entities if not entity.is_person
+        ]
+        for entity in derived.entities:
+            entity.set_tax_benefit_system(derived)
+        derived.parameters = _copy_parameter_paths(
+            self.parameters, reform.parameter_values
+        )
+        reform.apply(derived)
+        return derived
+
+
+def _copy_parameter_paths(parameters, paths):
+    """
+    Copy the nodes of a parameter tree along ``paths``, sharing the rest.
+
+    Every node from the root down to each path's leaf is replaced by a
+    shallow copy whose ``children`` point at the copies, and the leaf (or
+    the scale holding an indexed bracket) is cloned, so updating it leaves
+    the original tree untouched.
+    """
+    root = _copy_node(parameters)
+    for path in paths:
+        node = root
+        for name in path.split("."):
+            name = name.split("[")[0]
+            child = node.children[name]
+            if child.parent is not node:
+                child = (
+                    _copy_node(child)
+                    if isinstance(child, ParameterNode)
+                    else child.clone()
+                )
+                child.parent = node
+                node.children[name] = child
+                setattr(node, name, child)
+            if not isinstance(child, ParameterNode):
+                break
+            node = child
+    return root
+
+
+def _copy_node(node):
+    node_copy = copy.copy(node)
+    node_copy.children = node.children.copy()
+    node_copy._at_instant_cache = {}
+    node_copy.parent = None
+    return node_copy
+
+
+@lru_cache(maxsize=None)
+def get_system() -> AustralianTaxBenefitSystem:
+    """
+    The baseline system shared by every simulation without a reform.
+
+    It is loaded the first time it is needed, not when the package is
+    imported. The module attribute ``system`` resolves to it too.
+    """
+    return AustralianTaxBenefitSystem()
+
+
+def __getattr__(name):
+    if name == "system":
+        return get_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _SharedSystem:
+    """Class attribute resolving to :func:`get_system` when first read."""
+
+    def __get__(self, instance, owner=None):
+        return get_system()
+
+
+class Simulation(CoreSimulation):
+    """
+    A simulation of the Australian tax and benefit system.
+
+    Uses the shared baseline system unless a reform is given, so building a
+    simulation does not reload parameters and variables. A situation that
+    declares no employers gives each person their own.
+    """
+
+    default_tax_benefit_system = AustralianTaxBenefitSystem
+    default_tax_benefit_system_instance = _SharedSystem()
+    default_role = "member"
+    max_spiral_loops = 10
+
+    def __init__(self, *args, **kwargs):
+        arguments = inspect.signature(CoreSimulation.__init__).bind(
+            self, *args, **kwargs
+        )
+        situation = arguments.arguments.get("situation")
+        if situation is not None:
+            arguments.arguments["situation"] = with_own_employers(situation)
+        args, kwargs = arguments.args[1:], arguments.kwargs
+        if arguments.arguments.get("reform") is not None:
+            super().__init__(*args, **kwargs)
+            return
+        # Core lists the variables holding inputs, and the situation builder
+        # registers each variable's entity, by walking every variable. Only
+        # variables already imported can hold inputs, so walk just those,
+        # after importing the variables any axes vary.
+        situation = situation or {}
+        system = (
+            arguments.arguments.get("tax_benefit_system")
+            or self.default_tax_benefit_system_instance
+        )
+        for axis in itertools.chain.from_iterable(situation.get("axes") or []):
+            system.variables.get(axis["name"])
+        with loaded_variables_only():
+            super().__init__(*args, **kwargs)
+
+    def build_from_dataset(self) -> None:
+        if isinstance(self.dataset, ColumnarDataset):
+            self.dataset.load_into(self)
+        else:
+            super().build_from_dataset()
+
+    def marginal_tax_rates(
+        self,
+        period=None,
+        deltas=DEFAULT_DELTA,
+        variable: str = "employment_income",
+        target: str = "household_net_income",
+    ):
+        """
+        Each person's effective marginal tax rate, in one batched run.
+
+        Only the variables downstream of ``variable`` are recalculated, for
+        every delta and household member at once (see
+        :mod:`policyengine_au.marginal_rates`).
+
+        Args:
+            period: The period to measure. Defaults to the simulation's
+                default calculation period.
+            deltas: An income increase, or a sequence of increases.
+            variable: The person-level income variable to increase.
+            target: The income measure whose change is compared.
+
+        Returns:
+            One rate per person, or one row of rates per delta.
+        """
+        return marginal_tax_rates(
+            self,
+            period or self.default_calculation_period,
+            deltas=deltas,
+            variable=variable,
+            target=target,
+        )
+
+    @contextmanager
+    def profile(self):
+        """
+        Record the cost of each variable calculated inside the block.
+
+        The simulation and the branches it already has share one
+        :class:`~policyengine_au.profiling.ProfilingTracer` until the block
+        ends, when their own tracers are restored.
+
+        Yields:
+            The tracer, holding the per-variable summary, dependency edges
+            and the collapsed-stack and Chrome trace exports.
+
+        Example:
+            >>> with sim.profile() as profile:
+            ...     sim.calculate("state_payroll_tax", 2025)
+            >>> print(profile.table(limit=10))
+        """
+        simulations = [self]
+        for simulation in simulations:
+            simulations.extend(simulation.branches.values())
+        tracers = [simulation.tracer for simulation in simulations]
+        profiler = ProfilingTracer(self.tracer)
+        for simulation in simulations:
+            simulation.tracer = profiler
+        try:
+            yield profiler
+        finally:
+            for simulation, tracer in zip(simulations, tracers):
+                simulation.tracer = tracer
+
+
+class Microsimulation(CoreMicrosimulation, Simulation):
+    """
+    A weighted simulation over a survey dataset.
+
+    The dataset supplies one array per input variable plus the entity id,
+    membership (``person_<entity>_id``) and role (``person_<entity>_role``)
+    arrays, and a ``household_weight`` array, either as an HDF5 file or as a
+    memory-mapped :class:`~policyengine_au.data.ColumnarDataset`. Every
+    variable is calculated for the whole population at once, and
+    ``calculate`` returns a weighted ``MicroSeries`` so totals and means are
+    simply ``.sum()`` and ``.mean()``.
+
+    Example:
+        >>> sim = Microsimulation(dataset="au_survey_2024.h5")
+        >>> sim.calculate("income_tax", 2024).sum()
+    """
+
+    def totals(self, variables, period=None) -> dict:
+        """
+        Exact weighted totals of ``variables``.
+
+        These are summed as :class:`~policyengine_au.runners.WeightedTotals`
+        sums them, so they equal the totals of a chunked or parallel run
+        over the same dataset.
+
+        Returns:
+            dict: Weighted total per variable.
+        """
+        # Imported here, since the runners import this module.
+        from policyengine_au.runners.chunked import WeightedTotals
 
-    # Entity properties are handled by parent class
+        totals = WeightedTotals()
+        for variable in variables:
+            values = self.calculate(variable, period, use_weights=False)
+            totals(variable, values, self.get_weights(variable, period), None)
+        return totals.totals
@@ -2,19 +2,67 @@
 Pytest configuration for PolicyEngine Australia tests.
 
 This file configures pytest to discover and run YAML-based policy tests.
+
+Every YAML case shares one tax-benefit system per session. The cases
+selected for a run that share a period, and set the same formula variables
+as inputs, are merged into one simulation (see
+:mod:`policyengine_au.batching`) and each is checked against its own rows.
+A case that cannot be merged, or whose merged run fails, is run merged on
+its own and then alone, so errors are reported against the case that caused
+them: a case that passes alone but fails merged on its own fails, since the
+merging is at fault. The cases that fell back because another case broke
+their batch are listed at the end of the session. Pass ``--yaml-isolated``
+to run every case in its own simulation.
 """
 
+import numpy as np
 import pytest
 import yaml
-from pathlib import Path
-from policyengine_au import AustralianTaxBenefitSystem
-from policyengine_core.simulations import Simulation
+from policyengine_au import AustralianTaxBenefitSystem, Simulation
+from policyengine_au.batching import MergedSituations, calculated_inputs
+
+_system = None
+
+# The merged cases of a session, by batch key.
+_BATCHES = pytest.StashKey[dict]()
+
+# The error that stopped each batch key's cases from being merged.
+_BATCH_ERRORS = pytest.StashKey[dict]()
+
+# The cases that ran on their own after their batch failed, with the error.
+_FALLBACKS = pytest.StashKey[list]()
+
+
+def tax_benefit_system():
+    """The tax-benefit system shared by every YAML case in the session."""
+    global _system
+    if _system is None:
+        _system = AustralianTaxBenefitSystem()
+    return _system
 
 
-def pytest_collect_file(parent, path):
+def pytest_addoption(parser):
+    parser.addoption(
+        "--yaml-isolated",
+        action="store_true",
+        help="Run each YAML test case in its own simulation.",
+    )
+
+
+def pytest_terminal_summary(terminalreporter):
+    """List the YAML cases that ran on their own after their batch failed."""
+    fallbacks = terminalreporter.config.stash.get(_FALLBACKS, [])
+    if not fallbacks:
+        return
+    terminalreporter.section("YAML cases run outside their batch")
+    for nodeid, error in fallbacks:
+        terminalreporter.line(f"{nodeid}: {type(error).__name__}: {error}")
+
+
+def pytest_collect_file(parent, file_path):
     """Custom collector for YAML test files."""
-    if path.ext == ".yaml" and path.basename.startswith("test_"):
-        return YamlFile.from_parent(parent, fspath=path)
+    if file_path.suffix == ".yaml" and file_path.name.startswith("test_"):
+        return YamlFile.from_parent(parent, path=file_path)
 
 
 class YamlFile(pytest.File):
@@ -22,7 +70,7 @@ class YamlFile(pytest.File):
 
     def collect(self):
         """Collect test items from YAML file."""
-        with open(self.fspath) as f:
+        with open(self.path) as f:
             test_cases = yaml.safe_load(f)
 
         for i, test_case in enumerate(test_cases):
@@ -30,6 +78,79 @@ class YamlFile(pytest.File):
             yield YamlTestItem.from_parent(self, name=name, spec=test_case)
 
 
+class IsolatedCase:
+    """A YAML case alone in a simulation of its own."""
+
+    def __init__(self, situation: dict, period: str):
+        self.simulation = Simulation(
+            tax_benefit_system=tax_benefit_system(),
+            situation=situation,
+            default_input_period=period,
+        )
+        self.period = period
+
+    def values(self, variable_name: str) -> dict:
+        """The case's values of a variable, by entity id."""
+        variable = self.simulation.tax_benefit_system.get_variable(variable_name)
+        ids = self.simulation.populations[variable.entity.key].ids
+        values = self.simulation.calculate(variable_name, self.period)
+        if hasattr(values, "decode_to_str"):
+            values = values.decode_to_str()
+        return dict(zip(map(str, ids), np.asarray(values).tolist()))
+
+
+class BatchedCase:
+    """A YAML case in a simulation shared with other cases."""
+
+    def __init__(self, batch: MergedSituations, results: dict, index: int):
+        self.batch = batch
+        self.results = results
+        self.index = index
+
+    def values(self, variable_name: str) -> dict:
+        """The case's values of a variable, by entity id."""
+        if variable_name not in self.results:
+            self.results[variable_name] = [
+                result[variable_name]
+                for result in self.batch.calculate([variable_name])
+            ]
+        return self.results[variable_name][self.index]
+
+
+def build_batch(items) -> dict:
+    """
+    Merge YAML cases with the same period and calculated inputs into one
+    simulation.
+
+    Returns:
+        A ``{item: BatchedCase}`` dict.
+
+    Raises:
+        Exception: Whatever stopped the cases being merged.
+    """
+    batch = MergedSituations(
+        [item.spec.get("input", {}) for item in items],
+        tax_benefit_system(),
+        items[0].period,
+    )
+    # Each variable's results for every case, shared by the cases.
+    results = {}
+    return {
+        item: BatchedCase(batch, results, index) for index, item in enumerate(items)
+    }
+
+
+def check_value(name: str, calculated, expected) -> None:
+    """Assert a calculated value matches its expected value."""
+    # Allow small tolerance for floating point comparisons
+    if isinstance(expected, (int, float)) and not isinstance(expected, bool):
+        assert abs(calculated - expected) < 0.01, (
+            f"{name}: expected {expected}, got {calculated}"
+        )
+    else:
+        assert calculated == expected, f"{name}: expected {expected}, got {calculated}"
+
+
 class YamlTestItem(pytest.Item):
     """Custom test item for YAML test cases."""
 
@@ -37,42 +158,96 @@ class YamlTestItem(pytest.Item):
         super().__init__(name, parent)
         self.spec = spec
 
+    @property
+    def period(self) -> str:
+        return str(self.spec.get("period", "2024"))
+
+    @property
+    def batch_key(self) -> tuple:
+        """Cases with the same key can share a simulation."""
+        key = getattr(self, "_batch_key", None)
+        if key is None:
+            situation = self.spec.get("input", {})
+            key = self._batch_key = (
+                self.period,
+                calculated_inputs(situation, tax_benefit_system(), self.period),
+            )
+        return key
+
+    def batched_case(self):
+        """
+        This case in its merged simulation.
+
+        Raises:
+            Exception: Whatever stopped the cases being merged.
+        """
+        batches = self.session.stash.setdefault(_BATCHES, {})
+        errors = self.session.stash.setdefault(_BATCH_ERRORS, {})
+        if self.batch_key not in batches and self.batch_key not in errors:
+            items = [
+                item
+                for item in self.session.items
+                if isinstance(item, YamlTestItem) and item.batch_key == self.batch_key
+            ]
+            try:
+                batches[self.batch_key] = build_batch(items)
+            except Exception as error:
+                errors[self.batch_key] = error
+        if self.batch_key in errors:
+            raise errors[self.batch_key]
+        return batches[self.batch_key][self]
+
     def runtest(self):
         """Run the YAML test case."""
-        system = AustralianTaxBenefitSystem()
-
-        # Build situation from input
-        situation = self.spec.get("input", {})
-        period = str(self.spec.get("period", "2024"))
-
-        # Create simulation
-        simulation = Simulation(tax_benefit_system=system, situation=situation)
-
-        # Check outputs
-        expected_outputs = self.spec.get("output", {})
-        for variable_name, expected_value in expected_outputs.items():
-            if isinstance(expected_value, dict):
-                # Handle per-entity outputs
-                for entity_name, entity_expected in expected_value.items():
-                    calculated = simulation.calculate(variable_name, period)
-                    # Would need entity index mapping here
-                    pass
+        if self.config.getoption("yaml_isolated"):
+            self.check_outputs(self.isolated_case())
+            return
+        try:
+            self.check_outputs(self.batched_case())
+            return
+        except AssertionError:
+            raise
+        except Exception as error:
+            batch_error = error
+        # Merge this case on its own: if that fails too, either the case or
+        # the merging is at fault, and running it alone tells which.
+        try:
+            self.check_outputs(build_batch([self])[self])
+        except AssertionError:
+            raise
+        except Exception as error:
+            self.check_outputs(self.isolated_case())
+            raise AssertionError(
+                f"The case passes alone, but fails merged: {error!r}"
+            ) from error
+        # Another case of the batch broke it.
+        self.config.stash.setdefault(_FALLBACKS, []).append((self.nodeid, batch_error))
+
+    def isolated_case(self) -> IsolatedCase:
+        """This case alone in a simulation of its own."""
+        return IsolatedCase(self.spec.get("input", {}), self.period)
+
+    def check_outputs(self, case) -> None:
+        """Check the expected outputs against the case's entities."""
+        system = tax_benefit_system()
+        for key, expected in self.spec.get("output", {}).items():
+            if key not in system.variables and isinstance(expected, dict):
+                # Per-entity outputs: {entity_id: {variable: value}}
+                for variable_name, entity_expected in expected.items():
+                    calculated = case.values(variable_name)[str(key)]
+                    check_value(f"{variable_name} ({key})", calculated, entity_expected)
+                continue
+            calculated = list(case.values(key).values())
+            if isinstance(expected, list):
+                # One value per entity of the variable's type, in order.
+                assert len(calculated) == len(expected), (
+                    f"{key}: expected {len(expected)} values, got {len(calculated)}"
+                )
+                for i, (value, expected_value) in enumerate(zip(calculated, expected)):
+                    check_value(f"{key}[{i}]", value, expected_value)
             else:
-                # Simple case: single value
-                calculated = simulation.calculate(variable_name, period)
-                if hasattr(calculated, "__len__"):
-                    calculated = calculated[0]
-
-                # Allow small tolerance for floating point comparisons
-                if isinstance(expected_value, (int, float)):
-                    assert abs(calculated - expected_value) < 0.01, (
-                        f"{variable_name}: expected {expected_value}, got {calculated}"
-                    )
-                else:
-                    assert calculated == expected_value, (
-                        f"{variable_name}: expected {expected_value}, got {calculated}"
-                    )
+                check_value(key, calculated[0], expected)
 
     def reportinfo(self):
         """Report test location."""
-        return self.fspath, 0, f"[{self.name}]"
+        return self.path, 0, f"[{self.name}]"
@@ -0,0 +1,137 @@
+"""Test calculating many situations in one simulation."""
+
+import numpy as np
+import pytest
+from policyengine_core.errors import SituationParsingError
+
+from policyengine_au import Simulation
+from policyengine_au.system import system
+
+VARIABLES = ["income_tax", "age_pension", "ftb_part_a", "household_net_income"]
+
+SITUATIONS = [
+    # A single earner, with every group left to core's defaults.
+    {"people": {"you": {"age": 40, "employment_income": 85_000}}},
+    # A couple and their child, with every group given.
+    {
+        "people": {
+            "mum": {"age": 38, "employment_income": 70_000, "state": "VIC"},
+            "dad": {"age": 40, "employment_income": 30_000},
+            "kid": {"age": 4},
+        },
+        "tax_units": {
+            "tax_unit": {"primaries": ["mum"], "spouses": ["dad"]},
+        },
+        "benefit_units": {
+            "benefit_unit": {"adults": ["mum", "dad"], "children": ["kid"]}
+        },
+        "families": {"family": {"parents": ["mum", "dad"], "children": ["kid"]}},
+        "households": {"home": {"members": ["mum", "dad", "kid"]}},
+    },
+    # Pensioners sharing a house, each left in a tax unit of their own.
+    {
+        "people": {
+            "nan": {"age": 72, "financial_assets": {"2025": 100_000}},
+            "pop": {"age": 75, "employment_income": 10_000},
+        },
+        "benefit_units": {"couple": {"adults": ["nan", "pop"]}},
+        "households": {"home": {"members": ["nan", "pop"], "is_homeowner": False}},
+    },
+    # Several adults in one household, all primaries of one default tax unit.
+    {
+        "people": {
+            "a": {"age": 25, "employment_income": 40_000},
+            "b": {"age": 26, "employment_income": 55_000},
+        },
+        "households": {"flat": {"members": ["a", "b"]}},
+    },
+]
+
+
+def separately(situation, variables, period="2025"):
+    simulation = Simulation(situation=situation, default_input_period=period)
+    results = {}
+    for name in variables:
+        entity = system.get_variable(name).entity.key
+        ids = map(str, simulation.populations[entity].ids)
+        values = np.asarray(simulation.calculate(name, period)).tolist()
+        results[name] = dict(zip(ids, values))
+    return results
+
+
+def test_calculate_many_matches_separate_simulations():
+    results = system.calculate_many(SITUATIONS, VARIABLES, 2025)
+    assert len(results) == len(SITUATIONS)
+    for situation, result in zip(SITUATIONS, results):
+        expected = separately(situation, VARIABLES)
+        assert result.keys() == expected.keys()
+        for name in VARIABLES:
+            assert result[name].keys() == expected[name].keys()
+            for id, value in expected[name].items():
+                assert result[name][id] == pytest.approx(value, abs=0.01)
+
+
+def test_situations_setting_formula_inputs_run_apart():
+    # Setting a formula variable for one situation must not hide its formula
+    # from the others.
+    override = {"people": {"you": {"age": 70, "australian_residence_years": 3}}}
+    default = {"people": {"you": {"age": 70}}}
+    results = system.calculate_many([override, default], ["age_pension_eligible"], 2025)
+    assert results[0]["age_pension_eligible"] == {"you": False}
+    assert results[1]["age_pension_eligible"] == {"you": True}
+
+
+def test_enum_inputs_and_outputs():
+    situations = [
+        {"people": {"you": {"age": 40, "state": state}}} for state in ["NSW", "WA"]
+    ]
+    results = system.calculate_many(situations, ["state"], 2025)
+    assert [result["state"]["you"] for result in results] == ["NSW", "WA"]
+
+
+def test_invalid_situations_are_reported():
+    with pytest.raises(SituationParsingError):
+        system.calculate_many([{"people": {"you": {"no_such_input": 1}}}], [], 2025)
+    with pytest.raises(SituationParsingError):
+        system.calculate_many(
+            [
+                {
+                    "people": {"you": {}},
+                    "households": {"home": {"members": ["you", "ghost"]}},
+                }
+            ],
+            [],
+            2025,
+        )
+
+
+def test_inputs_for_other_periods_still_carry_over():
+    # A default filled in for 2025 would hide the 2024 income carried over.
+    earlier = {"people": {"you": {"age": 40, "employment_income": {2024: 50_000}}}}
+    later = {"people": {"you": {"age": 40, "employment_income": {2025: 80_000}}}}
+    variables = ["employment_income", "income_tax"]
+    results = system.calculate_many([earlier, later], variables, 2025)
+    for situation, result in zip([earlier, later], results):
+        expected = separately(situation, variables)
+        for name in variables:
+            assert result[name]["you"] == pytest.approx(expected[name]["you"])
+    assert results[0]["employment_income"] == {"you": 50_000}
+
+
+def test_people_without_employers_are_not_pooled():
+    # Two earners below the NSW threshold each have an employer of their
+    # own, so neither pays payroll tax on their combined wages.
+    situation = {
+        "people": {
+            name: {"employment_income": 1_000_000, "state": "NSW"}
+            for name in ["a", "b"]
+        },
+        "households": {"home": {"members": ["a", "b"]}},
+    }
+    variables = ["state_payroll_tax", "household_payroll_tax"]
+    expected = separately(situation, variables)
+    assert expected == {
+        "state_payroll_tax": {"a": 0, "b": 0},
+        "household_payroll_tax": {"home": 0},
+    }
+    assert system.calculate_many([situation], variables, 2025) == [expected]
@@ -0,0 +1,78 @@
+"""Test calibrating household weights to target totals."""
+
+import numpy as np
+import pytest
+
+from policyengine_au import Microsimulation
+from policyengine_au.calibration import TargetMatrix, calibrate
+from policyengine_au.data.synthetic import STATE_SHARES, synthetic_dataset
+
+AGE_BANDS = [(0, 15), (15, 65), (65, 120)]
+
+
+@pytest.fixture(scope="module")
+def simulation(tmp_path_factory):
+    path = tmp_path_factory.mktemp("calibration") / "synthetic"
+    return Microsimulation(dataset=synthetic_dataset(path, 5_000, seed=2))
+
+
+def weights(simulation):
+    return np.asarray(simulation.calculate("household_weight", 2025, use_weights=False))
+
+
+def build_matrix(simulation):
+    matrix = TargetMatrix(simulation, 2025)
+    for variable in ("income_tax", "nsw_payroll_tax", "household_benefits"):
+        matrix.add_variable(variable, 0)
+    matrix.add_variable("income_tax", 0, state="VIC")
+    matrix.add_indicators(
+        "households", "household_state", dict.fromkeys(STATE_SHARES, 0)
+    )
+    matrix.add_age_bands(dict.fromkeys(AGE_BANDS, 0))
+    matrix.add_age_bands(dict.fromkeys(AGE_BANDS, 0), state="QLD")
+    return matrix
+
+
+def test_estimates_match_weighted_totals(simulation):
+    matrix = build_matrix(simulation)
+    estimates = dict(zip(matrix.names, matrix.estimates(weights(simulation))))
+    for variable in ("income_tax", "nsw_payroll_tax", "household_benefits"):
+        assert estimates[variable] == pytest.approx(
+            simulation.calculate(variable, 2025).sum()
+        )
+    states = simulation.calculate("household_state", 2025)
+    assert estimates["households_NSW"] == pytest.approx((states == "NSW").sum())
+    ages = simulation.calculate("age", 2025)
+    assert estimates["people_aged_15_65"] == pytest.approx(
+        ((ages >= 15) & (ages < 65)).sum()
+    )
+    person_states = simulation.calculate("household_state", 2025, map_to="person")
+    assert estimates["people_aged_65_120_QLD"] == pytest.approx(
+        ((ages >= 65) & (person_states == "QLD")).sum()
+    )
+    assert estimates["income_tax_VIC"] < estimates["income_tax"]
+
+
+def test_calibration_meets_reachable_targets(simulation):
+    matrix = build_matrix(simulation)
+    start = weights(simulation)
+    reachable = start * np.random.default_rng(0).lognormal(0, 0.2, start.size)
+    matrix.totals = list(matrix.estimates(reachable))
+
+    result = calibrate(matrix, tolerance=1e-3)
+
+    assert (result.weights > 0).all()
+    assert all(abs(fit.relative_error) < 1e-3 for fit in result.fits)
+    assert result.losses[-1] < result.losses[0]
+    assert 0 < result.iterations < 500
+    assert result.runtime_s > 0
+    assert "households_NSW" in result.table()
+
+
+def test_no_iterations_keeps_the_weights(simulation):
+    matrix = TargetMatrix(simulation, 2025)
+    matrix.add("everyone", np.ones(matrix.households), 1e9)
+    result = calibrate(matrix, iterations=0)
+    np.testing.assert_array_equal(result.weights, weights(simulation))
+    assert result.fits[0].initial == result.fits[0].estimate
+    assert result.fits[0].relative_error < 0
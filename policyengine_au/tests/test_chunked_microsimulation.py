@@ -0,0 +1,198 @@
+"""Test chunked microsimulation against a single in-memory run."""
+
+import math
+
+import numpy as np
+import pytest
+from policyengine_core.reforms import Reform
+
+from policyengine_au import Microsimulation
+from policyengine_au.data import ColumnarDataset
+from policyengine_au.runners import ChunkedMicrosimulation, ParallelMicrosimulation
+
+VARIABLES = [
+    "income_tax",
+    "medicare_levy",
+    "state_payroll_tax",
+    "household_payroll_tax",
+]
+
+
+def save_dataset(path, households=25, seed=0, linked=False):
+    """
+    Save households of one to three people, with people out of order.
+
+    With ``linked``, the first and last households share an employer and the
+    next two households' employers form a payroll tax group, each paying
+    wages under the NSW threshold on its own.
+    """
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 4, households)
+    person_household = np.repeat(np.arange(households), sizes)
+    # Interleave people so households are not contiguous in the file.
+    person_household = person_household[rng.permutation(len(person_household))]
+    people = len(person_household)
+    structure = {
+        "person_id": np.arange(people),
+        "household_id": np.arange(households),
+        "person_household_id": person_household,
+        "person_household_role": np.array(["member"] * people),
+    }
+    # One tax unit, benefit unit, family and employer per household.
+    for entity, role in [
+        ("tax_unit", "primary"),
+        ("benefit_unit", "adult"),
+        ("family", "parent"),
+        ("employer", "employee"),
+    ]:
+        structure[f"{entity}_id"] = np.arange(households) + 100
+        structure[f"person_{entity}_id"] = person_household + 100
+        structure[f"person_{entity}_role"] = np.array([role] * people)
+    employment_income = rng.choice([0, 30_000, 90_000, 2_500_000], people)
+    variables = {}
+    if linked:
+        last = person_household == households - 1
+        structure["person_employer_id"][last] = 100
+        structure["employer_id"] = structure["employer_id"][:-1]
+        # One earner in each linked household, all of them in NSW.
+        for household in (0, 1, 2, households - 1):
+            members = np.flatnonzero(person_household == household)
+            employment_income[members] = 0
+            employment_income[members[0]] = 700_000
+        group = np.full(households - 1, -1)
+        group[[1, 2]] = 1
+        variables["employer_group_id"] = group
+    states = np.array(["NSW", "VIC", "QLD", "WA", "SA", "TAS", "ACT", "NT"])
+    household_state = states[rng.integers(0, 8, households)]
+    if linked:
+        household_state[[0, 1, 2, households - 1]] = "NSW"
+    return ColumnarDataset.save(
+        path,
+        structure=structure,
+        variables={
+            "employment_income": employment_income,
+            "state": household_state[person_household],
+            "household_weight": rng.uniform(100, 1_000, households),
+            **variables,
+        },
+        time_period="2024",
+    )
+
+
+def test_chunked_results_match_in_memory_run(tmp_path):
+    """Test that chunked values are identical and totals agree."""
+    dataset = save_dataset(tmp_path / "au_test")
+    in_memory = Microsimulation(dataset=dataset)
+    chunked = ChunkedMicrosimulation(dataset, chunk_size=4)
+
+    results = chunked.calculate(VARIABLES, "2024")
+    totals = chunked.totals(VARIABLES, "2024")
+    for variable in VARIABLES:
+        expected = in_memory.calculate(variable, "2024")
+        np.testing.assert_array_equal(np.array(results[variable]), np.array(expected))
+        np.testing.assert_array_equal(
+            results[variable].weights.values, expected.weights.values
+        )
+        np.testing.assert_allclose(totals[variable], expected.sum(), rtol=1e-9)
+        assert totals[variable] == math.fsum(
+            np.asarray(expected, dtype=float) * expected.weights.values
+        )
+    # Totals are exact sums, so neither chunking nor its size changes them.
+    assert totals == in_memory.totals(VARIABLES, "2024")
+    assert totals == ChunkedMicrosimulation(dataset, chunk_size=7).totals(
+        VARIABLES, "2024"
+    )
+    assert totals["state_payroll_tax"] > 0
+
+
+def test_household_chunks_cover_every_household_once(tmp_path):
+    """Test that chunks partition the people and households of a dataset."""
+    dataset = save_dataset(tmp_path / "au_test")
+    chunks = list(dataset.household_chunks(7))
+    assert [chunk.count() for chunk in chunks] == [7, 7, 7, 4]
+    people = np.concatenate(
+        [np.asarray(chunk.structure_array("person_id")) for chunk in chunks]
+    )
+    assert sorted(people) == list(range(len(dataset.structure_array("person_id"))))
+
+
+def test_parallel_results_match_serial_run(tmp_path):
+    """Test that sharding across processes gives the serial results."""
+    dataset = save_dataset(tmp_path / "au_test")
+    serial = ChunkedMicrosimulation(dataset, chunk_size=6).calculate(VARIABLES)
+    parallel = ParallelMicrosimulation(dataset, chunk_size=6, max_workers=2).calculate(
+        VARIABLES
+    )
+    for variable in VARIABLES:
+        np.testing.assert_array_equal(
+            np.array(parallel[variable]), np.array(serial[variable])
+        )
+
+
+def test_chunks_keep_employers_and_groups_whole(tmp_path):
+    """Test that employers spanning households are simulated whole."""
+    dataset = save_dataset(tmp_path / "au_test", linked=True)
+    chunks = list(dataset.household_chunks(1))
+    employers = np.concatenate(
+        [np.asarray(chunk.structure_array("employer_id")) for chunk in chunks]
+    )
+    assert sorted(employers) == list(dataset.structure_array("employer_id"))
+    assert sorted(chunk.count() for chunk in chunks)[-2:] == [2, 2]
+
+    expected = Microsimulation(dataset=dataset).calculate("state_payroll_tax", "2024")
+    assert (np.array(expected)[:3] > 0).all()
+    for runner in (
+        ChunkedMicrosimulation(dataset, chunk_size=1),
+        ParallelMicrosimulation(dataset, chunk_size=1, max_workers=2),
+    ):
+        np.testing.assert_array_equal(
+            np.array(runner.calculate(["state_payroll_tax"])["state_payroll_tax"]),
+            np.array(expected),
+        )
+    np.testing.assert_allclose(
+        ChunkedMicrosimulation(dataset, chunk_size=1).totals(
+            ["state_payroll_tax"], "2024"
+        )["state_payroll_tax"],
+        expected.sum(),
+        rtol=1e-9,
+    )
+
+
+def test_parallel_defaults_and_dict_reforms(tmp_path):
+    """Test the default shards and a reform built with Reform.from_dict."""
+    dataset = save_dataset(tmp_path / "au_test")
+    reform = Reform.from_dict(
+        {"gov.ato.income_tax.rates.rates.bracket_2": {"2024-01-01": 0.25}}
+    )
+    parallel = ParallelMicrosimulation(dataset, reform=reform, max_workers=3)
+    assert parallel.chunk_size == 9
+
+    results = parallel.calculate(["income_tax"])
+    expected = Microsimulation(dataset=dataset, reform=reform).calculate(
+        "income_tax", "2024"
+    )
+    np.testing.assert_array_equal(np.array(results["income_tax"]), np.array(expected))
+    baseline = Microsimulation(dataset=dataset).calculate("income_tax", "2024")
+    assert expected.sum() > baseline.sum()
+
+
+def test_one_employer_for_everyone_is_reported(tmp_path):
+    """Test that chunking warns when a shared group defeats it."""
+    dataset = save_dataset(tmp_path / "au_test", households=40)
+    structure = {
+        name: np.array(dataset.structure_array(name))
+        for name in dataset.structure_arrays
+    }
+    structure["employer_id"] = np.array([100])
+    structure["person_employer_id"][:] = 100
+    shared = ColumnarDataset.save(
+        tmp_path / "shared",
+        structure=structure,
+        variables={
+            "employment_income": np.asarray(dataset.column("employment_income"))
+        },
+        time_period="2024",
+    )
+    with pytest.warns(UserWarning, match="40 households are linked"):
+        chunks = list(shared.household_chunks(2))
+    assert [chunk.count() for chunk in chunks] == [40]
@@ -0,0 +1,104 @@
+"""Test the memory-mapped columnar dataset format."""
+
+import numpy as np
+import pytest
+
+from policyengine_au import Microsimulation
+from policyengine_au.data import ColumnarDataset
+
+
+def save_dataset(path):
+    """Save two households: a couple in VIC and a single person in WA."""
+    return ColumnarDataset.save(
+        path,
+        structure={
+            "person_id": [0, 1, 2],
+            "tax_unit_id": [0, 1],
+            "benefit_unit_id": [0, 1],
+            "family_id": [0, 1],
+            "household_id": [0, 1],
+            "employer_id": [0, 1],
+            "person_tax_unit_id": [0, 0, 1],
+            "person_benefit_unit_id": [0, 0, 1],
+            "person_family_id": [0, 0, 1],
+            "person_household_id": [0, 0, 1],
+            "person_employer_id": [0, 0, 1],
+            "person_tax_unit_role": ["primary", "spouse", "primary"],
+            "person_benefit_unit_role": ["adult", "adult", "adult"],
+            "person_family_role": ["parent", "parent", "parent"],
+            "person_household_role": ["member", "member", "member"],
+            "person_employer_role": ["employee", "employee", "employee"],
+        },
+        variables={
+            "age": [40, 38, 70],
+            "employment_income": [50_000, 0, 200_000],
+            "state": ["VIC", "VIC", "WA"],
+            "postcode": ["3000", "3000", "6000"],
+            "household_weight": [1_000, 2_000],
+        },
+        time_period="2024",
+    )
+
+
+def test_columnar_dataset_round_trip(tmp_path):
+    """Test that saved columns are read back as memory-mapped arrays."""
+    save_dataset(tmp_path / "au_test")
+    dataset = ColumnarDataset(tmp_path / "au_test")
+    assert dataset.time_period == "2024"
+    assert set(dataset.variables) == {
+        "age",
+        "employment_income",
+        "state",
+        "postcode",
+        "household_weight",
+    }
+    column = dataset.column("employment_income")
+    assert isinstance(column, np.memmap)
+    assert column.dtype == np.float32
+    with pytest.raises(KeyError):
+        dataset.column("employment_income", "2025")
+
+
+def test_microsimulation_over_columnar_dataset(tmp_path):
+    """Test that a simulation uses the mapped columns without copying them."""
+    dataset = save_dataset(tmp_path / "au_test")
+    sim = Microsimulation(dataset=dataset)
+
+    stored = sim.get_holder("employment_income").get_array("2024")
+    assert isinstance(stored, np.memmap)
+
+    income_tax = sim.calculate("income_tax")
+    np.testing.assert_allclose(np.array(income_tax), [6_717, 0, 60_667])
+    assert income_tax.sum() == 6_717 * 1_000 + 60_667 * 2_000
+    assert list(sim.calculate("household_state", use_weights=False)) == [
+        "VIC",
+        "WA",
+    ]
+    assert list(sim.calculate("postcode", use_weights=False)) == [
+        "3000",
+        "3000",
+        "6000",
+    ]
+
+
+def test_enum_columns_round_trip(tmp_path):
+    """Test that Enum columns, stored as encoded integers, decode again."""
+    dataset = save_dataset(tmp_path / "au_test")
+    assert dataset.column("state").dtype.kind == "i"
+
+    sim = Microsimulation(dataset=dataset)
+    assert list(sim.calculate("state", use_weights=False)) == ["VIC", "VIC", "WA"]
+    chunk = next(iter(dataset.household_chunks(1)))
+    sim = Microsimulation(dataset=chunk)
+    assert list(sim.calculate("state", use_weights=False)) == ["VIC", "VIC"]
+
+
+def test_columnar_dataset_rejects_nan(tmp_path):
+    """Test that NaN inputs are refused when saving."""
+    with pytest.raises(ValueError):
+        ColumnarDataset.save(
+            tmp_path / "au_test",
+            structure={},
+            variables={"employment_income": [np.nan]},
+            time_period="2024",
+        )
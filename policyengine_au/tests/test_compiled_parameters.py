@@ -0,0 +1,69 @@
+"""Test compiled, period-indexed parameter views."""
+
+import pytest
+
+from policyengine_au import AustralianTaxBenefitSystem
+from policyengine_au.system import system
+from policyengine_au.utils import compiled_parameters
+
+
+def test_compiled_values_match_the_parameter_tree():
+    """Test that compiled lookups agree with walking the tree."""
+    node = system.parameters.gov.states.vic.payroll_tax
+    compiled = compiled_parameters(node)
+
+    for instant in ("2024-01-01", "2024-07-01", "2025-01-01", "2026-03-15"):
+        assert compiled(instant).threshold == node(instant).threshold
+        assert compiled(instant).rate == node(instant).rate
+
+
+def test_instants_between_breakpoints_share_values():
+    """Test that instants with the same parameters share one lookup."""
+    compiled = compiled_parameters(system.parameters.gov.states.vic.payroll_tax)
+
+    assert compiled("2024-03-01") is compiled("2024-11-30")
+    assert compiled("2024-03-01") is not compiled("2025-03-01")
+    with pytest.raises(ValueError):
+        compiled("1990-01-01")
+
+
+def test_compiled_view_is_dropped_on_update():
+    """Test that updating a parameter rebuilds the compiled view."""
+    tax_benefit_system = AustralianTaxBenefitSystem(use_snapshot=False)
+    node = tax_benefit_system.parameters.gov.states.nsw.payroll_tax
+    assert compiled_parameters(node)("2024-07-01").rate == node("2024-07-01").rate
+
+    node.rate.update(period="year:2024:1", value=0.1)
+
+    assert compiled_parameters(node)("2024-07-01").rate == 0.1
+
+
+def test_build_runs_once_per_breakpoint():
+    """Test that derived objects are built once per set of values."""
+    compiled = compiled_parameters(system.parameters.gov.ato.income_tax)
+    calls = []
+
+    def builder(p):
+        calls.append(p)
+        return p.rates.rates.bracket_2
+
+    assert compiled.build("2024-07-01", builder) == 0.19
+    assert compiled.build("2024-12-31", builder) == 0.19
+    assert len(calls) == 1
+
+
+def test_derived_reform_shares_unchanged_views():
+    """Test that a derived reform reuses the baseline's unchanged views."""
+    baseline = compiled_parameters(system.parameters.gov.states.nsw.payroll_tax)
+    reformed_system = system.derive(
+        {"gov.ato.income_tax.rates.rates.bracket_2": {"2024-01-01": 0.25}}
+    )
+    reformed = reformed_system.parameters
+
+    assert compiled_parameters(reformed.gov.states.nsw.payroll_tax) is baseline
+    assert (
+        compiled_parameters(reformed.gov.ato.income_tax)(
+            "2024-07-01"
+        ).rates.rates.bracket_2
+        == 0.25
+    )
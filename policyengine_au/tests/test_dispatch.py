@@ -0,0 +1,89 @@
+"""Test per-category dispatch and the state payroll tax that uses it."""
+
+import numpy as np
+
+from policyengine_au import Microsimulation
+from policyengine_au.model_api import Employer, Reform, StateCode, Variable, YEAR
+from policyengine_au.tests.test_chunked_microsimulation import save_dataset
+from policyengine_au.utils import dispatch
+
+
+def test_dispatch_matches_where_chain():
+    """Test that dispatch gives the same result as selecting with where."""
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 4, 1_000)
+    values = rng.uniform(0, 100, 1_000)
+    branches = {0: lambda x: x * 2, 1: lambda x: x + 1, 3: np.sqrt}
+
+    expected = np.zeros(1_000)
+    for code, function in branches.items():
+        expected = np.where(codes == code, function(values), expected)
+
+    np.testing.assert_array_equal(dispatch(codes, branches, values), expected)
+
+
+def test_dispatch_passes_each_branch_only_its_elements():
+    """Test that each branch sees only its own category."""
+    codes = np.array([2, 0, 2, 1, 0])
+    sizes = {}
+
+    def branch(code):
+        def function(x):
+            sizes[code] = len(x)
+            return x
+
+        return function
+
+    result = dispatch(
+        codes, {code: branch(code) for code in (0, 2)}, np.arange(5.0), default=-1
+    )
+
+    assert sizes == {0: 2, 2: 2}
+    np.testing.assert_array_equal(result, [0, 1, 2, -1, 4])
+
+
+def test_state_payroll_tax_matches_each_state(tmp_path):
+    """Test that dispatching by state gives each state's own payroll tax."""
+    simulation = Microsimulation(dataset=save_dataset(tmp_path / "au_test", 200))
+    state = simulation.calculate("employer_state", "2024").values
+    total = simulation.calculate("state_payroll_tax", "2024").values
+
+    for state_code in StateCode:
+        in_state = state == state_code.name
+        own = simulation.calculate(
+            f"{state_code.name.lower()}_payroll_tax", "2024"
+        ).values
+        np.testing.assert_allclose(total[in_state], own[in_state])
+    assert total.sum() > 0
+
+
+def test_state_payroll_tax_follows_replaced_state_variables(tmp_path):
+    """Test that reforms to one state's variable change the total."""
+
+    class flat_nsw_payroll_tax(Reform):
+        def apply(self):
+            class nsw_payroll_tax(Variable):
+                value_type = float
+                entity = Employer
+                label = "NSW payroll tax"
+                definition_period = YEAR
+
+                def formula(employer, period, parameters):
+                    return employer("employer_wages", period) * 0.01
+
+            self.update_variable(nsw_payroll_tax)
+            self.neutralize_variable("vic_payroll_tax")
+
+    dataset = save_dataset(tmp_path / "au_test", 200)
+    baseline = Microsimulation(dataset=dataset)
+    reformed = Microsimulation(dataset=dataset, reform=flat_nsw_payroll_tax)
+    state = baseline.calculate("employer_state", "2024").values
+    before = baseline.calculate("state_payroll_tax", "2024").values
+    after = reformed.calculate("state_payroll_tax", "2024").values
+
+    nsw, vic = state == "NSW", state == "VIC"
+    wages = baseline.calculate("employer_wages", "2024").values
+    np.testing.assert_allclose(after[nsw], wages[nsw] * 0.01)
+    assert before[vic].sum() > 0
+    assert not after[vic].any()
+    np.testing.assert_array_equal(after[~nsw & ~vic], before[~nsw & ~vic])
@@ -0,0 +1,93 @@
+"""Test batched marginal tax rates against separate simulations."""
+
+import copy
+
+import numpy as np
+
+from policyengine_au import Simulation
+from policyengine_au.marginal_rates import downstream_variables
+from policyengine_au.system import system
+
+SITUATION = {
+    "people": {
+        "pensioner": {"age": 70, "employment_income": 20_000},
+        "parent": {"age": 40, "employment_income": 60_000},
+        "child": {"age": 3},
+        "worker": {"age": 30, "employment_income": 50_000},
+        "partner": {"age": 31, "employment_income": 90_000},
+    },
+    "benefit_units": {
+        "pensioner_unit": {"adults": ["pensioner"]},
+        "parent_unit": {"adults": ["parent"], "children": ["child"]},
+        "couple_unit": {"adults": ["worker", "partner"]},
+    },
+    "families": {
+        "pensioner_family": {"parents": ["pensioner"]},
+        "parent_family": {"parents": ["parent"], "children": ["child"]},
+        "couple_family": {"parents": ["worker", "partner"]},
+    },
+    "tax_units": {
+        "pensioner_tax_unit": {"primaries": ["pensioner"]},
+        "parent_tax_unit": {"primaries": ["parent"], "dependents": ["child"]},
+        "couple_tax_unit": {"primaries": ["worker"], "spouses": ["partner"]},
+    },
+    "households": {
+        "shared_house": {"members": ["pensioner", "parent", "child"]},
+        "couple_house": {"members": ["worker", "partner"]},
+    },
+}
+
+
+def simulate(situation):
+    return Simulation(situation=situation, default_input_period="2025")
+
+
+def test_downstream_variables_follow_formulas():
+    downstream = downstream_variables(system, "employment_income")
+    assert {"income_tax", "age_pension", "ftb_part_a", "household_net_income"} <= (
+        downstream
+    )
+    assert not {"age", "age_pension_eligible", "is_ftb_child"} & downstream
+
+
+def test_batched_rates_match_separate_simulations():
+    simulation = simulate(SITUATION)
+    deltas = [1_000, 10_000]
+    rates = simulation.marginal_tax_rates(2025, deltas=deltas)
+    assert rates.shape == (2, 5)
+
+    baseline_net_income = simulation.calculate("household_net_income", 2025)
+    household = simulation.populations["household"].members_entity_id
+    for i, delta in enumerate(deltas):
+        for person_index, name in enumerate(SITUATION["people"]):
+            raised = copy.deepcopy(SITUATION)
+            person = raised["people"][name]
+            person["employment_income"] = person.get("employment_income", 0) + delta
+            net_income = simulate(raised).calculate("household_net_income", 2025)
+            change = (net_income - baseline_net_income)[household[person_index]]
+            np.testing.assert_allclose(
+                rates[i, person_index], 1 - change / delta, atol=1e-4
+            )
+
+
+def test_marginal_tax_rate_variable():
+    simulation = simulate(SITUATION)
+    rates = simulation.calculate("marginal_tax_rate", 2025)
+    # The worker is in the 30% bracket and pays the 2% Medicare levy, and
+    # the couple has no benefits to lose.
+    np.testing.assert_allclose(rates[3], 0.32, atol=1e-4)
+    np.testing.assert_allclose(rates, simulation.marginal_tax_rates(2025), atol=1e-6)
+
+
+def test_rates_follow_variables_read_through_helpers():
+    # NSW payroll tax reads its group's wages only inside group_payroll_tax,
+    # so a cached value copied from the original would hide the change.
+    assert "nsw_payroll_tax" in downstream_variables(system, "employment_income")
+    simulation = simulate(
+        {"people": {"owner": {"employment_income": 2_000_000, "state": "NSW"}}}
+    )
+    rates = simulation.marginal_tax_rates(2025, target="nsw_payroll_tax")
+    rate = simulation.tax_benefit_system.parameters(
+        "2025-01-01"
+    ).gov.states.nsw.payroll_tax.rate
+    np.testing.assert_allclose(rates, [1 - rate])
@@ -0,0 +1,53 @@
+"""Test weighted microsimulation over a household dataset."""
+
+import h5py
+import numpy as np
+
+from policyengine_au import Microsimulation
+
+
+def write_dataset(path):
+    """Write a three-household dataset with weights of 10, 20 and 30."""
+    people = np.arange(4)
+    person_household = np.array([0, 0, 1, 2])
+    data = {
+        "person_id": people,
+        "household_id": np.arange(3),
+        "tax_unit_id": people,
+        "benefit_unit_id": people,
+        "family_id": people,
+        "employer_id": np.arange(3),
+        "person_household_id": person_household,
+        "person_tax_unit_id": people,
+        "person_benefit_unit_id": people,
+        "person_family_id": people,
+        "person_employer_id": person_household,
+        "person_household_role": np.array(["member"] * 4),
+        "person_tax_unit_role": np.array(["primary"] * 4),
+        "person_benefit_unit_role": np.array(["adult"] * 4),
+        "person_family_role": np.array(["parent"] * 4),
+        "person_employer_role": np.array(["employee"] * 4),
+        "employment_income": np.array([50_000, 0, 80_000, 200_000]),
+        "household_weight": np.array([10.0, 20.0, 30.0]),
+    }
+    with h5py.File(path, "w") as f:
+        for name, values in data.items():
+            if values.dtype.kind == "U":
+                values = values.astype("S")
+            f.create_dataset(name, data=values)
+
+
+def test_microsimulation_weighted_aggregates(tmp_path):
+    """Test that totals and means use the household weights."""
+    path = tmp_path / "au_test_2024.h5"
+    write_dataset(path)
+    sim = Microsimulation(dataset=str(path), default_input_period="2024")
+
+    income_tax = sim.calculate("income_tax", "2024")
+    np.testing.assert_allclose(np.array(income_tax), [6_717, 0, 16_467, 60_667])
+    np.testing.assert_allclose(income_tax.weights.values, [10, 10, 20, 30])
+    assert income_tax.sum() == 6_717 * 10 + 16_467 * 20 + 60_667 * 30
+    assert income_tax.mean() == income_tax.sum() / 70
+
+    households = sim.calculate("household_weight", "2024", use_weights=False)
+    np.testing.assert_array_equal(households, [10, 20, 30])
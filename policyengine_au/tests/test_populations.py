@@ -0,0 +1,136 @@
+"""Test that indexed populations agree with core's group populations."""
+
+import numpy as np
+import pytest
+from policyengine_core.simulations import Simulation
+from policyengine_core.taxbenefitsystems import TaxBenefitSystem
+
+from policyengine_au import Microsimulation
+from policyengine_au.populations import IndexedGroupPopulation
+from policyengine_au.system import AustralianTaxBenefitSystem, system
+from policyengine_au.tests.test_chunked_microsimulation import save_dataset
+from policyengine_au.utils import group_sum
+
+
+def build_tax_units(instantiate_entities, seed=0):
+    """Build 50 tax units over 120 shuffled people."""
+    rng = np.random.default_rng(seed)
+    populations = instantiate_entities(system)
+    entity = populations["tax_unit"].entity
+    primary, spouse, dependent = entity.flattened_roles
+    ids = rng.permutation(np.concatenate([np.arange(50), rng.integers(0, 45, 70)]))
+    # Each tax unit's first member is its primary earner and its second, if
+    # any, its spouse.
+    first = np.zeros(len(ids), dtype=bool)
+    first[np.unique(ids, return_index=True)[1]] = True
+    second = np.zeros(len(ids), dtype=bool)
+    second[np.flatnonzero(~first)[np.unique(ids[~first], return_index=True)[1]]] = True
+    roles = np.select([first, second], [primary, spouse], dependent)
+
+    populations["person"].count = len(ids)
+    tax_units = populations["tax_unit"]
+    tax_units.count = 50
+    tax_units.members_entity_id = ids
+    tax_units.members_role = roles
+    Simulation(tax_benefit_system=system, populations=populations)
+    return tax_units, (primary, spouse, dependent)
+
+
+@pytest.fixture
+def populations():
+    core, roles = build_tax_units(TaxBenefitSystem.instantiate_entities)
+    indexed, _ = build_tax_units(AustralianTaxBenefitSystem.instantiate_entities)
+    assert isinstance(indexed, IndexedGroupPopulation)
+    return core, indexed, roles
+
+
+def test_aggregations_match_core(populations):
+    core, indexed, (primary, spouse, dependent) = populations
+    values = np.random.default_rng(1).uniform(-10, 10, core.members.count)
+
+    for role in (None, primary, dependent):
+        np.testing.assert_allclose(indexed.sum(values, role), core.sum(values, role))
+        np.testing.assert_array_equal(indexed.nb_persons(role), core.nb_persons(role))
+        np.testing.assert_array_equal(indexed.max(values, role), core.max(values, role))
+        np.testing.assert_array_equal(indexed.min(values, role), core.min(values, role))
+        np.testing.assert_array_equal(
+            indexed.all(values > -5, role), core.all(values > -5, role)
+        )
+
+
+def test_projections_match_core(populations):
+    core, indexed, (primary, spouse, dependent) = populations
+    values = np.random.default_rng(2).uniform(0, 10, core.members.count)
+
+    np.testing.assert_array_equal(indexed.members_position, core.members_position)
+    for n in range(4):
+        np.testing.assert_array_equal(
+            indexed.value_nth_person(n, values, default=-1),
+            core.value_nth_person(n, values, default=-1),
+        )
+    np.testing.assert_array_equal(
+        indexed.value_from_first_person(values), core.value_from_first_person(values)
+    )
+    np.testing.assert_array_equal(
+        indexed.value_from_person(values, spouse),
+        core.value_from_person(values, spouse),
+    )
+    unit_values = np.arange(50.0)
+    np.testing.assert_array_equal(
+        indexed.project(unit_values, spouse), core.project(unit_values, spouse)
+    )
+
+
+def test_membership_index_is_immutable_and_reset(populations):
+    _, indexed, _ = populations
+    membership = indexed.membership
+
+    assert indexed.membership is membership
+    with pytest.raises(ValueError):
+        membership.order[0] = 1
+    indexed.members_entity_id = np.zeros(indexed.members.count, dtype=int)
+    assert indexed.membership is not membership
+    assert indexed.membership.counts[0] == indexed.members.count
+
+
+def test_assigned_positions_reorder_members(populations):
+    core, indexed, _ = populations
+    values = np.random.default_rng(3).uniform(0, 10, core.members.count)
+    # Reverse the order of each tax unit's members.
+    counts = np.bincount(core.members_entity_id)
+    reversed_position = counts[core.members_entity_id] - 1 - core.members_position
+    core.members_position = reversed_position
+    indexed.members_position = reversed_position
+
+    np.testing.assert_array_equal(indexed.members_position, reversed_position)
+    for n in range(3):
+        np.testing.assert_array_equal(
+            indexed.value_nth_person(n, values, default=-1),
+            core.value_nth_person(n, values, default=-1),
+        )
+    with pytest.raises(ValueError):
+        indexed.members_position = np.zeros(core.members.count, dtype=int)
+        indexed.membership
+
+
+def test_segment_index_sums_groups_and_is_reused(tmp_path):
+    simulation = Microsimulation(
+        dataset=save_dataset(tmp_path / "au_test", linked=True)
+    )
+    employers = simulation.populations["employer"]
+    index = employers.segment_index("employer_group_id", "2024")
+    assert employers.segment_index("employer_group_id", "2024") is index
+
+    group_ids = np.array(index.group_ids)
+    values = np.random.default_rng(0).uniform(0, 100, group_ids.size)
+    expected = values.copy()
+    for group in set(group_ids) - {-1}:
+        in_group = group_ids == group
+        expected[in_group] = values[in_group].sum()
+    np.testing.assert_allclose(index.sum(values), expected)
+    np.testing.assert_allclose(group_sum(values, group_ids), expected)
+
+    simulation.set_input("employer_group_id", "2024", np.zeros_like(group_ids))
+    regrouped = employers.segment_index("employer_group_id", "2024")
+    assert regrouped is not index
+    np.testing.assert_allclose(regrouped.sum(values), values.sum())
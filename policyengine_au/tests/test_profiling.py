@@ -0,0 +1,66 @@
+"""Test per-variable profiling of simulations."""
+
+import json
+
+import numpy as np
+
+from policyengine_au import Simulation
+from policyengine_au.profiling import ProfilingTracer
+
+SITUATION = {
+    "people": {
+        "worker": {"age": 40, "employment_income": 2_000_000, "state": "WA"},
+    },
+    "households": {"house": {"members": ["worker"]}},
+}
+
+
+def simulate():
+    return Simulation(situation=SITUATION, default_input_period="2024")
+
+
+def test_profile_records_calls_times_and_edges():
+    simulation = simulate()
+    with simulation.profile() as profile:
+        result = simulation.calculate("wa_payroll_tax", 2024)
+        simulation.calculate("income_tax", 2024)
+    assert not isinstance(simulation.tracer, ProfilingTracer)
+
+    profiles = {row.variable: row for row in profile.summary()}
+    assert profiles["wa_payroll_tax"].calls == 1
+    assert profiles["wa_payroll_tax"].bytes == result.nbytes
+    for row in profiles.values():
+        assert 0 <= row.self_s <= row.cumulative_s + 1e-9
+
+    edges = profile.edges()
+    assert ("wa_payroll_tax", "payroll_tax_group_wages") in edges
+    assert ("income_tax", "taxable_income") in edges
+    assert "wa_payroll_tax" in profile.table()
+
+
+def test_profile_exports(tmp_path):
+    simulation = simulate()
+    with simulation.profile() as profile:
+        simulation.calculate("income_tax", 2024)
+
+    profile.write_collapsed_stacks(tmp_path / "stacks.folded")
+    lines = (tmp_path / "stacks.folded").read_text().splitlines()
+    stacks = dict(line.rsplit(" ", 1) for line in lines)
+    assert "income_tax@2024" in stacks
+    assert "income_tax@2024;taxable_income@2024" in stacks
+    assert all(int(microseconds) >= 0 for microseconds in stacks.values())
+
+    profile.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {event["name"] for event in events} == {
+        row.variable for row in profile.summary()
+    }
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+
+def test_profiling_does_not_change_results():
+    expected = simulate().calculate("state_payroll_tax", 2024)
+    simulation = simulate()
+    with simulation.profile():
+        result = simulation.calculate("state_payroll_tax", 2024)
+    np.testing.assert_allclose(result, expected)
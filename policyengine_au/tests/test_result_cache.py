@@ -0,0 +1,125 @@
+"""Test the content-addressed result cache."""
+
+import json
+
+from policyengine_au import AustralianTaxBenefitSystem
+from policyengine_au.result_cache import ResultCache, system_fingerprint
+from policyengine_au.service import HouseholdCalculator
+from policyengine_au.system import system
+
+REFORM = {"gov.ato.income_tax.rates.rates.bracket_2": {"2024-01-01": 0.25}}
+
+
+def situation(income, state="NSW"):
+    return {
+        "people": {
+            "you": {"age": 40, "employment_income": income, "state": state},
+        },
+        "households": {"home": {"members": ["you"]}},
+    }
+
+
+def test_keys_ignore_ordering_but_not_content():
+    key = ResultCache.key(system, situation(50_000), 2025, ["income_tax", "age"])
+    reordered = {
+        "households": {"home": {"members": ["you"]}},
+        "people": {"you": {"state": "NSW", "employment_income": 50_000, "age": 40}},
+    }
+    assert ResultCache.key(system, reordered, "2025", ["age", "income_tax"]) == key
+    assert (
+        ResultCache.key(system, situation(50_001), 2025, ["income_tax", "age"]) != key
+    )
+    assert (
+        ResultCache.key(system, situation(50_000), 2024, ["income_tax", "age"]) != key
+    )
+    assert ResultCache.key(system, situation(50_000), 2025, ["income_tax"]) != key
+
+
+def test_keys_accept_mixed_key_types():
+    mixed = situation(50_000)
+    mixed["people"]["you"]["employment_income"] = {2025: 40, "2026": 41}
+    as_strings = situation(50_000)
+    as_strings["people"]["you"]["employment_income"] = {"2025": 40, "2026": 41}
+    assert ResultCache.key(system, mixed, 2025, ["income_tax"]) == ResultCache.key(
+        system, as_strings, 2025, ["income_tax"]
+    )
+
+
+def test_fingerprint_changes_with_parameters():
+    fresh = AustralianTaxBenefitSystem()
+    fingerprint = system_fingerprint(fresh)
+    assert system_fingerprint(system) == fingerprint
+    assert system_fingerprint(fresh.derive(REFORM)) != fingerprint
+    fresh.parameters.gov.ato.income_tax.rates.rates.bracket_2.update(
+        period="year:2024:10", value=0.2
+    )
+    assert system_fingerprint(fresh) != fingerprint
+
+
+def test_repeated_situations_are_not_simulated_again():
+    cache = ResultCache()
+    situations = [situation(income) for income in (0, 40_000, 90_000)]
+    first = system.calculate_many(situations, ["income_tax"], 2025, cache=cache)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 3, 3)
+    again = system.calculate_many(
+        situations + [situation(120_000)], ["income_tax"], 2025, cache=cache
+    )
+    assert again[:3] == first
+    assert (cache.hits, cache.misses, len(cache)) == (3, 4, 4)
+
+
+def test_least_recently_used_results_are_evicted():
+    size = len(json.dumps({"value": 0}, separators=(",", ":")))
+    cache = ResultCache(max_bytes=2 * size)
+    cache.put("a", {"value": 0})
+    cache.put("b", {"value": 0})
+    assert cache.get("a") == {"value": 0}
+    cache.put("c", {"value": 0})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_results_are_copies():
+    cache = ResultCache()
+    cache.put("a", {"income_tax": {"you": 1.0}})
+    cache.get("a")["income_tax"]["you"] = 2.0
+    assert cache.get("a") == {"income_tax": {"you": 1.0}}
+
+
+def test_disk_tier_outlives_memory(tmp_path):
+    cache = ResultCache(directory=tmp_path)
+    key = cache.key(system, situation(70_000), 2025, ["income_tax"])
+    cache.put(key, {"income_tax": {"you": 1.0}})
+    restarted = ResultCache(directory=tmp_path)
+    assert restarted.get(key) == {"income_tax": {"you": 1.0}}
+    assert len(restarted) == 1
+
+
+def test_disk_tier_is_capped(tmp_path):
+    cache = ResultCache(directory=tmp_path, max_disk_bytes=1_000)
+    for i in range(20):
+        cache.put(f"{i:064x}", {"values": list(range(20))})
+    stored = list(tmp_path.glob("*/*.json"))
+    assert 0 < len(stored) < 20
+    assert sum(path.stat().st_size for path in stored) <= 1_000
+
+
+def test_calculator_answers_repeats_from_the_cache():
+    cache = ResultCache()
+    calculator = HouseholdCalculator(reforms={"higher": REFORM}, cache=cache)
+    try:
+        baseline = calculator.calculate(situation(60_000), ["income_tax"])
+        reformed = calculator.calculate(
+            situation(60_000), ["income_tax"], reform="higher"
+        )
+        assert cache.misses == 2
+        future = calculator.submit(situation(60_000), ["income_tax"])
+        assert future.done()
+        assert future.result() == baseline
+        assert (
+            calculator.calculate(situation(60_000), ["income_tax"], reform="higher")
+            == reformed
+        )
+        assert cache.hits == 2
+    finally:
+        calculator.close()
@@ -0,0 +1,65 @@
+"""Test the vectorised rate schedules."""
+
+import numpy as np
+import pytest
+from policyengine_core.simulations import Simulation
+
+from policyengine_au import AustralianTaxBenefitSystem
+from policyengine_au.utils import MarginalRateSchedule, StepRateSchedule
+
+
+def test_marginal_rate_schedule_matches_bracket_arithmetic():
+    """Test that the schedule reproduces hand-computed bracket sums."""
+    schedule = MarginalRateSchedule(
+        [0, 18_200, 45_000, 120_000, 180_000],
+        [0, 0.19, 0.325, 0.37, 0.45],
+    )
+    income = np.array([0, 18_200, 50_000, 120_000, 200_000])
+    expected = [0, 0, 6_717, 29_467, 60_667]
+    np.testing.assert_allclose(schedule.calc(income), expected)
+    np.testing.assert_allclose(
+        schedule.marginal_rates(income), [0, 0.19, 0.325, 0.37, 0.45]
+    )
+
+
+def test_marginal_rate_schedule_rejects_unsorted_thresholds():
+    """Test that thresholds out of order are reported."""
+    with pytest.raises(ValueError):
+        MarginalRateSchedule([0, 45_000, 18_200], [0, 0.19, 0.325])
+
+
+def test_step_rate_schedule_applies_band_rate_to_whole_base():
+    """Test that a step schedule charges its band's rate on the whole base."""
+    schedule = StepRateSchedule([50_000, 60_000, 80_000], [0.01, 0.02, 0.05])
+    base = np.array([0, 49_999, 50_000, 59_999, 60_000, 100_000])
+    np.testing.assert_allclose(schedule.calc(base), [0, 0, 500, 599.99, 1_200, 5_000])
+    np.testing.assert_allclose(
+        schedule.band_rates(base), [0, 0, 0.01, 0.01, 0.02, 0.05]
+    )
+
+
+def test_income_tax_is_vectorised():
+    """Test that income tax is calculated for many people in one simulation."""
+    system = AustralianTaxBenefitSystem()
+    incomes = [0, 18_000, 50_000, 80_000, 120_000, 200_000]
+    situation = {
+        "people": {
+            f"person_{i}": {"employment_income": {"2024": income}}
+            for i, income in enumerate(incomes)
+        },
+        "households": {
+            "household": {"members": [f"person_{i}" for i in range(len(incomes))]}
+        },
+    }
+    simulation = Simulation(tax_benefit_system=system, situation=situation)
+
+    # 2023-24 rates apply at the start of 2024; Stage 3 rates from 2025.
+    np.testing.assert_allclose(
+        simulation.calculate("income_tax", "2024"),
+        [0, 0, 6_717, 16_467, 29_467, 60_667],
+    )
+    simulation.set_input("employment_income", "2025", np.array(incomes))
+    np.testing.assert_allclose(
+        simulation.calculate("income_tax", "2025"),
+        [0, 0, 6_592, 15_592, 27_592, 56_942],
+    )
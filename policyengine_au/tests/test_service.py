@@ -0,0 +1,126 @@
+"""Test the micro-batching household calculator and its HTTP service."""
+
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from policyengine_au import Simulation
+from policyengine_au.result_cache import ResultCache
+from policyengine_au.service import (
+    CalculatorClosedError,
+    CalculatorServer,
+    HouseholdCalculator,
+)
+
+REFORM = {"gov.ato.income_tax.rates.rates.bracket_2": {"2024-01-01": 0.25}}
+
+
+def situation(income):
+    return {
+        "people": {"you": {"age": 40, "employment_income": income}},
+        "households": {"home": {"members": ["you"]}},
+    }
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    calculator = HouseholdCalculator(reforms={"higher": REFORM}, window=0.01)
+    yield calculator
+    calculator.close()
+
+
+def test_batched_results_match_separate_simulations(calculator):
+    incomes = [0, 30_000, 60_000, 120_000, 250_000]
+    with ThreadPoolExecutor(len(incomes)) as pool:
+        results = list(
+            pool.map(
+                lambda income: calculator.calculate(
+                    situation(income), ["income_tax", "household_net_income"]
+                ),
+                incomes,
+            )
+        )
+    for income, result in zip(incomes, results):
+        simulation = Simulation(
+            situation=situation(income), default_input_period="2025"
+        )
+        assert result["income_tax"]["you"] == pytest.approx(
+            float(simulation.calculate("income_tax", "2025")[0])
+        )
+        assert set(result["household_net_income"]) == {"home"}
+
+
+def test_reforms_are_kept_loaded(calculator):
+    baseline = calculator.calculate(situation(60_000), ["income_tax"])
+    reformed = calculator.calculate(situation(60_000), ["income_tax"], reform="higher")
+    assert reformed["income_tax"]["you"] > baseline["income_tax"]["you"]
+
+
+def test_a_failing_request_does_not_fail_its_batch(calculator):
+    bad = {"people": {"you": {"age": "old"}}}
+    good = calculator.submit(situation(50_000), ["income_tax"])
+    failing = calculator.submit(bad, ["income_tax"])
+    assert good.result()["income_tax"]["you"] > 0
+    with pytest.raises(Exception):
+        failing.result()
+    with pytest.raises(ValueError):
+        calculator.submit(situation(0), ["no_such_variable"])
+
+
+def test_http_service(calculator):
+    server = CalculatorServer(("127.0.0.1", 0), calculator)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address[:2])
+        body = {"situation": situation(60_000), "variables": ["income_tax"]}
+        connection.request("POST", "/calculate", json.dumps(body))
+        response = connection.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read())["results"]["income_tax"]["you"] > 0
+
+        connection.request("POST", "/calculate", json.dumps({"variables": []}))
+        response = connection.getresponse()
+        assert response.status == 400
+        assert "situation" in json.loads(response.read())["error"]
+
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+        assert json.loads(response.read())["reforms"] == ["higher"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_closed_calculator_refuses_requests():
+    calculator = HouseholdCalculator()
+    calculator.close()
+    with pytest.raises(CalculatorClosedError):
+        calculator.submit(situation(50_000), ["income_tax"])
+    calculator.close()
+
+
+class FailingCache(ResultCache):
+    def put(self, key, results):
+        raise OSError("The cache is full.")
+
+
+def test_a_failing_cache_does_not_stop_the_worker():
+    calculator = HouseholdCalculator(window=0.05, cache=FailingCache(2**20))
+    try:
+        futures = [
+            calculator.submit(situation(income), ["income_tax"])
+            for income in (40_000, 80_000)
+        ]
+        assert [
+            future.result(timeout=60)["income_tax"]["you"] > 0 for future in futures
+        ] == [True, True]
+        assert (
+            calculator.calculate(situation(60_000), ["income_tax"])["income_tax"]["you"]
+            > 0
+        )
+    finally:
+        calculator.close()
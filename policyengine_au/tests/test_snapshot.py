@@ -0,0 +1,147 @@
+"""Test the serialized system snapshot."""
+
+from policyengine_au import AustralianTaxBenefitSystem
+from policyengine_au.snapshot import build_snapshot, load_snapshot
+
+
+def test_snapshot_round_trip(tmp_path, monkeypatch):
+    """Test that a system built from a snapshot has the same parameters."""
+    path = build_snapshot(tmp_path / "snapshot.pkl")
+    monkeypatch.setattr(AustralianTaxBenefitSystem, "snapshot_path", path)
+
+    snapshot = load_snapshot(AustralianTaxBenefitSystem)
+    assert snapshot is not None
+    assert snapshot["variables"]["income_tax"] == "gov.ato.income_tax.income_tax"
+
+    from_snapshot = AustralianTaxBenefitSystem()
+    from_source = AustralianTaxBenefitSystem(use_snapshot=False)
+    for instant in ("2024-07-01", "2025-07-01"):
+        assert from_snapshot.parameters(
+            instant
+        ).gov.ato.income_tax.rates.rates.bracket_2 == (
+            from_source.parameters(instant).gov.ato.income_tax.rates.rates.bracket_2
+        )
+    assert set(from_snapshot.variables) == set(from_source.variables)
+    assert AustralianTaxBenefitSystem.parameters_dir is not None
+
+
+def test_stale_snapshot_is_ignored(tmp_path, monkeypatch):
+    """Test that a snapshot is ignored once the sources change."""
+    path = build_snapshot(tmp_path / "snapshot.pkl")
+    monkeypatch.setattr(AustralianTaxBenefitSystem, "snapshot_path", path)
+    monkeypatch.setattr("policyengine_au.snapshot.source_stamps", lambda _: {})
+    monkeypatch.setattr(
+        "policyengine_au.snapshot.source_hash", lambda directories: "changed"
+    )
+
+    assert load_snapshot(AustralianTaxBenefitSystem) is None
+
+
+def test_sources_are_hashed_only_when_stamps_change(tmp_path, monkeypatch):
+    """Test that unchanged stamps skip hashing, and touched files refresh them."""
+    import os
+
+    from policyengine_au import snapshot as snapshot_module
+
+    path = build_snapshot(tmp_path / "snapshot.pkl")
+    monkeypatch.setattr(AustralianTaxBenefitSystem, "snapshot_path", path)
+    hashed = []
+    source_hash = snapshot_module.source_hash
+    monkeypatch.setattr(
+        snapshot_module,
+        "source_hash",
+        lambda directories: hashed.append(1) or source_hash(directories),
+    )
+
+    assert load_snapshot(AustralianTaxBenefitSystem) is not None
+    assert hashed == []
+
+    # Touching a source file, without changing it, hashes the sources once.
+    snapshot = load_snapshot(AustralianTaxBenefitSystem)
+    source = next(iter(snapshot["source_stamps"]))
+    stamp = os.stat(source)
+    try:
+        os.utime(source, ns=(stamp.st_atime_ns, stamp.st_mtime_ns + 1))
+        assert load_snapshot(AustralianTaxBenefitSystem) is not None
+        assert load_snapshot(AustralianTaxBenefitSystem) is not None
+        assert hashed == [1]
+    finally:
+        os.utime(source, ns=(stamp.st_atime_ns, stamp.st_mtime_ns))
+
+
+def test_missing_snapshot_is_ignored(tmp_path, monkeypatch):
+    """Test that the system loads from source without a snapshot."""
+    monkeypatch.setattr(
+        AustralianTaxBenefitSystem, "snapshot_path", tmp_path / "missing.pkl"
+    )
+
+    assert load_snapshot(AustralianTaxBenefitSystem) is None
+    system = AustralianTaxBenefitSystem()
+    assert system.parameters("2024-07-01").gov.ato.medicare.levy_rate == 0.02
+
+
+def test_snapshot_imports_variables_on_first_use(tmp_path, monkeypatch):
+    """Test that a system loaded from a snapshot imports variables lazily."""
+    from policyengine_au import Simulation
+
+    path = build_snapshot(tmp_path / "snapshot.pkl")
+    monkeypatch.setattr(AustralianTaxBenefitSystem, "snapshot_path", path)
+    system = AustralianTaxBenefitSystem()
+
+    assert system.variables.loaded == []
+    assert "nsw_payroll_tax" in system.variables
+    assert system.get_variable("income_tax").name == "income_tax"
+    assert system.variables.loaded == ["income_tax"]
+    assert system.get_variable("not_a_variable") is None
+
+    simulation = Simulation(
+        tax_benefit_system=system,
+        situation={
+            "people": {"you": {"employment_income": {2024: 60_000}}},
+            "households": {"household": {"members": ["you"]}},
+        },
+    )
+    assert simulation.calculate("income_tax", 2024)[0] == 9_967
+    assert simulation.input_variables == ["employment_income"]
+    # Building and calculating imports only what income tax reads.
+    loaded = set(system.variables.loaded)
+    assert "nsw_payroll_tax" not in loaded and "age_pension" not in loaded
+    eager = AustralianTaxBenefitSystem(use_snapshot=False).variables
+    assert len(system.variables) == len(eager) > len(loaded)
+    assert sorted(system.variables) == sorted(eager)
+
+
+def test_copied_variables_stay_lazy(tmp_path, monkeypatch):
+    """Test that deriving a reform imports nothing, and shares imports."""
+    path = build_snapshot(tmp_path / "snapshot.pkl")
+    monkeypatch.setattr(AustralianTaxBenefitSystem, "snapshot_path", path)
+    system = AustralianTaxBenefitSystem()
+    system.get_variable("income_tax")
+
+    derived = system.derive(
+        {"gov.ato.income_tax.rates.rates.bracket_2": {"2024-01-01": 0.25}}
+    )
+    assert derived.variables.loaded == ["income_tax"]
+    assert derived.get_variable("income_tax") is system.get_variable("income_tax")
+    # The module is imported once, for the system and its copies alike.
+    payroll_tax = derived.get_variable("nsw_payroll_tax")
+    assert "nsw_payroll_tax" in system.variables.loaded
+    assert system.get_variable("nsw_payroll_tax") is payroll_tax
+
+
+def test_variables_are_lazy_without_a_snapshot(tmp_path, monkeypatch):
+    """Test that the variable index is read from source without a snapshot."""
+    from policyengine_au.lazy_variables import variable_modules
+
+    monkeypatch.setattr(
+        AustralianTaxBenefitSystem, "snapshot_path", tmp_path / "missing.pkl"
+    )
+    system = AustralianTaxBenefitSystem()
+    assert system.variables.loaded == []
+    assert system.get_variable("income_tax").name == "income_tax"
+    assert system.variables.loaded == ["income_tax"]
+
+    index = variable_modules(AustralianTaxBenefitSystem.variables_dir)
+    assert index == {
+        name: variable.module_name for name, variable in system.variables.items()
+    }
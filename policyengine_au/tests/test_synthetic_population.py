@@ -0,0 +1,99 @@
+"""Test the synthetic population generator."""
+
+import numpy as np
+
+from policyengine_au import Microsimulation
+from policyengine_au.data.synthetic import (
+    POSTCODE_RANGES,
+    PopulationDistributions,
+    synthetic_dataset,
+    synthetic_population,
+)
+
+
+def test_same_seed_gives_same_population():
+    structure, variables = synthetic_population(5_000, seed=3)
+    again_structure, again_variables = synthetic_population(5_000, seed=3)
+    for name, values in {**structure, **variables}.items():
+        np.testing.assert_array_equal(
+            values, {**again_structure, **again_variables}[name]
+        )
+    _, other = synthetic_population(5_000, seed=4)
+    assert not np.array_equal(
+        variables["employment_income"], other["employment_income"]
+    )
+
+
+def test_groups_nest_inside_households():
+    structure, _ = synthetic_population(20_000)
+    household = structure["person_household_id"]
+    assert abs(household.size - 20_000) < 1_000
+    for entity in ("tax_unit", "benefit_unit", "family"):
+        groups = structure[f"person_{entity}_id"]
+        np.testing.assert_array_equal(np.unique(groups), structure[f"{entity}_id"])
+        # Every group's members share one household.
+        first = np.full(groups.max() + 1, -1)
+        first[groups[::-1]] = household[::-1]
+        np.testing.assert_array_equal(first[groups], household)
+    # Tax units sit inside families.
+    tax_units = structure["person_tax_unit_id"]
+    family_of_unit = np.zeros(tax_units.max() + 1, dtype=int)
+    family_of_unit[tax_units] = structure["person_family_id"]
+    np.testing.assert_array_equal(
+        family_of_unit[tax_units], structure["person_family_id"]
+    )
+    roles = structure["person_tax_unit_role"]
+    np.testing.assert_array_equal(
+        np.bincount(tax_units[roles == 0]), np.ones(tax_units.max() + 1)
+    )
+    assert np.bincount(tax_units[roles == 1]).max() == 1
+    assert (
+        np.bincount(
+            structure["person_family_id"][structure["person_family_role"] == 0]
+        ).max()
+        <= 2
+    )
+
+
+def test_postcodes_are_in_their_state():
+    _, variables = synthetic_population(5_000)
+    states = variables["state"].decode_to_str()
+    postcodes = variables["postcode"].astype(int)
+    for state, (low, high) in POSTCODE_RANGES.items():
+        in_state = postcodes[states == state]
+        assert in_state.size and in_state.min() >= low and in_state.max() <= high
+
+
+def test_distributions_are_configurable():
+    distributions = PopulationDistributions(
+        older_rate=1.0, state_shares={"TAS": 1.0}, older_homeowner_rate=1.0
+    )
+    structure, variables = synthetic_population(2_000, distributions=distributions)
+    _, heads = np.unique(structure["person_household_id"], return_index=True)
+    assert variables["age"][heads].min() >= 65
+    assert (variables["state"].decode_to_str() == "TAS").all()
+    assert variables["is_homeowner"].all() and not variables["rent"].any()
+
+
+def test_dataset_simulates(tmp_path):
+    dataset = synthetic_dataset(tmp_path / "synthetic", 2_000, period="2025")
+    simulation = Microsimulation(dataset=dataset)
+    net_income = np.asarray(
+        simulation.calculate("household_net_income", 2025, use_weights=False)
+    )
+    assert net_income.size == dataset.structure_array("household_id").size
+    assert np.isfinite(net_income).all()
+    assert simulation.calculate("income_tax", 2025).sum() > 0
+
+
+def test_employers_keep_chunks_close_to_their_size(tmp_path):
+    dataset = synthetic_dataset(tmp_path / "synthetic", 20_000)
+    households = dataset.structure_array("household_id").size
+    sizes = [chunk.count() for chunk in dataset.household_chunks(500)]
+    assert sum(sizes) == households
+    assert len(sizes) >= households // 1_000
+    assert max(sizes) < 1_000
+    employers = dataset.structure_array("person_employer_id")
+    income = np.asarray(dataset.column("employment_income"))
+    # Some firms are large enough to pay payroll tax.
+    assert np.bincount(employers, weights=income).max() > 2_000_000
@@ -57,3 +57,70 @@ def test_parameters_loaded():
 
     # Test Medicare levy
     assert p_2024.gov.ato.medicare.levy_rate == 0.02
+
+
+def test_derive_shares_unchanged_structure():
+    """Test that a derived reform copies only the parameters it changes."""
+    from policyengine_au.system import system
+
+    path = "gov.ato.income_tax.rates.rates.bracket_2"
+    reformed = system.derive({path: {"2024-01-01": 0.25}})
+
+    assert reformed.parameters.get_child(path)("2024-07-01") == 0.25
+    assert system.parameters.get_child(path)("2024-07-01") == 0.19
+    assert reformed.get_variable("income_tax") is system.get_variable("income_tax")
+    assert reformed.parameters.gov.dss is system.parameters.gov.dss
+    assert reformed.parameters.gov.ato.medicare is system.parameters.gov.ato.medicare
+
+
+def test_derive_matches_full_load():
+    """Test that deriving a reform gives the same results as loading it."""
+    from policyengine_core.reforms import Reform
+    from policyengine_au import Simulation
+    from policyengine_au.system import system
+
+    reform = Reform.from_dict(
+        {
+            "gov.ato.income_tax.rates.rates.bracket_2": {"2024-01-01": 0.25},
+            "gov.ato.medicare.levy_rate": {"2024-01-01": 0.03},
+        }
+    )
+    situation = {
+        "people": {"you": {"age": {2024: 40}, "employment_income": {2024: 60_000}}},
+        "tax_units": {"tax_unit": {"primaries": ["you"]}},
+        "benefit_units": {"benefit_unit": {"adults": ["you"]}},
+        "families": {"family": {"parents": ["you"]}},
+        "households": {"household": {"members": ["you"]}},
+    }
+    results = []
+    for tax_benefit_system in (
+        system.derive(reform),
+        AustralianTaxBenefitSystem(reform=reform),
+    ):
+        simulation = Simulation(
+            tax_benefit_system=tax_benefit_system, situation=situation
+        )
+        results.append(
+            (
+                simulation.calculate("income_tax", 2024)[0],
+                simulation.calculate("medicare_levy", 2024)[0],
+            )
+        )
+    assert results[0] == results[1]
+    assert results[0][1] == pytest.approx(1_800)
+
+
+def test_shared_system_loads_on_first_use():
+    """Test that importing the package does not load the baseline system."""
+    import subprocess
+    import sys
+
+    script = (
+        "import policyengine_au\n"
+        "from policyengine_au.system import Simulation, get_system\n"
+        "assert get_system.cache_info().currsize == 0\n"
+        "from policyengine_au.system import system\n"
+        "assert system is get_system()\n"
+        "assert Simulation.default_tax_benefit_system_instance is system\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
@@ -0,0 +1,13 @@
+"""Shared numerical helpers for the Australian tax-benefit model."""
+
+from policyengine_au.utils.schedules import (
+    MarginalRateSchedule,
+    RateSchedule,
+    StepRateSchedule,
+)
+from policyengine_au.utils.compiled_parameters import (
+    CompiledParameters,
+    compiled_parameters,
+)
+from policyengine_au.utils.dispatch import dispatch
+from policyengine_au.utils.segments import SegmentIndex, group_sum
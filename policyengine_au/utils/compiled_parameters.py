@@ -0,0 +1,115 @@
+"""
+Compiled, period-indexed views of the parameter tree.
+
+``parameters(period).gov.ato.income_tax`` builds the whole parameter tree at
+``period`` the first time each instant is seen, and again for every reform,
+since a reform's tree has its own caches. Parameters only change at the
+dates in their ``values`` lists, so :class:`CompiledParameters` resolves a
+subtree once per such breakpoint and answers every later lookup with a
+dict hit, or a bisection over the breakpoints for an instant it has not seen.
+
+Compiled views are cached on the node they are built from and dropped when
+any parameter under it is updated. A reform derived with
+:meth:`~policyengine_au.system.AustralianTaxBenefitSystem.derive` shares
+the subtrees it leaves unchanged, so it shares their compiled views too.
+"""
+
+from bisect import bisect_right
+
+from policyengine_core.periods import Instant, Period
+
+
+class CompiledParameters:
+    """
+    Every parameter under a node, resolved at each of its breakpoints.
+
+    Calling the view with a period returns the same object as
+    ``node(period)`` would (attribute access, scales and all), but shared by
+    every instant between two breakpoints.
+
+    Args:
+        node: The parameter node to compile, e.g.
+            ``parameters.gov.states.nsw.payroll_tax``.
+
+    Example:
+        >>> p = compiled_parameters(parameters.gov.ato.income_tax)(period)
+        >>> p.rates.rates.bracket_2
+    """
+
+    def __init__(self, node):
+        self.name = node.name
+        breakpoints = set()
+        for descendant in node.get_descendants():
+            for value_at_instant in getattr(descendant, "values_list", ()):
+                breakpoints.add(value_at_instant.instant_str)
+        self.breakpoints = sorted(breakpoints)
+        self.values = [node.get_at_instant(instant) for instant in self.breakpoints]
+        self._index_at = {}
+        self._built = {}
+
+    def _index(self, period) -> int:
+        if isinstance(period, Period):
+            period = period.start
+        instant = str(period) if isinstance(period, Instant) else period
+        index = self._index_at.get(instant)
+        if index is None:
+            index = bisect_right(self.breakpoints, instant) - 1
+            if index < 0:
+                raise ValueError(
+                    f"The parameters under {self.name} are not defined before "
+                    f"{self.breakpoints[0]} (requested {instant})."
+                )
+            self._index_at[instant] = index
+        return index
+
+    def __call__(self, period):
+        """
+        The parameter values in force at the start of ``period``.
+
+        Args:
+            period: A period, instant or ``YYYY-MM-DD`` string.
+        """
+        return self.values[self._index(period)]
+
+    def build(self, period, builder):
+        """
+        Build an object from the values at ``period``, once per breakpoint.
+
+        Use this for objects derived from the parameters, such as a
+        :class:`~policyengine_au.utils.schedules.MarginalRateSchedule`, that
+        would otherwise be rebuilt on every formula evaluation.
+
+        Args:
+            period: A period, instant or ``YYYY-MM-DD`` string.
+            builder: A function of the values at ``period``.
+
+        Returns:
+            ``builder(self(period))``, cached for the breakpoint's interval.
+        """
+        key = (self._index(period), builder)
+        built = self._built.get(key)
+        if built is None:
+            built = self._built[key] = builder(self.values[key[0]])
+        return built
+
+
+# Key of a node's compiled view in its at-instant cache, which core clears
+# whenever a parameter below the node is updated.
+_COMPILED = ("compiled",)
+
+
+def compiled_parameters(node) -> CompiledParameters:
+    """
+    The compiled view of a parameter node, built on first use.
+
+    Args:
+        node: A parameter node, e.g. ``parameters.gov.ato.income_tax``.
+
+    Returns:
+        The node's :class:`CompiledParameters`.
+    """
+    cache = node._at_instant_cache
+    compiled = cache.get(_COMPILED)
+    if compiled is None:
+        compiled = cache[_COMPILED] = CompiledParameters(node)
+    return compiled
@@ -0,0 +1,142 @@
+"""
+Vectorised rate schedules.
+
+Bracket-based calculations (income tax, Medicare levy surcharge, HECS-HELP
+repayments) share the same shape: a sorted list of thresholds with a rate
+attached to each band. The schedules here are built once per period from
+the parameter tree and then evaluated for a whole population with a single
+``numpy.searchsorted`` call, so memory use stays linear in the number of
+people rather than people x brackets.
+"""
+
+import numpy as np
+
+
+class RateSchedule:
+    """
+    A schedule of rates over ascending income bands.
+
+    Finding the band each value falls in is a single ``searchsorted`` over
+    the thresholds, however many bands there are, so schedules with many
+    bands cost no more per person than schedules with few. Subclasses
+    define how a band's rate turns into an amount.
+
+    Args:
+        thresholds: Lower bound of each band, in ascending order.
+        rates: Rate applying within each band.
+    """
+
+    def __init__(self, thresholds, rates):
+        thresholds = np.asarray(thresholds, dtype=float)
+        rates = np.asarray(rates, dtype=float)
+        if thresholds.ndim != 1 or thresholds.shape != rates.shape:
+            raise ValueError(
+                "A rate schedule needs one rate per threshold, got "
+                f"{thresholds.size} thresholds and {rates.size} rates."
+            )
+        if thresholds.size == 0:
+            raise ValueError("A rate schedule needs at least one band.")
+        if np.any(np.diff(thresholds) < 0):
+            raise ValueError(
+                f"Schedule thresholds must be in ascending order, got {thresholds}."
+            )
+        self.thresholds = thresholds
+        self.rates = rates
+
+    @classmethod
+    def from_brackets(cls, thresholds, rates, prefix="bracket_", first_threshold=0.0):
+        """
+        Build a schedule from ``<prefix><n>`` parameter nodes.
+
+        ``rates`` must define ``<prefix>1`` to ``<prefix><n>``. The first
+        band starts at ``first_threshold``; every later band starts at the
+        matching ``<prefix><k>`` entry of ``thresholds``. Adding a band to
+        the parameter files therefore needs no formula change.
+
+        Args:
+            thresholds: Parameter node (at an instant) of band thresholds.
+            rates: Parameter node (at an instant) of band rates.
+            prefix: Shared prefix of the band names.
+            first_threshold: Lower bound of the first band.
+        """
+        band_thresholds = [first_threshold]
+        band_rates = [rates[f"{prefix}1"]]
+        k = 2
+        while f"{prefix}{k}" in rates:
+            band_thresholds.append(thresholds[f"{prefix}{k}"])
+            band_rates.append(rates[f"{prefix}{k}"])
+            k += 1
+        return cls(band_thresholds, band_rates)
+
+    def bracket_indices(self, base):
+        """Index of the band each value of ``base`` falls in (-1 if below all)."""
+        return np.searchsorted(self.thresholds, base, side="right") - 1
+
+    def band_rates(self, base):
+        """Rate of the band each value of ``base`` falls in (0 if below all)."""
+        index = self.bracket_indices(np.asarray(base, dtype=float))
+        return np.where(index < 0, 0.0, self.rates[np.maximum(index, 0)])
+
+    def __repr__(self):
+        bands = ", ".join(
+            f"{threshold:,.0f}: {rate:g}"
+            for threshold, rate in zip(self.thresholds, self.rates)
+        )
+        return f"{self.__class__.__name__}({bands})"
+
+
+class MarginalRateSchedule(RateSchedule):
+    """
+    A marginal rate schedule, e.g. the individual income tax brackets.
+
+    Each rate applies only to the part of the base that falls inside its
+    band. The tax payable at the start of every band is precomputed, so
+    evaluating the schedule is one bracket lookup plus one multiply-add per
+    person.
+
+    Args:
+        thresholds: Lower bound of each band, in ascending order.
+        rates: Marginal rate applying within each band.
+    """
+
+    def __init__(self, thresholds, rates):
+        super().__init__(thresholds, rates)
+        # Tax payable on income up to the start of each band.
+        self.base_amounts = np.concatenate(
+            ([0.0], np.cumsum(np.diff(self.thresholds) * self.rates[:-1]))
+        )
+
+    def calc(self, base):
+        """Amount payable on each value of ``base``."""
+        base = np.asarray(base, dtype=float)
+        index = self.bracket_indices(base)
+        below = index < 0
+        index = np.maximum(index, 0)
+        amount = self.base_amounts[index] + (
+            (base - self.thresholds[index]) * self.rates[index]
+        )
+        return np.where(below, 0.0, amount)
+
+    def marginal_rates(self, base):
+        """Marginal rate applying to each value of ``base``."""
+        return self.band_rates(base)
+
+
+class StepRateSchedule(RateSchedule):
+    """
+    A schedule whose band rate applies to the whole base, e.g. HECS-HELP
+    compulsory repayments.
+
+    Crossing a threshold raises the amount on every dollar of the base, so
+    the amount jumps at each threshold.
+
+    Args:
+        thresholds: Lower bound of each band, in ascending order. Values
+            below the first threshold pay nothing.
+        rates: Rate applying to the whole base within each band.
+    """
+
+    def calc(self, base):
+        """Amount payable on each value of ``base``."""
+        base = np.asarray(base, dtype=float)
+        return self.band_rates(base) * base
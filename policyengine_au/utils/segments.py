@@ -0,0 +1,89 @@
+"""
+Segment sums over identifier arrays.
+
+Core's group entities aggregate their members with a single ``bincount``
+over the membership array. Some groupings are not entities, such as the
+payroll tax groups formed by related employers, and are only given as an
+identifier on each record. A :class:`SegmentIndex` sorts the records by
+identifier once, and then totals any values over the groups with one
+``np.add.reduceat`` over contiguous segments. Group populations cache one
+per identifier variable (see
+:meth:`policyengine_au.populations.IndexedGroupPopulation.segment_index`),
+so the sort is not repeated for every variable summed over the same groups.
+"""
+
+import numpy as np
+
+
+class SegmentIndex:
+    """
+    Immutable index of the records sharing each group identifier.
+
+    Args:
+        group_ids: The group identifier of each record, in any order.
+        ungrouped: Identifier marking records that belong to no group.
+
+    Attributes:
+        group_ids: The identifiers indexed.
+        order: Records sorted by identifier, keeping their original order
+            within each group.
+        starts: Start of each group's records in ``order``.
+        segment: The position in ``starts`` of each record's group.
+        ungrouped: Whether each record belongs to no group.
+    """
+
+    def __init__(self, group_ids, ungrouped=-1):
+        ids = np.array(group_ids)
+        self.group_ids = ids
+        self.order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[self.order]
+        is_start = np.ones(ids.size, dtype=bool)
+        is_start[1:] = sorted_ids[1:] != sorted_ids[:-1]
+        self.starts = np.flatnonzero(is_start)
+        self.segment = np.empty(ids.size, dtype=np.intp)
+        self.segment[self.order] = np.cumsum(is_start) - 1
+        self.ungrouped = ids == ungrouped
+        for array in (
+            self.group_ids,
+            self.order,
+            self.starts,
+            self.segment,
+            self.ungrouped,
+        ):
+            array.setflags(write=False)
+
+    def sum(self, values):
+        """
+        Total ``values`` over the records sharing each group identifier.
+
+        Args:
+            values: One value per record.
+
+        Returns:
+            For each record, the total of its group, aligned with
+            ``values``; each ungrouped record keeps its own value.
+        """
+        values = np.asarray(values, dtype=float)
+        if not values.size:
+            return values.copy()
+        totals = np.add.reduceat(values[self.order], self.starts)[self.segment]
+        return np.where(self.ungrouped, values, totals)
+
+
+def group_sum(values, group_ids, ungrouped=-1):
+    """
+    Total ``values`` over the records sharing each group identifier.
+
+    Builds a :class:`SegmentIndex` for the one sum; to sum several arrays
+    over the same groups, build the index once and call its ``sum``.
+
+    Args:
+        values: One value per record.
+        group_ids: The group identifier of each record, in any order.
+        ungrouped: Identifier marking records that belong to no group; each
+            such record keeps its own value.
+
+    Returns:
+        For each record, the total of its group, aligned with ``values``.
+    """
+    return SegmentIndex(group_ids, ungrouped).sum(values)
@@ -0,0 +1,36 @@
+"""HECS-HELP compulsory repayment."""
+
+from policyengine_au.model_api import *
+
+
+class hecs_help_repayment(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "HECS-HELP compulsory repayment"
+    documentation = "Compulsory repayment of study and training loan debt, at the rate for the person's repayment income band, capped at the debt outstanding"
+    reference = "https://www.ato.gov.au/individuals-and-families/study-and-training-support-loans/study-and-training-loan-repayment-thresholds-and-rates"
+    unit = AUD
+
+    def formula(person, period, parameters):
+        # Repayment income also includes reportable fringe benefits and
+        # similar amounts, which the model does not yet have as inputs.
+        repayment_income = person("taxable_income", period)
+        debt = person("help_debt", period)
+
+        # The rate for the band the income falls in applies to the whole
+        # income, found with one lookup over all 18 bands.
+        schedule = compiled_parameters(parameters.gov.ato.hecs_help).build(
+            period, hecs_help_repayment_schedule
+        )
+        return min_(schedule.calc(repayment_income), debt)
+
+
+def hecs_help_repayment_schedule(p):
+    thresholds = p.repayment_thresholds.thresholds
+    return StepRateSchedule.from_brackets(
+        thresholds,
+        p.repayment_rates.rates,
+        prefix="band_",
+        first_threshold=thresholds.minimum,
+    )
@@ -14,33 +14,39 @@ class medicare_levy(Variable):
 
     def formula(person, period, parameters):
         taxable_income = person("taxable_income", period)
-        p_medicare = parameters(period).gov.ato.medicare
-
-        # Get basic levy rate (2%)
-        levy_rate = p_medicare.levy_rate
-
-        # Get low income thresholds
-        thresholds = p_medicare.low_income_thresholds
-
-        # For simplicity, assume single person initially
-        # TODO: Add family status detection
-        is_single = True
-
-        if is_single:
-            no_levy_threshold = thresholds.singles.no_levy_threshold
-            full_levy_threshold = thresholds.singles.full_levy_threshold
-        else:
-            # Family thresholds would be used here
-            no_levy_threshold = thresholds.families.no_levy_threshold
-            full_levy_threshold = thresholds.families.full_levy_threshold
-
-        # Calculate Medicare levy
-        if taxable_income <= no_levy_threshold:
-            # No Medicare levy for low income
-            return 0
-        elif taxable_income <= full_levy_threshold:
-            # Shade-in range: 10% of income above threshold
-            return (taxable_income - no_levy_threshold) * 0.10
-        else:
-            # Full Medicare levy (2% of taxable income)
-            return taxable_income * levy_rate
+        p = parameters(period).gov.ato.medicare
+        thresholds = p.low_income_thresholds
+
+        # Full Medicare levy (2% of taxable income)
+        full_levy = taxable_income * p.levy_rate
+
+        # Singles shade-in: 10% of income above the lower threshold, so the
+        # levy is nil up to that threshold and reaches the full levy at the
+        # upper threshold.
+        single_levy = max_(
+            (taxable_income - thresholds.singles.no_levy_threshold) * p.shade_in_rate,
+            0,
+        )
+
+        # Family reduction: the shade-in applies to combined family income,
+        # with the lower threshold raised for each dependant, and is shared
+        # between the adults in proportion to their taxable income.
+        is_family = person.tax_unit("tax_unit_is_family", period)
+        family_income = person.tax_unit("medicare_levy_family_income", period)
+        dependents = person.tax_unit("tax_unit_dependents", period)
+        family_threshold = (
+            thresholds.families.no_levy_threshold
+            + dependents * thresholds.families.additional_child_or_student
+        )
+        income_share = where(
+            family_income > 0,
+            taxable_income / where(family_income > 0, family_income, 1),
+            0,
+        )
+        family_levy = (
+            max_((family_income - family_threshold) * p.shade_in_rate, 0) * income_share
+        )
+
+        levy = min_(full_levy, single_levy)
+        is_dependent = person.has_role(TaxUnit.DEPENDENT)
+        return where(is_family & ~is_dependent, min_(levy, family_levy), levy)
@@ -0,0 +1,18 @@
+"""Family income for Medicare levy purposes."""
+
+from policyengine_au.model_api import *
+
+
+class medicare_levy_family_income(Variable):
+    value_type = float
+    entity = TaxUnit
+    definition_period = YEAR
+    label = "Medicare levy family income"
+    documentation = "Combined taxable income of the taxpayer and spouse, used for the family Medicare levy and surcharge thresholds"
+    reference = "https://www.ato.gov.au/individuals-and-families/medicare-and-private-health-insurance/medicare-levy/medicare-levy-reduction-for-low-income-earners"
+    unit = AUD
+
+    def formula(tax_unit, period, parameters):
+        taxable_income = tax_unit.members("taxable_income", period)
+        is_dependent = tax_unit.members.has_role(TaxUnit.DEPENDENT)
+        return tax_unit.sum(where(is_dependent, 0, taxable_income))
@@ -0,0 +1,52 @@
+"""Medicare levy surcharge calculation."""
+
+from policyengine_au.model_api import *
+
+
+class medicare_levy_surcharge(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "Medicare levy surcharge"
+    documentation = (
+        "Surcharge on taxable income for higher earners without private hospital cover"
+    )
+    reference = "https://www.ato.gov.au/individuals-and-families/medicare-and-private-health-insurance/medicare-levy-surcharge"
+    unit = AUD
+
+    def formula(person, period, parameters):
+        taxable_income = person("taxable_income", period)
+        p = parameters(period).gov.ato.medicare
+        rates = p.levy_surcharge_rates
+        thresholds = p.levy_surcharge_thresholds
+
+        # Singles are tested on their own income, families on combined
+        # income against thresholds raised for each child after the first.
+        is_family = person.tax_unit("tax_unit_is_family", period)
+        family_income = person.tax_unit("medicare_levy_family_income", period)
+        dependents = person.tax_unit("tax_unit_dependents", period)
+        family_increase = (
+            max_(dependents - 1, 0) * thresholds.additional_child_threshold
+        )
+        income = where(is_family, family_income, taxable_income)
+
+        def tier_threshold(tier):
+            return where(
+                is_family,
+                thresholds.families[tier] + family_increase,
+                thresholds.singles[tier],
+            )
+
+        rate = select(
+            [
+                income > tier_threshold("tier_3"),
+                income > tier_threshold("tier_2"),
+                income > tier_threshold("tier_1"),
+            ],
+            [rates.tier_3, rates.tier_2, rates.tier_1],
+            default=0,
+        )
+
+        is_dependent = person.has_role(TaxUnit.DEPENDENT)
+        liable = ~person("has_private_hospital_cover", period) & ~is_dependent
+        return where(liable, taxable_income * rate, 0)
@@ -0,0 +1,115 @@
+"""Age Pension entitlement."""
+
+from types import SimpleNamespace
+
+from policyengine_au.model_api import *
+
+
+class age_pension(Variable):
+    value_type = float
+    entity = BenefitUnit
+    definition_period = YEAR
+    label = "Age Pension"
+    documentation = "Annual Age Pension paid to the benefit unit, including the pension and energy supplements, after the income and assets tests"
+    reference = "https://www.servicesaustralia.gov.au/age-pension"
+    unit = AUD
+
+    def formula(benefit_unit, period, parameters):
+        rates = compiled_parameters(parameters.gov.dss.age_pension).build(
+            period, age_pension_annual_rates
+        )
+        eligible_adults = benefit_unit.sum(
+            benefit_unit.members("age_pension_eligible", period)
+        )
+        is_couple = benefit_unit("benefit_unit_is_couple", period)
+        is_homeowner = benefit_unit.value_from_first_person(
+            benefit_unit.members.household("is_homeowner", period)
+        )
+        income = benefit_unit("age_pension_assessable_income", period)
+        assets = benefit_unit("age_pension_assessable_assets", period)
+
+        # Means test only the units with an eligible adult, in one pass.
+        assessed = eligible_adults > 0
+        pension = np.zeros(assessed.size)
+        eligible_adults = eligible_adults[assessed]
+        is_couple = is_couple[assessed]
+        is_homeowner = is_homeowner[assessed]
+
+        # Couples are assessed on their combined rate and means, and each
+        # eligible partner is paid half of the result.
+        share = where(is_couple, eligible_adults / 2, 1)
+        maximum_rate = where(is_couple, rates.couple_rate, rates.single_rate)
+        income_free_area = where(
+            is_couple, rates.couple_income_free_area, rates.single_income_free_area
+        )
+        income_reduction = (
+            max_(income[assessed] - income_free_area, 0) * rates.income_taper
+        )
+        assets_free_area = where(
+            is_couple,
+            where(
+                is_homeowner,
+                rates.couple_homeowner_assets_free_area,
+                rates.couple_non_homeowner_assets_free_area,
+            ),
+            where(
+                is_homeowner,
+                rates.single_homeowner_assets_free_area,
+                rates.single_non_homeowner_assets_free_area,
+            ),
+        )
+        assets_taper = where(
+            is_couple, rates.couple_assets_taper, rates.single_assets_taper
+        )
+        assets_reduction = max_(assets[assessed] - assets_free_area, 0) * assets_taper
+
+        # The test giving the lower rate applies.
+        reduction = max_(income_reduction, assets_reduction)
+        pension[assessed] = max_(maximum_rate - reduction, 0) * share
+        return pension
+
+
+def age_pension_annual_rates(p):
+    """
+    The Age Pension rates and means test limits as annual amounts.
+
+    Built once per parameter breakpoint with
+    :meth:`~policyengine_au.utils.compiled_parameters.CompiledParameters.build`,
+    so fortnightly amounts are converted once rather than for every person.
+
+    Args:
+        p: The ``gov.dss.age_pension`` parameters at an instant.
+    """
+    rates = p.payment_rates
+    single = rates.single
+    couple = rates.couple.combined
+    income_test = p.income_test
+    free_area = p.assets_test.assets_free_area
+    return SimpleNamespace(
+        age_threshold=p.eligibility.age_threshold,
+        single_rate=FORTNIGHTS_IN_YEAR
+        * (
+            single.maximum_basic_rate
+            + single.maximum_pension_supplement
+            + single.energy_supplement
+        ),
+        couple_rate=FORTNIGHTS_IN_YEAR
+        * (
+            couple.maximum_basic_rate
+            + couple.maximum_pension_supplement
+            + couple.energy_supplement
+        ),
+        single_income_free_area=FORTNIGHTS_IN_YEAR
+        * income_test.income_free_area.single,
+        couple_income_free_area=FORTNIGHTS_IN_YEAR
+        * income_test.income_free_area.couple_combined,
+        income_taper=income_test.taper_rate,
+        work_bonus=FORTNIGHTS_IN_YEAR * income_test.work_bonus.fortnightly_amount,
+        single_homeowner_assets_free_area=free_area.single.homeowner,
+        single_non_homeowner_assets_free_area=free_area.single.non_homeowner,
+        couple_homeowner_assets_free_area=free_area.couple_combined.homeowner,
+        couple_non_homeowner_assets_free_area=free_area.couple_combined.non_homeowner,
+        # The assets tapers are annual reductions per $1,000 of assets.
+        single_assets_taper=p.assets_test.taper_rate.single / 1_000,
+        couple_assets_taper=p.assets_test.taper_rate.couple_combined / 1_000,
+    )
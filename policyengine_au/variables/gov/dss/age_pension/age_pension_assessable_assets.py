@@ -0,0 +1,21 @@
+"""Assessable assets for the Age Pension assets test."""
+
+from policyengine_au.model_api import *
+
+
+class age_pension_assessable_assets(Variable):
+    value_type = float
+    entity = BenefitUnit
+    definition_period = YEAR
+    label = "Age Pension assessable assets"
+    documentation = (
+        "Combined assessable assets of the adults, excluding the principal home"
+    )
+    reference = "https://www.servicesaustralia.gov.au/assets-test-for-age-pension"
+    unit = AUD
+
+    def formula(benefit_unit, period, parameters):
+        person = benefit_unit.members
+        assets = add(person, period, ["financial_assets", "non_financial_assets"])
+        is_adult = person.has_role(BenefitUnit.ADULT)
+        return benefit_unit.sum(where(is_adult, assets, 0))
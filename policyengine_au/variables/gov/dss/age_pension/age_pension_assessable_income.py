@@ -0,0 +1,40 @@
+"""Assessable income for the Age Pension income test."""
+
+from policyengine_au.model_api import *
+from policyengine_au.variables.gov.dss.age_pension.age_pension import (
+    age_pension_annual_rates,
+)
+
+
+class age_pension_assessable_income(Variable):
+    value_type = float
+    entity = BenefitUnit
+    definition_period = YEAR
+    label = "Age Pension assessable income"
+    documentation = "Combined income of the adults for the Age Pension income test, after the work bonus and with financial assets deemed"
+    reference = "https://www.servicesaustralia.gov.au/income-test-for-age-pension"
+    unit = AUD
+
+    def formula(benefit_unit, period, parameters):
+        person = benefit_unit.members
+        rates = compiled_parameters(parameters.gov.dss.age_pension).build(
+            period, age_pension_annual_rates
+        )
+
+        # The work bonus exempts some income from work for each person over
+        # Age Pension age. It is applied here to a whole year of earnings, so
+        # it does not model banking unused amounts between fortnights.
+        work_income = add(
+            person, period, ["employment_income", "self_employment_income"]
+        )
+        over_pension_age = person("age", period) >= rates.age_threshold
+        work_bonus = where(over_pension_age, min_(work_income, rates.work_bonus), 0)
+        # Actual returns on financial investments are replaced by deemed
+        # income on the assets themselves.
+        other_income = person("rental_income", period)
+
+        is_adult = person.has_role(BenefitUnit.ADULT)
+        income = benefit_unit.sum(
+            where(is_adult, work_income - work_bonus + other_income, 0)
+        )
+        return income + benefit_unit("age_pension_deemed_income", period)
@@ -0,0 +1,30 @@
+"""Deemed income from financial assets for the Age Pension income test."""
+
+from policyengine_au.model_api import *
+
+
+class age_pension_deemed_income(Variable):
+    value_type = float
+    entity = BenefitUnit
+    definition_period = YEAR
+    label = "Age Pension deemed income"
+    documentation = "Income the adults' combined financial assets are deemed to earn, in place of their actual returns"
+    reference = "https://www.servicesaustralia.gov.au/deeming"
+    unit = AUD
+
+    def formula(benefit_unit, period, parameters):
+        is_adult = benefit_unit.members.has_role(BenefitUnit.ADULT)
+        assets = benefit_unit.sum(
+            where(is_adult, benefit_unit.members("financial_assets", period), 0)
+        )
+        is_couple = benefit_unit("benefit_unit_is_couple", period)
+        p = parameters(period).gov.dss.age_pension.income_test
+        threshold = where(
+            is_couple,
+            p.deeming_thresholds.couple_combined,
+            p.deeming_thresholds.single,
+        )
+        rates = p.deeming_rates
+        return min_(assets, threshold) * rates.lower_rate + (
+            max_(assets - threshold, 0) * rates.upper_rate
+        )
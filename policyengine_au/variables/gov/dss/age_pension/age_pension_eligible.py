@@ -13,16 +13,16 @@ class age_pension_eligible(Variable):
 
     def formula(person, period, parameters):
         age = person("age", period)
-        p_eligibility = parameters(period).gov.dss.age_pension.eligibility
+        p = parameters(period).gov.dss.age_pension.eligibility
 
-        # Current age threshold is 67
-        age_threshold = p_eligibility.age_threshold.current
+        age_eligible = age >= p.age_threshold
 
-        # Check age eligibility
-        age_eligible = age >= age_threshold
-
-        # TODO: Add residence requirements check
-        # For now, assume residence requirements are met
-        residence_eligible = True
+        # Residence: ten years of continuous residence, or ten years in total
+        # with at least five of them continuous.
+        residence = person("australian_residence_years", period)
+        continuous = person("continuous_australian_residence_years", period)
+        residence_eligible = (continuous >= p.qualifying_residence) | (
+            (residence >= p.total_residence) & (continuous >= p.continuous_residence)
+        )
 
         return age_eligible & residence_eligible
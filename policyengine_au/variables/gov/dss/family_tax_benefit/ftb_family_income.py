@@ -0,0 +1,19 @@
+"""Family income for the Family Tax Benefit income tests."""
+
+from policyengine_au.model_api import *
+
+
+class ftb_family_income(Variable):
+    value_type = float
+    entity = Family
+    definition_period = YEAR
+    label = "FTB family income"
+    documentation = "Combined taxable income of the parents, used for the Family Tax Benefit income tests"
+    reference = (
+        "https://www.servicesaustralia.gov.au/income-test-for-family-tax-benefit-part"
+    )
+    unit = AUD
+
+    def formula(family, period, parameters):
+        taxable_income = family.members("taxable_income", period)
+        return family.sum(taxable_income, Family.PARENT)
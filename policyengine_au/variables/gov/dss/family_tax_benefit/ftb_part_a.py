@@ -0,0 +1,102 @@
+"""Family Tax Benefit Part A."""
+
+from types import SimpleNamespace
+
+from policyengine_au.model_api import *
+
+
+class ftb_part_a(Variable):
+    value_type = float
+    entity = Family
+    definition_period = YEAR
+    label = "Family Tax Benefit Part A"
+    documentation = "Annual Family Tax Benefit Part A paid to the family, including the supplement, after the income test"
+    reference = "https://www.servicesaustralia.gov.au/family-tax-benefit-part"
+    unit = AUD
+
+    def formula(family, period, parameters):
+        rates = compiled_parameters(parameters.gov.dss.family_tax_benefit).build(
+            period, ftb_part_a_annual_rates
+        )
+        person = family.members
+        is_ftb_child = person("is_ftb_child", period)
+
+        # Look each child's maximum and base rates up by age band, then total
+        # them per family in a single reduction over the children.
+        band = np.searchsorted(rates.age_bands, person("age", period), side="right")
+        children = family.sum(is_ftb_child)
+        maximum_rate = family.sum(where(is_ftb_child, rates.maximum_rates[band], 0))
+        base_rate = family.sum(where(is_ftb_child, rates.base_rates[band], 0))
+
+        # The large family supplement is paid for each child after the third.
+        maximum_rate += max_(children - 3, 0) * rates.large_family_supplement
+
+        income = family("ftb_family_income", period)
+        supplement = where(
+            income <= rates.supplement_income_limit,
+            children * rates.supplement_per_child,
+            0,
+        )
+
+        # Method 1 tapers the maximum rate from the income free area, and
+        # method 2 the base rate from the higher income free area; the family
+        # is paid the higher of the two.
+        method_1 = (
+            maximum_rate
+            + supplement
+            - max_(income - rates.income_free_area, 0) * rates.taper_rate_1
+        )
+        method_2 = (
+            base_rate
+            + supplement
+            - max_(income - rates.higher_income_free_area, 0) * rates.taper_rate_2
+        )
+        return max_(max_(method_1, method_2), 0)
+
+
+def ftb_part_a_annual_rates(p):
+    """
+    The FTB Part A rates and income test limits as annual amounts.
+
+    The per-child rates are arrays indexed by age band (under 13, 13-15,
+    16-17, 18-19), so a child's rate is one lookup with the band from
+    ``searchsorted(age_bands, age, side="right")``.
+
+    Args:
+        p: The ``gov.dss.family_tax_benefit`` parameters at an instant.
+    """
+    part_a = p.part_a
+    maximum = part_a.payment_rates.maximum_rates
+    base = part_a.payment_rates.base_rates
+    income_test = part_a.income_test
+    return SimpleNamespace(
+        age_bands=np.array([13, 16, 18, 20]),
+        maximum_rates=FORTNIGHTS_IN_YEAR
+        * np.array(
+            [
+                maximum.child_under_13,
+                maximum.child_13_to_15,
+                maximum.child_16_to_19,
+                maximum.child_16_to_19,
+                0,
+            ]
+        ),
+        base_rates=FORTNIGHTS_IN_YEAR
+        * np.array(
+            [
+                base.child_under_18,
+                base.child_under_18,
+                base.child_under_18,
+                base.child_18_to_19,
+                0,
+            ]
+        ),
+        large_family_supplement=FORTNIGHTS_IN_YEAR
+        * part_a.payment_rates.large_family_supplement,
+        supplement_per_child=part_a.payment_rates.supplement.maximum_per_child,
+        supplement_income_limit=part_a.payment_rates.supplement.income_limit,
+        income_free_area=income_test.income_free_area,
+        taper_rate_1=income_test.taper_rate_1,
+        higher_income_free_area=income_test.higher_income_free_area,
+        taper_rate_2=income_test.taper_rate_2,
+    )
@@ -0,0 +1,89 @@
+"""Family Tax Benefit Part B."""
+
+from types import SimpleNamespace
+
+from policyengine_au.model_api import *
+
+
+class ftb_part_b(Variable):
+    value_type = float
+    entity = Family
+    definition_period = YEAR
+    label = "Family Tax Benefit Part B"
+    documentation = "Annual Family Tax Benefit Part B paid to the family, including the supplement, after the income test"
+    reference = "https://www.servicesaustralia.gov.au/family-tax-benefit-part-b"
+    unit = AUD
+
+    def formula(family, period, parameters):
+        rates = compiled_parameters(parameters.gov.dss.family_tax_benefit).build(
+            period, ftb_part_b_annual_rates
+        )
+        person = family.members
+        is_ftb_child = person("is_ftb_child", period)
+        youngest_child_age = family.min(where(is_ftb_child, person("age", period), 99))
+        is_couple = family.nb_persons(Family.PARENT) == 2
+
+        # Parents' incomes are tested separately: the primary earner's
+        # against a limit, and the secondary earner's by a taper.
+        taxable_income = person("taxable_income", period)
+        primary_income = family.max(taxable_income, Family.PARENT)
+        secondary_income = family.sum(taxable_income, Family.PARENT) - primary_income
+        eligible = (
+            family.any(is_ftb_child)
+            & (
+                youngest_child_age
+                < where(
+                    is_couple,
+                    rates.couple_youngest_child_age_limit,
+                    rates.single_youngest_child_age_limit,
+                )
+            )
+            & (
+                primary_income
+                <= where(
+                    is_couple,
+                    rates.couple_primary_income_limit,
+                    rates.single_primary_income_limit,
+                )
+            )
+        )
+
+        maximum_rate = where(
+            youngest_child_age < 5,
+            rates.youngest_child_under_5,
+            rates.youngest_child_5_to_18,
+        )
+        income = family("ftb_family_income", period)
+        supplement = where(
+            income <= rates.supplement_income_limit, rates.supplement_per_family, 0
+        )
+        reduction = (
+            max_(secondary_income - rates.secondary_income_free_area, 0)
+            * rates.secondary_taper_rate
+        )
+        return where(eligible, max_(maximum_rate + supplement - reduction, 0), 0)
+
+
+def ftb_part_b_annual_rates(p):
+    """
+    The FTB Part B rates and income test limits as annual amounts.
+
+    Args:
+        p: The ``gov.dss.family_tax_benefit`` parameters at an instant.
+    """
+    part_b = p.part_b
+    maximum = part_b.payment_rates.maximum_rates
+    income_test = part_b.income_test
+    age_limit = part_b.eligibility.youngest_child_age_limit
+    return SimpleNamespace(
+        youngest_child_under_5=FORTNIGHTS_IN_YEAR * maximum.youngest_child_under_5,
+        youngest_child_5_to_18=FORTNIGHTS_IN_YEAR * maximum.youngest_child_5_to_18,
+        supplement_per_family=part_b.payment_rates.supplement.maximum_per_family,
+        supplement_income_limit=part_b.payment_rates.supplement.income_limit,
+        couple_youngest_child_age_limit=age_limit.couple,
+        single_youngest_child_age_limit=age_limit.single_parent,
+        couple_primary_income_limit=income_test.primary_earner_income_limit.couple,
+        single_primary_income_limit=income_test.primary_earner_income_limit.single_parent,
+        secondary_income_free_area=income_test.secondary_earner_income_free_area,
+        secondary_taper_rate=income_test.secondary_earner_taper_rate,
+    )
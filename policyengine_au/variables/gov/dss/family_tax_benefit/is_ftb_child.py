@@ -0,0 +1,21 @@
+"""Family Tax Benefit child status."""
+
+from policyengine_au.model_api import *
+
+
+class is_ftb_child(Variable):
+    value_type = bool
+    entity = Person
+    definition_period = YEAR
+    label = "Is FTB child"
+    documentation = "Whether the person is a dependent child for Family Tax Benefit: a child of the family under 16, or under 20 and in full-time study"
+    reference = "https://www.servicesaustralia.gov.au/who-can-get-family-tax-benefit"
+
+    def formula(person, period, parameters):
+        age = person("age", period)
+        is_student = person("is_student", period)
+        p = parameters(period).gov.dss.family_tax_benefit.eligibility
+        age_eligible = (age < p.child_age_limit) | (
+            is_student & (age < p.secondary_student_age_limit)
+        )
+        return person.has_role(Family.CHILD) & age_eligible
@@ -1,25 +1,28 @@
 from policyengine_au.model_api import *
+from policyengine_au.variables.gov.states.payroll_tax import group_payroll_tax
 
 
 class act_payroll_tax(Variable):
     value_type = float
-    entity = Household
+    entity = Employer
     label = "ACT payroll tax"
     definition_period = YEAR
     unit = "AUD"
     reference = "https://www.legislation.act.gov.au/a/2011-18"
 
-    def formula(household, period, parameters):
+    def formula(employer, period, parameters):
         # Get ACT payroll tax parameters
-        params = parameters(period).gov.states.act.payroll_tax
+        params = compiled_parameters(parameters.gov.states.act.payroll_tax)(period)
 
-        # Aggregate wages at household level
-        wages = household.sum(household.members("employment_income", period))
+        return group_payroll_tax(employer, period, act_payroll_tax_liability, params)
 
-        # Calculate tax for ACT employers
-        threshold = params.threshold
-        rate = params.rate
 
-        taxable_wages = max_(wages - threshold, 0)
+def act_payroll_tax_liability(wages, params):
+    """ACT payroll tax on each annual wage bill in ``wages``."""
+    # Calculate tax for ACT employers
+    threshold = params.threshold
+    rate = params.rate
 
-        return taxable_wages * rate
+    taxable_wages = max_(wages - threshold, 0)
+
+    return taxable_wages * rate
@@ -0,0 +1,30 @@
+from policyengine_au.model_api import *
+
+
+class household_payroll_tax(Variable):
+    value_type = float
+    entity = Household
+    label = "State payroll tax on household members' wages"
+    definition_period = YEAR
+    unit = "AUD"
+    documentation = (
+        "The state payroll tax of the employers of the household's members, "
+        "attributed to each employee in proportion to their share of their "
+        "employer's wages. An employer whose employees have no wages splits "
+        "its liability equally among them."
+    )
+
+    def formula(household, period, parameters):
+        person = household.members
+        employer = person.employer
+        wages = person("employment_income", period)
+        employer_wages = employer.sum(wages)
+        # Each employee's share of their employer's wages, projected back
+        # to the employee.
+        share = np.divide(
+            wages,
+            employer_wages,
+            out=1 / employer.nb_persons(),
+            where=employer_wages > 0,
+        )
+        return household.sum(share * employer("state_payroll_tax", period))
@@ -1,9 +1,10 @@
 from policyengine_au.model_api import *
+from policyengine_au.variables.gov.states.payroll_tax import group_payroll_tax
 
 
 class nsw_payroll_tax(Variable):
     value_type = float
-    entity = Household
+    entity = Employer
     label = "NSW payroll tax"
     definition_period = YEAR
     unit = "AUD"
@@ -11,15 +12,17 @@ class nsw_payroll_tax(Variable):
         "https://www.legislation.nsw.gov.au/view/html/inforce/current/act-2007-021"
     )
 
-    def formula(household, period, parameters):
+    def formula(employer, period, parameters):
         # Get NSW payroll tax parameters
-        params = parameters(period).gov.states.nsw.payroll_tax
+        params = compiled_parameters(parameters.gov.states.nsw.payroll_tax)(period)
 
-        # Aggregate wages at household level
-        wages = household.sum(household.members("employment_income", period))
+        return group_payroll_tax(employer, period, nsw_payroll_tax_liability, params)
 
-        # Calculate tax for NSW employers
-        threshold = params.threshold
-        rate = params.rate
 
-        return max_(wages - threshold, 0) * rate
+def nsw_payroll_tax_liability(wages, params):
+    """NSW payroll tax on each annual wage bill in ``wages``."""
+    # Calculate tax for NSW employers
+    threshold = params.threshold
+    rate = params.rate
+
+    return max_(wages - threshold, 0) * rate
@@ -1,25 +1,28 @@
 from policyengine_au.model_api import *
+from policyengine_au.variables.gov.states.payroll_tax import group_payroll_tax
 
 
 class nt_payroll_tax(Variable):
     value_type = float
-    entity = Household
+    entity = Employer
     label = "NT payroll tax"
     definition_period = YEAR
     unit = "AUD"
     reference = "https://legislation.nt.gov.au/en/Legislation/PAYROLL-TAX-ACT-2009"
 
-    def formula(household, period, parameters):
+    def formula(employer, period, parameters):
         # Get NT payroll tax parameters
-        params = parameters(period).gov.states.nt.payroll_tax
+        params = compiled_parameters(parameters.gov.states.nt.payroll_tax)(period)
 
-        # Aggregate wages at household level
-        wages = household.sum(household.members("employment_income", period))
+        return group_payroll_tax(employer, period, nt_payroll_tax_liability, params)
 
-        # Calculate tax for NT employers
-        threshold = params.threshold
-        rate = params.rate
 
-        taxable_wages = max_(wages - threshold, 0)
+def nt_payroll_tax_liability(wages, params):
+    """NT payroll tax on each annual wage bill in ``wages``."""
+    # Calculate tax for NT employers
+    threshold = params.threshold
+    rate = params.rate
 
-        return taxable_wages * rate
+    taxable_wages = max_(wages - threshold, 0)
+
+    return taxable_wages * rate
@@ -1,39 +1,135 @@
-from policyengine_core.model_api import *
-from policyengine_au.entities import *
+from policyengine_au.model_api import *
 
 
 class state_payroll_tax(Variable):
     value_type = float
-    entity = Household
+    entity = Employer
     label = "State payroll tax (employer liability)"
     definition_period = YEAR
     unit = "AUD"
     documentation = (
         "Total employer payroll tax liability based on state/territory where wages are paid. "
-        "This is a tax paid by employers on their total wage bill when it exceeds the threshold."
-    )
-
-    def formula(household, period, parameters):
-        # Get household state and calculate appropriate tax
-        state = household("household_state", period)
-
-        # Map state to the appropriate payroll tax variable
-        state_tax_map = {
-            StateCode.NSW: "nsw_payroll_tax",
-            StateCode.VIC: "vic_payroll_tax",
-            StateCode.QLD: "qld_payroll_tax",
-            StateCode.WA: "wa_payroll_tax",
-            StateCode.SA: "sa_payroll_tax",
-            StateCode.TAS: "tas_payroll_tax",
-            StateCode.ACT: "act_payroll_tax",
-            StateCode.NT: "nt_payroll_tax",
-        }
-
-        # Calculate tax for each state and select the appropriate one
-        tax = zeros(household.count)
-        for state_code, tax_variable in state_tax_map.items():
-            is_state = state == state_code
-            state_tax = household(tax_variable, period)
-            tax = where(is_state, state_tax, tax)
-
-        return tax
+        "This is a tax paid by employers on their total wage bill when it exceeds the threshold. "
+        "A grouped employer applies its own state's threshold and rates to the whole group's wages "
+        "and pays its share of that liability."
+    )
+
+    def formula(employer, period, parameters):
+        state = employer("employer_state", period)
+        group_wages = employer("payroll_tax_group_wages", period)
+        share = employer("payroll_tax_group_share", period)
+        p = parameters.gov.states
+
+        # Each state's act applies only to the employers in that state, so
+        # evaluate it on just those employers rather than on everyone.
+        branches = {}
+        replaced = {}
+        for state_code, (variable, liability) in state_payroll_taxes().items():
+            if computed_as_defined(employer.simulation, variable, period):
+                node = getattr(p, state_code.name.lower()).payroll_tax
+                branches[state_code] = apportioned(
+                    liability, compiled_parameters(node)(period)
+                )
+            else:
+                replaced[state_code] = variable.__name__
+
+        total = dispatch(state, branches, group_wages, share)
+        # A state's variable replaced by a reform, or given as an input, is
+        # taken as it is.
+        for state_code, name in replaced.items():
+            total = where(state == state_code, employer(name, period), total)
+        return total
+
+
+def state_payroll_taxes() -> dict:
+    """Each state's payroll tax variable and liability function."""
+    # Imported here, since each state's module imports this one.
+    from policyengine_au.variables.gov.states.act.payroll_tax import (
+        act_payroll_tax,
+        act_payroll_tax_liability,
+    )
+    from policyengine_au.variables.gov.states.nsw.payroll_tax import (
+        nsw_payroll_tax,
+        nsw_payroll_tax_liability,
+    )
+    from policyengine_au.variables.gov.states.nt.payroll_tax import (
+        nt_payroll_tax,
+        nt_payroll_tax_liability,
+    )
+    from policyengine_au.variables.gov.states.qld.payroll_tax import (
+        qld_payroll_tax,
+        qld_payroll_tax_liability,
+    )
+    from policyengine_au.variables.gov.states.sa.payroll_tax import (
+        sa_payroll_tax,
+        sa_payroll_tax_liability,
+    )
+    from policyengine_au.variables.gov.states.tas.payroll_tax import (
+        tas_payroll_tax,
+        tas_payroll_tax_liability,
+    )
+    from policyengine_au.variables.gov.states.vic.payroll_tax import (
+        vic_payroll_tax,
+        vic_payroll_tax_liability,
+    )
+    from policyengine_au.variables.gov.states.wa.payroll_tax import (
+        wa_payroll_tax,
+        wa_payroll_tax_liability,
+    )
+
+    return {
+        StateCode.NSW: (nsw_payroll_tax, nsw_payroll_tax_liability),
+        StateCode.VIC: (vic_payroll_tax, vic_payroll_tax_liability),
+        StateCode.QLD: (qld_payroll_tax, qld_payroll_tax_liability),
+        StateCode.WA: (wa_payroll_tax, wa_payroll_tax_liability),
+        StateCode.SA: (sa_payroll_tax, sa_payroll_tax_liability),
+        StateCode.TAS: (tas_payroll_tax, tas_payroll_tax_liability),
+        StateCode.ACT: (act_payroll_tax, act_payroll_tax_liability),
+        StateCode.NT: (nt_payroll_tax, nt_payroll_tax_liability),
+    }
+
+
+def computed_as_defined(simulation, variable, period) -> bool:
+    """
+    Whether a simulation calculates a variable with the formula of its class
+    in this package, rather than one a reform substituted or neutralised,
+    or takes it as an input.
+    """
+    current = simulation.tax_benefit_system.get_variable(variable.__name__)
+    formula = current.get_formula(period)
+    return (
+        formula is not None
+        and not current.is_neutralized
+        and formula.__code__ == variable.formula.__code__
+        and not simulation.get_holder(variable.__name__).get_known_periods()
+    )
+
+
+def group_payroll_tax(employer, period, liability, params):
+    """
+    Each employer's payroll tax under one state's act.
+
+    The threshold applies to the wages of the whole payroll tax group, and
+    each member pays its share of the group's liability. A member applies
+    its own state's act to the group's wages, wherever they are paid.
+
+    Args:
+        employer: The employer population.
+        period: The year to calculate.
+        liability: The state's ``<state>_payroll_tax_liability`` function.
+        params: The state's compiled payroll tax parameters.
+    """
+    group_wages = employer("payroll_tax_group_wages", period)
+    share = employer("payroll_tax_group_share", period)
+    return apportioned(liability, params)(group_wages, share)
+
+
+def apportioned(liability, params):
+    """An employer's share of its group's liability under one state's act."""
+
+    def employer_liability(group_wages, share):
+        # Work in double precision: wage bills run to billions of dollars.
+        group_wages = np.asarray(group_wages, dtype=float)
+        return liability(group_wages, params) * share
+
+    return employer_liability
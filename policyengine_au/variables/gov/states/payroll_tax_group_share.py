@@ -0,0 +1,20 @@
+from policyengine_au.model_api import *
+
+
+class payroll_tax_group_share(Variable):
+    value_type = float
+    entity = Employer
+    label = "Share of group payroll tax"
+    definition_period = YEAR
+    unit = "/1"
+    documentation = (
+        "The employer's share of its payroll tax group's liability, in "
+        "proportion to its share of the group's wages."
+    )
+
+    def formula(employer, period, parameters):
+        wages = employer("employer_wages", period)
+        group_wages = employer("payroll_tax_group_wages", period)
+        return np.divide(
+            wages, group_wages, out=np.zeros_like(wages), where=group_wages > 0
+        )
@@ -0,0 +1,22 @@
+from policyengine_au.model_api import *
+
+
+class payroll_tax_group_wages(Variable):
+    value_type = float
+    entity = Employer
+    label = "Payroll tax group wages"
+    definition_period = YEAR
+    unit = AUD
+    documentation = (
+        "Combined wages of the employer's payroll tax group, to which the "
+        "threshold applies. An employer outside any group uses its own wages. "
+        "Each member applies the threshold and rates of its own state to the "
+        "group's total wages, wherever they are paid, and pays its share of "
+        "that liability: the model does not apportion the threshold between "
+        "states, as a designated group employer's return would."
+    )
+    reference = "https://www.revenue.nsw.gov.au/taxes-duties-levies-royalties/payroll-tax/grouping"
+
+    def formula(employer, period, parameters):
+        wages = employer("employer_wages", period)
+        return employer.segment_index("employer_group_id", period).sum(wages)
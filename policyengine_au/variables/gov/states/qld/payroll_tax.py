@@ -1,9 +1,10 @@
 from policyengine_au.model_api import *
+from policyengine_au.variables.gov.states.payroll_tax import group_payroll_tax
 
 
 class qld_payroll_tax(Variable):
     value_type = float
-    entity = Household
+    entity = Employer
     label = "QLD payroll tax"
     definition_period = YEAR
     unit = "AUD"
@@ -11,28 +12,30 @@ class qld_payroll_tax(Variable):
         "https://www.legislation.qld.gov.au/view/html/inforce/current/act-1971-062"
     )
 
-    def formula(household, period, parameters):
+    def formula(employer, period, parameters):
         # Get QLD payroll tax parameters
-        params = parameters(period).gov.states.qld.payroll_tax
+        params = compiled_parameters(parameters.gov.states.qld.payroll_tax)(period)
 
-        # Aggregate wages at household level
-        wages = household.sum(household.members("employment_income", period))
+        return group_payroll_tax(employer, period, qld_payroll_tax_liability, params)
 
-        # Calculate tax for QLD employers with tiered rates
-        threshold = params.threshold
-        rate = params.rate
-        rate_large = params.rate_large
-        large_employer_threshold = params.large_employer_threshold
-        regional_discount = params.regional_discount
 
-        # Calculate tax with tiered rates
-        return where(
-            wages <= threshold,
-            0,
-            where(
-                wages <= large_employer_threshold,
-                (wages - threshold) * rate,
-                (large_employer_threshold - threshold) * rate
-                + (wages - large_employer_threshold) * rate_large,
-            ),
-        )
+def qld_payroll_tax_liability(wages, params):
+    """QLD payroll tax on each annual wage bill in ``wages``."""
+    # Calculate tax for QLD employers with tiered rates
+    threshold = params.threshold
+    rate = params.rate
+    rate_large = params.rate_large
+    large_employer_threshold = params.large_employer_threshold
+    regional_discount = params.regional_discount
+
+    # Calculate tax with tiered rates
+    return where(
+        wages <= threshold,
+        0,
+        where(
+            wages <= large_employer_threshold,
+            (wages - threshold) * rate,
+            (large_employer_threshold - threshold) * rate
+            + (wages - large_employer_threshold) * rate_large,
+        ),
+    )
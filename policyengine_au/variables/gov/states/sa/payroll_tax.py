@@ -1,9 +1,10 @@
 from policyengine_au.model_api import *
+from policyengine_au.variables.gov.states.payroll_tax import group_payroll_tax
 
 
 class sa_payroll_tax(Variable):
     value_type = float
-    entity = Household
+    entity = Employer
     label = "SA payroll tax"
     definition_period = YEAR
     unit = "AUD"
@@ -11,30 +12,32 @@ class sa_payroll_tax(Variable):
         "https://www.legislation.sa.gov.au/LZ/C/A/Payroll%20Tax%20Act%202009.aspx"
     )
 
-    def formula(household, period, parameters):
+    def formula(employer, period, parameters):
         # Get SA payroll tax parameters
-        params = parameters(period).gov.states.sa.payroll_tax
+        params = compiled_parameters(parameters.gov.states.sa.payroll_tax)(period)
 
-        # Aggregate wages at household level
-        wages = household.sum(household.members("employment_income", period))
+        return group_payroll_tax(employer, period, sa_payroll_tax_liability, params)
 
-        # Calculate tax for SA employers with tiered rates
-        threshold = params.threshold
-        small_employer_limit = params.small_employer_limit
-        rate_small = params.rate_small
-        rate_standard = params.rate_standard
 
-        # Calculate taxable wages
-        taxable_wages = max_(wages - threshold, 0)
+def sa_payroll_tax_liability(wages, params):
+    """SA payroll tax on each annual wage bill in ``wages``."""
+    # Calculate tax for SA employers with tiered rates
+    threshold = params.threshold
+    small_employer_limit = params.small_employer_limit
+    rate_small = params.rate_small
+    rate_standard = params.rate_standard
 
-        # Select appropriate rate based on employer size
-        effective_rate = where(
-            wages <= small_employer_limit,
-            rate_small,  # Small employer rate
-            rate_standard,  # Standard rate
-        )
+    # Calculate taxable wages
+    taxable_wages = max_(wages - threshold, 0)
 
-        # Note: Deduction only applies to SA-only employers
-        # Not implementing deduction as it requires multi-state check
+    # Select appropriate rate based on employer size
+    effective_rate = where(
+        wages <= small_employer_limit,
+        rate_small,  # Small employer rate
+        rate_standard,  # Standard rate
+    )
+
+    # Note: Deduction only applies to SA-only employers
+    # Not implementing deduction as it requires multi-state check
 
-        return where(wages <= threshold, 0, taxable_wages * effective_rate)
+    return where(wages <= threshold, 0, taxable_wages * effective_rate)
@@ -1,9 +1,10 @@
 from policyengine_au.model_api import *
+from policyengine_au.variables.gov.states.payroll_tax import group_payroll_tax
 
 
 class tas_payroll_tax(Variable):
     value_type = float
-    entity = Household
+    entity = Employer
     label = "TAS payroll tax"
     definition_period = YEAR
     unit = "AUD"
@@ -11,27 +12,29 @@ class tas_payroll_tax(Variable):
         "https://www.legislation.tas.gov.au/view/html/inforce/current/act-2008-016"
     )
 
-    def formula(household, period, parameters):
+    def formula(employer, period, parameters):
         # Get TAS payroll tax parameters
-        params = parameters(period).gov.states.tas.payroll_tax
+        params = compiled_parameters(parameters.gov.states.tas.payroll_tax)(period)
 
-        # Aggregate wages at household level
-        wages = household.sum(household.members("employment_income", period))
+        return group_payroll_tax(employer, period, tas_payroll_tax_liability, params)
 
-        # Calculate tax for TAS employers with tiered rates
-        threshold = params.threshold
-        large_employer_threshold = params.large_employer_threshold
-        rate_small = params.rate_small
-        rate_standard = params.rate_standard
 
-        # Calculate taxable wages
-        taxable_wages = max_(wages - threshold, 0)
+def tas_payroll_tax_liability(wages, params):
+    """TAS payroll tax on each annual wage bill in ``wages``."""
+    # Calculate tax for TAS employers with tiered rates
+    threshold = params.threshold
+    large_employer_threshold = params.large_employer_threshold
+    rate_small = params.rate_small
+    rate_standard = params.rate_standard
 
-        # Select appropriate rate based on employer size
-        effective_rate = where(
-            wages <= large_employer_threshold,
-            rate_small,  # Small employer rate
-            rate_standard,  # Large employer rate
-        )
+    # Calculate taxable wages
+    taxable_wages = max_(wages - threshold, 0)
 
-        return where(wages <= threshold, 0, taxable_wages * effective_rate)
+    # Select appropriate rate based on employer size
+    effective_rate = where(
+        wages <= large_employer_threshold,
+        rate_small,  # Small employer rate
+        rate_standard,  # Large employer rate
+    )
+
+    return where(wages <= threshold, 0, taxable_wages * effective_rate)
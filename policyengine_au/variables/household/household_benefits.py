@@ -0,0 +1,17 @@
+"""Household benefits."""
+
+from policyengine_au.model_api import *
+
+
+class household_benefits(Variable):
+    value_type = float
+    entity = Household
+    definition_period = YEAR
+    label = "Household benefits"
+    documentation = "Social security and family assistance payments to the household's benefit units and families"
+    unit = AUD
+    adds = [
+        "age_pension",
+        "ftb_part_a",
+        "ftb_part_b",
+    ]
@@ -0,0 +1,18 @@
+"""Household market income."""
+
+from policyengine_au.model_api import *
+
+
+class household_market_income(Variable):
+    value_type = float
+    entity = Household
+    definition_period = YEAR
+    label = "Household market income"
+    documentation = "Combined income of the household's members from work, business, investments and rent"
+    unit = AUD
+    adds = [
+        "employment_income",
+        "self_employment_income",
+        "investment_income",
+        "rental_income",
+    ]
@@ -0,0 +1,14 @@
+"""Household net income."""
+
+from policyengine_au.model_api import *
+
+
+class household_net_income(Variable):
+    value_type = float
+    entity = Household
+    definition_period = YEAR
+    label = "Household net income"
+    documentation = "Household market income plus benefits, less taxes"
+    unit = AUD
+    adds = ["household_market_income", "household_benefits"]
+    subtracts = ["household_tax"]
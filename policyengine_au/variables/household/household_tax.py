@@ -0,0 +1,20 @@
+"""Household taxes."""
+
+from policyengine_au.model_api import *
+
+
+class household_tax(Variable):
+    value_type = float
+    entity = Household
+    definition_period = YEAR
+    label = "Household taxes"
+    documentation = (
+        "Personal taxes and compulsory loan repayments of the household's members"
+    )
+    unit = AUD
+    adds = [
+        "income_tax",
+        "medicare_levy",
+        "medicare_levy_surcharge",
+        "hecs_help_repayment",
+    ]
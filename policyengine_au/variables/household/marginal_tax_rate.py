@@ -0,0 +1,16 @@
+"""Effective marginal tax rate."""
+
+from policyengine_au.model_api import *
+from policyengine_au.marginal_rates import marginal_tax_rates
+
+
+class marginal_tax_rate(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "Marginal tax rate"
+    documentation = "Share of an extra $1,000 of the person's employment income lost to household taxes and withdrawn benefits"
+    unit = "/1"
+
+    def formula(person, period, parameters):
+        return marginal_tax_rates(person.simulation, period)
@@ -0,0 +1,15 @@
+"""Financial assets variable."""
+
+from policyengine_au.model_api import *
+
+
+class financial_assets(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "Financial assets"
+    documentation = "Value of financial investments such as bank deposits, shares and managed funds, which the pension means tests deem to earn income"
+    reference = "https://www.servicesaustralia.gov.au/deeming"
+    unit = AUD
+
+    default_value = 0
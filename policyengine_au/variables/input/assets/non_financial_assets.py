@@ -0,0 +1,15 @@
+"""Non-financial assets variable."""
+
+from policyengine_au.model_api import *
+
+
+class non_financial_assets(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "Non-financial assets"
+    documentation = "Value of assessable assets other than financial investments and the principal home, such as investment property, vehicles and household contents"
+    reference = "https://www.servicesaustralia.gov.au/assets"
+    unit = AUD
+
+    default_value = 0
@@ -0,0 +1,15 @@
+"""Australian residence variable."""
+
+from policyengine_au.model_api import *
+
+
+class australian_residence_years(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "Years of Australian residence"
+    documentation = "Total years the person has lived in Australia as an Australian resident since turning 16. Defaults to every year since 16."
+    reference = "https://www.servicesaustralia.gov.au/residence-rules-for-age-pension"
+
+    def formula(person, period, parameters):
+        return max_(person("age", period) - 16, 0)
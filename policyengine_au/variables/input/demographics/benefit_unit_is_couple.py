@@ -0,0 +1,17 @@
+"""Benefit unit couple status variable."""
+
+from policyengine_au.model_api import *
+
+
+class benefit_unit_is_couple(Variable):
+    value_type = bool
+    entity = BenefitUnit
+    definition_period = YEAR
+    label = "Benefit unit is a couple"
+    documentation = (
+        "Whether the benefit unit has two adults, and so is assessed at couple rates"
+    )
+    reference = "https://www.servicesaustralia.gov.au/income-test-for-pensions"
+
+    def formula(benefit_unit, period, parameters):
+        return benefit_unit.nb_persons(BenefitUnit.ADULT) == 2
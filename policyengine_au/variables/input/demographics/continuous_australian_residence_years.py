@@ -0,0 +1,15 @@
+"""Continuous Australian residence variable."""
+
+from policyengine_au.model_api import *
+
+
+class continuous_australian_residence_years(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "Years of continuous Australian residence"
+    documentation = "Longest unbroken period, in years, the person has lived in Australia as an Australian resident. Defaults to their total years of residence."
+    reference = "https://www.servicesaustralia.gov.au/residence-rules-for-age-pension"
+
+    def formula(person, period, parameters):
+        return person("australian_residence_years", period)
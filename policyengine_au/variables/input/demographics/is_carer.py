@@ -0,0 +1,14 @@
+"""Carer status variable."""
+
+from policyengine_au.model_api import *
+
+
+class is_carer(Variable):
+    value_type = bool
+    entity = Person
+    definition_period = YEAR
+    label = "Is carer"
+    documentation = "Whether the person provides daily care to someone with a disability, illness or who is frail aged"
+    reference = "https://www.servicesaustralia.gov.au/carer-payment"
+
+    default_value = False
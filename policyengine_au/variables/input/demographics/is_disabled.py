@@ -0,0 +1,16 @@
+"""Disability status variable."""
+
+from policyengine_au.model_api import *
+
+
+class is_disabled(Variable):
+    value_type = bool
+    entity = Person
+    definition_period = YEAR
+    label = "Is disabled"
+    documentation = (
+        "Whether the person has a physical, intellectual or psychiatric impairment"
+    )
+    reference = "https://www.servicesaustralia.gov.au/disability-support-pension"
+
+    default_value = False
@@ -0,0 +1,14 @@
+"""Student status variable."""
+
+from policyengine_au.model_api import *
+
+
+class is_student(Variable):
+    value_type = bool
+    entity = Person
+    definition_period = YEAR
+    label = "Is student"
+    documentation = "Whether the person is in full-time secondary or tertiary study"
+    reference = "https://www.servicesaustralia.gov.au/austudy"
+
+    default_value = False
@@ -0,0 +1,14 @@
+"""Postcode variable."""
+
+from policyengine_au.model_api import *
+
+
+class postcode(Variable):
+    value_type = str
+    entity = Person
+    definition_period = YEAR
+    label = "Postcode"
+    documentation = "Four-digit Australian postcode of the person's residence"
+    reference = "https://www.abs.gov.au/statistics/standards/australian-statistical-geography-standard-asgs-edition-3"
+
+    default_value = ""
@@ -0,0 +1,14 @@
+"""Number of dependants in a tax unit."""
+
+from policyengine_au.model_api import *
+
+
+class tax_unit_dependents(Variable):
+    value_type = int
+    entity = TaxUnit
+    definition_period = YEAR
+    label = "Number of dependants in the tax unit"
+    documentation = "Number of dependent children and students in the tax unit"
+
+    def formula(tax_unit, period, parameters):
+        return tax_unit.nb_persons(TaxUnit.DEPENDENT)
@@ -0,0 +1,15 @@
+"""Tax unit family status variable."""
+
+from policyengine_au.model_api import *
+
+
+class tax_unit_is_family(Variable):
+    value_type = bool
+    entity = TaxUnit
+    definition_period = YEAR
+    label = "Tax unit is a family"
+    documentation = "Whether the tax unit has a spouse or dependants, and so is assessed against family thresholds"
+    reference = "https://www.ato.gov.au/individuals-and-families/medicare-and-private-health-insurance/medicare-levy/medicare-levy-reduction-for-low-income-earners"
+
+    def formula(tax_unit, period, parameters):
+        return tax_unit.nb_persons() > 1
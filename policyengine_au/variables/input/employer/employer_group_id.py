@@ -0,0 +1,17 @@
+"""Payroll tax group identifier variable."""
+
+from policyengine_au.model_api import *
+
+
+class employer_group_id(Variable):
+    value_type = int
+    entity = Employer
+    definition_period = YEAR
+    label = "Payroll tax group identifier"
+    documentation = (
+        "Identifier shared by employers grouped under the payroll tax grouping "
+        "provisions, or -1 for an employer that is not part of a group"
+    )
+    reference = "https://www.revenue.nsw.gov.au/taxes-duties-levies-royalties/payroll-tax/grouping"
+
+    default_value = -1
@@ -0,0 +1,19 @@
+"""
+Employer state or territory variable for payroll tax.
+"""
+
+from policyengine_au.model_api import *
+from policyengine_au.variables.input.demographics.state import StateCode
+
+
+class employer_state(Variable):
+    value_type = Enum
+    possible_values = StateCode
+    default_value = StateCode.NSW
+    entity = Employer
+    definition_period = YEAR
+    label = "Employer state or territory"
+    documentation = "The Australian state or territory where the employer pays its wages (by default, that of its first employee)"
+
+    def formula(employer, period, parameters):
+        return employer.value_from_first_person(employer.members("state", period))
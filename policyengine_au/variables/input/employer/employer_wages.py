@@ -0,0 +1,18 @@
+"""Employer wage bill variable."""
+
+from policyengine_au.model_api import *
+
+
+class employer_wages(Variable):
+    value_type = float
+    entity = Employer
+    definition_period = YEAR
+    label = "Employer taxable wages"
+    documentation = (
+        "Total wages the employer pays in the year. Firm-level datasets can "
+        "supply this directly; otherwise it is the employees' employment income."
+    )
+    unit = AUD
+
+    def formula(employer, period, parameters):
+        return employer.sum(employer.members("employment_income", period))
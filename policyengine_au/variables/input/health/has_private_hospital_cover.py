@@ -0,0 +1,14 @@
+"""Private hospital cover variable."""
+
+from policyengine_au.model_api import *
+
+
+class has_private_hospital_cover(Variable):
+    value_type = bool
+    entity = Person
+    definition_period = YEAR
+    label = "Has private hospital cover"
+    documentation = "Whether the person holds an appropriate level of private patient hospital cover for the whole year"
+    reference = "https://www.ato.gov.au/individuals-and-families/medicare-and-private-health-insurance/medicare-levy-surcharge/private-patient-hospital-cover"
+
+    default_value = False
@@ -0,0 +1,14 @@
+"""Home ownership variable."""
+
+from policyengine_au.model_api import *
+
+
+class is_homeowner(Variable):
+    value_type = bool
+    entity = Household
+    definition_period = YEAR
+    label = "Is homeowner"
+    documentation = "Whether the household owns the home it lives in"
+    reference = "https://www.servicesaustralia.gov.au/assets-test-for-age-pension"
+
+    default_value = True
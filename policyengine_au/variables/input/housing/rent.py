@@ -0,0 +1,15 @@
+"""Rent variable."""
+
+from policyengine_au.model_api import *
+
+
+class rent(Variable):
+    value_type = float
+    entity = Household
+    definition_period = YEAR
+    label = "Rent"
+    documentation = "Annual rent paid by the household for its home"
+    reference = "https://www.servicesaustralia.gov.au/rent-assistance"
+    unit = AUD
+
+    default_value = 0
@@ -0,0 +1,15 @@
+"""HELP debt variable."""
+
+from policyengine_au.model_api import *
+
+
+class help_debt(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "HELP debt"
+    documentation = "Outstanding HECS-HELP and other study and training loan debt at the start of the income year"
+    reference = "https://www.ato.gov.au/individuals-and-families/study-and-training-support-loans"
+    unit = AUD
+
+    default_value = 0
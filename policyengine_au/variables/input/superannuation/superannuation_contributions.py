@@ -0,0 +1,15 @@
+"""Superannuation contributions variable."""
+
+from policyengine_au.model_api import *
+
+
+class superannuation_contributions(Variable):
+    value_type = float
+    entity = Person
+    definition_period = YEAR
+    label = "Superannuation contributions"
+    documentation = "Concessional (before-tax) contributions made to the person's superannuation fund"
+    reference = "https://www.ato.gov.au/individuals-and-families/super-for-individuals-and-families/super/growing-and-keeping-track-of-your-super/caps-limits-and-tax-on-super-contributions/concessional-contributions-cap"
+    unit = AUD
+
+    default_value = 0
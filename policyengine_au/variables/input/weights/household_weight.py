@@ -0,0 +1,13 @@
+"""Household survey weight variable."""
+
+from policyengine_au.model_api import *
+
+
+class household_weight(Variable):
+    value_type = float
+    entity = Household
+    definition_period = YEAR
+    label = "Household weight"
+    documentation = "Number of Australian households this survey household represents"
+
+    default_value = 1